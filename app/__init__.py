@@ -1,3 +1,12 @@
-from fastapi import FastAPI
+_app = None
 
-app = FastAPI()
\ No newline at end of file
+
+def __getattr__(name):
+    """FastAPI 앱(app.app)은 처음 사용할 때 만든다. CLI 나 엔진 모듈만 불러올 때는 FastAPI 를 import 하지 않음"""
+    global _app
+    if name != "app":
+        raise AttributeError(f"module 'app' has no attribute {name!r}")
+    if _app is None:
+        from fastapi import FastAPI
+        _app = FastAPI()
+    return _app
@@ -14,3 +14,113 @@ RABBITMQ_USERNAME = os.getenv('RABBITMQ_USERNAME')
 RABBITMQ_PASSWORD = os.getenv('RABBITMQ_PASSWORD')
 RABBITMQ_HOST = os.getenv('RABBITMQ_HOST')
 RABBITMQ_PORT = int(os.getenv('RABBITMQ_PORT'))
+
+USER_LOG_FILE_PATH = os.getenv('USER_LOG_FILE_PATH')
+USER_LOG_COMPACT_THRESHOLD = int(os.getenv('USER_LOG_COMPACT_THRESHOLD', 1000))
+
+RABBITMQ_CHANNEL_POOL_SIZE = int(os.getenv('RABBITMQ_CHANNEL_POOL_SIZE', 8))
+# publish() 도 브로커 확인을 기다릴지 (응답 대기열의 일괄 발행은 항상 확인 모드)
+RABBITMQ_PUBLISHER_CONFIRMS = os.getenv('RABBITMQ_PUBLISHER_CONFIRMS', 'false').lower() == 'true'
+
+# 응답 발행 대기열: 버퍼 최대 응답 수(가득 차면 처리 함수가 기다림) / 한 번에 발행할 최대 응답 수 / 모으는 최대 대기 시간(ms)
+REPLY_BUFFER_SIZE = int(os.getenv('REPLY_BUFFER_SIZE', 10000))
+REPLY_BATCH_SIZE = int(os.getenv('REPLY_BATCH_SIZE', 128))
+REPLY_BATCH_WAIT_MS = float(os.getenv('REPLY_BATCH_WAIT_MS', 2))
+# 응답 발행 실패 재시도: 최대 시도 횟수 / 재시도 간격(초, 두 배씩 늘려 최대값까지)
+REPLY_PUBLISH_ATTEMPTS = int(os.getenv('REPLY_PUBLISH_ATTEMPTS', 5))
+REPLY_RETRY_MIN = float(os.getenv('REPLY_RETRY_MIN', 0.1))
+REPLY_RETRY_MAX = float(os.getenv('REPLY_RETRY_MAX', 5))
+
+# 사용자 변경 모아 쓰기: 한 번에 기록할 최대 변경 수 / 최대 대기 시간(ms)
+USER_CRUD_BATCH_SIZE = int(os.getenv('USER_CRUD_BATCH_SIZE', 256))
+USER_CRUD_BATCH_WAIT_MS = float(os.getenv('USER_CRUD_BATCH_WAIT_MS', 10))
+
+# 큐별 동시 처리 수 (prefetch 도 같은 값).
+# user-crud 는 변경이 도착 순서대로 모아 쓰기 단계에 들어가므로 배치 크기만큼 받아도 같은 uuid 의 순서가 유지된다
+MATCH_CONSUMER_CONCURRENCY = int(os.getenv('MATCH_CONSUMER_CONCURRENCY', 32))
+CLASSIFIER_CONSUMER_CONCURRENCY = int(os.getenv('CLASSIFIER_CONSUMER_CONCURRENCY', 4))
+USER_CRUD_CONSUMER_CONCURRENCY = int(os.getenv('USER_CRUD_CONSUMER_CONCURRENCY', USER_CRUD_BATCH_SIZE))
+CONSUMER_DRAIN_TIMEOUT = float(os.getenv('CONSUMER_DRAIN_TIMEOUT', 30))
+
+# 매칭 마이크로 배치: 최대 요청 수 / 최대 대기 시간(ms)
+MATCH_BATCH_SIZE = int(os.getenv('MATCH_BATCH_SIZE', 32))
+MATCH_BATCH_WAIT_MS = float(os.getenv('MATCH_BATCH_WAIT_MS', 5))
+
+# 실행 풀 크기: I/O(저장소, 외부 프로세스) / CPU(점수 계산)
+IO_EXECUTOR_WORKERS = int(os.getenv('IO_EXECUTOR_WORKERS', 16))
+CPU_EXECUTOR_WORKERS = int(os.getenv('CPU_EXECUTOR_WORKERS', os.cpu_count() or 1))
+
+# 취미 분류기: script(매 요청 캐시 미스만 스크립트 실행) / module(스크립트의 classify() 를 한 번 import)
+# / embedding(취미 벡터와 가장 가까운 대분류 중심, 스크립트 불필요)
+CLASSIFIER_MODE = os.getenv('CLASSIFIER_MODE', 'script')
+CLASSIFIER_CACHE_SIZE = int(os.getenv('CLASSIFIER_CACHE_SIZE', 10000))
+CLASSIFIER_CACHE_PATH = os.getenv('CLASSIFIER_CACHE_PATH')
+
+# 취미 벡터: 임베딩 제공자(local: 결정적 로컬 인코더 / openai), 차원, openai 모델, 벡터 저장 파일(없으면 메모리에만)
+HOBBY_EMBEDDING_PROVIDER = os.getenv('HOBBY_EMBEDDING_PROVIDER', 'local').lower()
+HOBBY_EMBEDDING_DIM = int(os.getenv('HOBBY_EMBEDDING_DIM', 256))
+HOBBY_EMBEDDING_MODEL = os.getenv('HOBBY_EMBEDDING_MODEL', 'text-embedding-3-small')
+HOBBY_VECTOR_PATH = os.getenv('HOBBY_VECTOR_PATH')
+# 매칭 취미 점수: exact(요청 취미 중 후보가 가진 비율) / embedding(취미 집합 벡터의 코사인 유사도)
+HOBBY_SIMILARITY = os.getenv('HOBBY_SIMILARITY', 'exact').lower()
+# CLASSIFIER_MODE=embedding: 대분류 라벨 파일(JSON {대분류: [소분류, ...]}) / 가장 가까운 대분류 중심과의 유사도가 이보다 낮으면 분류 실패
+HOBBY_CATEGORY_SEED_PATH = os.getenv('HOBBY_CATEGORY_SEED_PATH')
+HOBBY_CENTROID_MIN_SIMILARITY = float(os.getenv('HOBBY_CENTROID_MIN_SIMILARITY', 0.2))
+
+# 특성 저장소: 삭제된 슬롯 비율이 이 값을 넘으면 백그라운드에서 압축
+FEATURE_COMPACT_RATIO = float(os.getenv('FEATURE_COMPACT_RATIO', 0.25))
+
+# 사용자 테이블 바이너리 스냅샷 경로 (없으면 CSV 만 사용)
+USER_SNAPSHOT_PATH = os.getenv('USER_SNAPSHOT_PATH')
+
+# 매칭 결과 캐시: 최대 항목 수 / 유효 시간(초, 0 이면 무제한)
+MATCH_RESULT_CACHE_SIZE = int(os.getenv('MATCH_RESULT_CACHE_SIZE', 10000))
+MATCH_RESULT_CACHE_TTL = float(os.getenv('MATCH_RESULT_CACHE_TTL', 60))
+
+# Top-K 추천: 요청 k 의 최대값 / 매칭 요청자별로 미리 계산해 두는 후보 수, 보관 시간(초), 최대 항목 수
+MATCH_MAX_K = int(os.getenv('MATCH_MAX_K', 50))
+MATCH_CANDIDATE_DEPTH = int(os.getenv('MATCH_CANDIDATE_DEPTH', 20))
+MATCH_CANDIDATE_TTL = float(os.getenv('MATCH_CANDIDATE_TTL', 30))
+MATCH_CANDIDATE_CACHE_SIZE = int(os.getenv('MATCH_CANDIDATE_CACHE_SIZE', 10000))
+
+# 로그 레벨 (DEBUG 면 메시지 본문과 응답 내용까지 기록)
+LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO').upper()
+
+# 다중 프로세스 서빙 역할: single(한 프로세스가 모두 처리) / writer(사용자 변경 + 특성 스냅샷 발행) / reader(매칭/분류 워커)
+SERVING_ROLE = os.getenv('SERVING_ROLE', 'single').lower()
+# 발행하는 특성 스냅샷 디렉터리 (기본은 공유 메모리 파일시스템), 발행 간격(초), 읽기 워커의 확인 간격(초), 남겨 둘 버전 수
+SHARED_SNAPSHOT_DIR = os.getenv('SHARED_SNAPSHOT_DIR', '/dev/shm/comatching' if os.path.isdir('/dev/shm') else 'shared_snapshots')
+SHARED_SNAPSHOT_INTERVAL = float(os.getenv('SHARED_SNAPSHOT_INTERVAL', 1))
+SHARED_SNAPSHOT_POLL = float(os.getenv('SHARED_SNAPSHOT_POLL', 0.2))
+SHARED_SNAPSHOT_KEEP = int(os.getenv('SHARED_SNAPSHOT_KEEP', 3))
+# 마지막 전체 스냅샷 이후 바뀐 사용자가 그 사용자 수의 이 비율 이하이면 바뀐 행만 발행 (0 이면 항상 전체)
+SHARED_SNAPSHOT_DELTA_RATIO = float(os.getenv('SHARED_SNAPSHOT_DELTA_RATIO', 0.1))
+
+# 샤드 분산 점수 계산: 샤드 프로세스 수 (1 이하면 사용 안 함). 발행된 특성 스냅샷을 uuid 해시로 나눠 샤드마다 점수 계산
+# single 역할에서 켜면 같은 프로세스가 스냅샷을 발행하고 읽으므로 사용자 변경은 발행 간격만큼 늦게 반영된다
+MATCH_SHARDS = int(os.getenv('MATCH_SHARDS', 0))
+
+# 재전달된 큐 메시지에 다시 보낼 최근 응답 보관: 최대 항목 수 / 유효 시간(초)
+REPLY_STORE_SIZE = int(os.getenv('REPLY_STORE_SIZE', 10000))
+REPLY_STORE_TTL = float(os.getenv('REPLY_STORE_TTL', 300))
+
+# 마감 시간: 메시지에 마감 시각(expiration, x-deadline, deadline)이 없을 때 쓰는 기본 대기 한계(초, 0 이면 마감 없음)
+REQUEST_DEFAULT_TIMEOUT = float(os.getenv('REQUEST_DEFAULT_TIMEOUT', 0))
+# 부하 제한: 큐 대기 + 처리 중 메시지 수 한도 / 큐에서 기다린 시간 한도(초). 넘으면 매칭/분류 요청을 처리하지 않고 바로 응답 (0 이면 끄기)
+MATCH_MAX_BACKLOG = int(os.getenv('MATCH_MAX_BACKLOG', 0))
+CLASSIFIER_MAX_BACKLOG = int(os.getenv('CLASSIFIER_MAX_BACKLOG', 0))
+MAX_QUEUE_AGE = float(os.getenv('MAX_QUEUE_AGE', 0))
+# 브로커 큐 대기 메시지 수를 확인하는 간격(초)
+BACKLOG_POLL_INTERVAL = float(os.getenv('BACKLOG_POLL_INTERVAL', 1))
+
+# 소비자 재시작: 연결이 끊기면 이 간격(초)부터 두 배씩 늘려 최대 간격까지 기다린 뒤 다시 연결
+CONSUMER_RESTART_MIN = float(os.getenv('CONSUMER_RESTART_MIN', 1))
+CONSUMER_RESTART_MAX = float(os.getenv('CONSUMER_RESTART_MAX', 30))
+
+# 요청 프로파일링: 기록할 처리 함수 호출 비율(0~1, 0 이면 끄기), 방식(cprofile / sample), 보관 개수, 스택 표본 간격(초)
+PROFILE_RATE = float(os.getenv('PROFILE_RATE', 0))
+PROFILE_MODE = os.getenv('PROFILE_MODE', 'cprofile').lower()
+PROFILE_CAPACITY = int(os.getenv('PROFILE_CAPACITY', 20))
+PROFILE_INTERVAL = float(os.getenv('PROFILE_INTERVAL', 0.005))
+# 관리 API(/admin/...) 토큰. X-Admin-Token 헤더가 같아야 호출 가능 (설정하지 않으면 관리 API 를 쓸 수 없음)
+ADMIN_TOKEN = os.getenv('ADMIN_TOKEN')
@@ -0,0 +1,53 @@
+from app.utils.metrics import registry, Counter
+
+shed_total = registry.register(Counter(
+    "comatching_shed_total", "Queue messages answered without processing (deadline passed or overloaded)", ("queue", "reason"),
+))
+
+
+class AdmissionController:
+    """큐 메시지를 처리하기 전에 받아들일지 판단
+
+    - 마감 시각이 지났으면 "expired" (호출 측이 이미 응답을 기다리지 않음)
+    - 큐에서 기다린 시간이 max_queue_age(초) 를 넘으면 "queue_age"
+    - 큐 대기 + 처리 중 메시지 수가 max_backlog 를 넘으면 "backlog"
+
+    max_queue_age, max_backlog 가 0 이면 그 조건은 보지 않는다. 거절한 메시지에는 바로 응답을 보내
+    큐를 빨리 비우고, 남은 처리 능력은 아직 기다리는 호출 측의 요청에 쓴다.
+    """
+
+    def __init__(self, queue_name, timeout_reply, overload_reply, max_backlog=0, max_queue_age=0):
+        self.queue_name = queue_name
+        self.timeout_reply = timeout_reply
+        self.overload_reply = overload_reply
+        self.max_backlog = max_backlog
+        self.max_queue_age = max_queue_age
+        self.admitted = 0
+        self.rejected = {"expired": 0, "queue_age": 0, "backlog": 0}
+
+    def check(self, deadline, now, queue_age, backlog):
+        """거절 사유, 받아들이면 None"""
+        if deadline is not None and deadline <= now:
+            reason = "expired"
+        elif self.max_queue_age > 0 and queue_age > self.max_queue_age:
+            reason = "queue_age"
+        elif self.max_backlog > 0 and backlog > self.max_backlog:
+            reason = "backlog"
+        else:
+            self.admitted += 1
+            return None
+        self.rejected[reason] += 1
+        shed_total.inc(queue=self.queue_name, reason=reason)
+        return reason
+
+    def reply(self, reason):
+        """거절 응답 내용"""
+        return dict(self.timeout_reply if reason == "expired" else self.overload_reply)
+
+    def stats(self):
+        return {
+            "admitted": self.admitted,
+            "rejected": dict(self.rejected),
+            "maxBacklog": self.max_backlog,
+            "maxQueueAge": self.max_queue_age,
+        }
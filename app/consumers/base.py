@@ -0,0 +1,187 @@
+import asyncio
+import json
+import time
+import logging
+import aio_pika
+from app.config import (
+    RABBITMQ_URL, CONSUMER_DRAIN_TIMEOUT, REQUEST_DEFAULT_TIMEOUT, BACKLOG_POLL_INTERVAL,
+    CONSUMER_RESTART_MIN, CONSUMER_RESTART_MAX,
+)
+from app.utils.deadline import message_deadline, message_timestamp, deadline_scope
+from app.utils.helpers import send_to_queue
+from app.utils.metrics import request_context, observe_stage, stage
+from app.utils.reply_store import reply_store
+
+logger = logging.getLogger(__name__)
+
+
+def decode_message(message):
+    """메시지 본문을 디코딩하고 응답용 props 를 붙임"""
+    props = message.properties
+    message_data = json.loads(message.body)
+    message_data["props"] = {
+        "reply_to": props.reply_to,
+        "correlation_id": props.correlation_id
+    }
+    return message_data
+
+
+class QueueConsumer:
+    """큐 하나를 동시 처리 수가 제한된 워커로 소비
+
+    QoS prefetch 는 동시 처리 수와 같게 맞춘다. 처리는 동시에 진행되지만 ack 는
+    메시지별로, 전달된 순서대로 보낸다. stop() 은 새 메시지 수신을 멈추고
+    처리 중인 메시지가 끝날 때까지 기다린다. 보낸 응답은 reply_store 에 남겨
+    재전달된 메시지에 다시 사용한다.
+
+    admission 이 있으면 처리 전에 마감 시각, 큐 대기 시간, 적체량을 보고 거절할 메시지는
+    처리하지 않고 바로 응답한다. 적체량은 브로커 큐의 대기 메시지 수 + 처리 중 메시지 수이다.
+
+    supervise() 는 연결 오류로 run() 이 끝나면 지수 백오프로 다시 연결한다.
+    """
+
+    def __init__(self, queue_name, handler, concurrency=1, admission=None):
+        self.queue_name = queue_name
+        self.handler = handler
+        self.concurrency = max(1, concurrency)
+        self.admission = admission
+        self.queued = 0
+        self.connected = False
+        self.restarts = 0
+        self._iterator = None
+        self._in_flight = set()
+        self._last_task = None
+        self._stopping = False
+        self._finished = asyncio.Event()
+        self._wake = asyncio.Event()
+
+    async def supervise(self):
+        """stop() 전까지 run() 을 반복. 끊기면 CONSUMER_RESTART_MIN 부터 두 배씩(최대 CONSUMER_RESTART_MAX) 기다림"""
+        self._stopping = False
+        self._wake.clear()
+        delay = CONSUMER_RESTART_MIN
+        while not self._stopping:
+            started = time.monotonic()
+            await self.run()
+            if self._stopping:
+                break
+            # 한동안 정상 동작했으면 대기 간격을 처음으로
+            if time.monotonic() - started >= CONSUMER_RESTART_MAX:
+                delay = CONSUMER_RESTART_MIN
+            self.restarts += 1
+            logger.warning("Consumer '%s' stopped; reconnecting in %.1fs", self.queue_name, delay)
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=delay)
+            except asyncio.TimeoutError:
+                pass
+            delay = min(delay * 2, CONSUMER_RESTART_MAX)
+
+    async def run(self):
+        self._finished.clear()
+        watcher = None
+        try:
+            connection = await aio_pika.connect_robust(RABBITMQ_URL)
+            async with connection:
+                channel = await connection.channel()
+                await channel.set_qos(prefetch_count=self.concurrency)
+                queue = await channel.declare_queue(self.queue_name, durable=True)
+                semaphore = asyncio.Semaphore(self.concurrency)
+                watcher = asyncio.create_task(self._watch_backlog(queue)) if self.admission else None
+                self.connected = True
+
+                async with queue.iterator() as iterator:
+                    self._iterator = iterator
+                    async for message in iterator:
+                        received = time.perf_counter()
+                        await semaphore.acquire()
+                        task = asyncio.create_task(self._process(message, received, self._last_task, semaphore))
+                        self._in_flight.add(task)
+                        task.add_done_callback(self._in_flight.discard)
+                        self._last_task = task
+                        if self._stopping:
+                            break
+
+                # 처리 중인 메시지가 모두 ack 될 때까지 대기
+                if self._in_flight:
+                    await asyncio.wait(set(self._in_flight), timeout=CONSUMER_DRAIN_TIMEOUT)
+        except Exception as conn_error:
+            logger.error("Connection error (%s): %s", self.queue_name, conn_error)
+        finally:
+            if watcher is not None:
+                watcher.cancel()
+            self.connected = False
+            self._iterator = None
+            self._finished.set()
+
+    async def _watch_backlog(self, queue):
+        """브로커 큐의 대기 메시지 수를 주기적으로 갱신 (prefetch 로 받아 둔 메시지는 포함되지 않음)"""
+        while True:
+            try:
+                result = await queue.declare()
+                self.queued = result.message_count or 0
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.debug("Could not read backlog of %s: %s", self.queue_name, e)
+            await asyncio.sleep(BACKLOG_POLL_INTERVAL)
+
+    def _admit(self, message, message_data, waited):
+        """(거절 사유, 마감 시각). 받아들이면 사유는 None"""
+        now = time.time()
+        received_at = now - waited
+        deadline = message_deadline(message, message_data, received_at, REQUEST_DEFAULT_TIMEOUT)
+        if self.admission is None:
+            return None, deadline
+        queue_age = now - min(message_timestamp(message) or received_at, received_at)
+        backlog = self.queued + len(self._in_flight)
+        return self.admission.check(deadline, now, queue_age, backlog), deadline
+
+    async def _process(self, message, received, previous, semaphore):
+        try:
+            with request_context("queue", self.queue_name):
+                # 수신 후 처리 시작까지 (동시 처리 수 제한으로 기다린 시간)
+                observe_stage("queue_wait", time.perf_counter() - received)
+                logger.debug("Received message: %s", message.body)
+                with stage("decode"):
+                    message_data = decode_message(message)
+                # 재전달된 메시지는 이미 보낸 응답이 있으면 다시 처리하지 않고 그 응답을 다시 발행
+                correlation_id = message_data["props"]["correlation_id"]
+                key = (self.queue_name, correlation_id) if correlation_id else None
+                if message.redelivered:
+                    reply = await reply_store.replay(key)
+                    if reply is not None:
+                        logger.info("Replaying stored reply for redelivered message %s (%s)", correlation_id, self.queue_name)
+                        await send_to_queue(None, message_data["props"], reply)
+                        return
+                reason, deadline = self._admit(message, message_data, time.perf_counter() - received)
+                if reason is not None:
+                    logger.info("Rejected message %s (%s): %s", correlation_id, self.queue_name, reason)
+                    await send_to_queue(None, message_data["props"], self.admission.reply(reason))
+                    return
+                with reply_store.recording(key), deadline_scope(deadline):
+                    await self.handler(message_data)
+        except Exception:
+            logger.exception("Exception in callback (%s)", self.queue_name)
+        finally:
+            # 앞선 메시지가 ack 된 뒤에 ack (전달 순서 유지)
+            if previous is not None:
+                await asyncio.shield(previous)
+            try:
+                await message.ack()
+            except Exception as e:
+                logger.error("Error acking message: %s", e)
+            semaphore.release()
+
+    async def stop(self):
+        """새 메시지 수신을 멈추고 처리 중인 메시지를 마무리"""
+        self._stopping = True
+        self._wake.set()
+        if self._iterator is not None:
+            await self._iterator.close()
+            try:
+                await asyncio.wait_for(self._finished.wait(), timeout=CONSUMER_DRAIN_TIMEOUT)
+            except asyncio.TimeoutError:
+                logger.warning("Consumer '%s' did not drain in time", self.queue_name)
+
+    def stats(self):
+        return {"connected": self.connected, "inFlight": len(self._in_flight), "restarts": self.restarts}
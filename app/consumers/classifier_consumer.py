@@ -1,38 +1,26 @@
-import aio_pika
-import asyncio
-import json
-import aiohttp
-from app.config import RABBITMQ_URL, ML_BE_URL, ML_BE_PORT
+import logging
+from app.config import CLASSIFIER_CONSUMER_CONCURRENCY, CLASSIFIER_MAX_BACKLOG, MAX_QUEUE_AGE
+from app.consumers.admission import AdmissionController
+from app.consumers.base import QueueConsumer
+from app.services import classifier_service
 
-async def consume_from_classifier_queue():
-    try:
-        connection = await aio_pika.connect_robust(RABBITMQ_URL) ###
-        async with connection:
-            channel = await connection.channel()
-            queue = await channel.declare_queue('classifier', durable=True)
-
-            async for message in queue:
-                async with message.process():
-                    try:
-                        print(f"Received message: {message.body}")
-                        print(f"Message properties: {message.properties}")
-                        props = message.properties
+logger = logging.getLogger(__name__)
 
-                        message_data = json.loads(message.body)
-                        message_data["props"] = {
-                            "reply_to": props.reply_to,
-                            "correlation_id": props.correlation_id
-                        }
+async def handle_classifier_message(message_data):
+    try:
+        response_content, status_code = await classifier_service.classify_categories(message_data)
+        logger.debug("Response from /classify: %s, %s", status_code, response_content)
+    except Exception:
+        logger.exception("Error handling /classify request")
 
-                        try:
-                            async with aiohttp.ClientSession() as session:
-                                async with session.post(f"http://{ML_BE_URL}:{ML_BE_PORT}/classify", json=message_data) as response:
-                                    response_json = await response.json()
-                                    print(f"Response from /classify: {response.status}, {response_json}")
-                        except Exception as e:
-                            print(f"Error sending request to /classify: {str(e)}")
+admission = AdmissionController(
+    'classifier',
+    timeout_reply={"stateCode": "MTCH-007", "bigCategory": [], "message": "Request timed out"},
+    overload_reply={"stateCode": "MTCH-008", "bigCategory": [], "message": "Server overloaded"},
+    max_backlog=CLASSIFIER_MAX_BACKLOG,
+    max_queue_age=MAX_QUEUE_AGE,
+)
+consumer = QueueConsumer('classifier', handle_classifier_message, CLASSIFIER_CONSUMER_CONCURRENCY, admission)
 
-                    except Exception as e:
-                        print(f"Exception in callback: {str(e)}")
-    except Exception as conn_error:
-        print(f"Connection error: {conn_error}")
+async def consume_from_classifier_queue():
+    await consumer.supervise()
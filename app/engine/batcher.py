@@ -0,0 +1,31 @@
+from app.config import MATCH_BATCH_SIZE, MATCH_BATCH_WAIT_MS, MATCH_CANDIDATE_DEPTH
+from app.engine.recommender import engine
+from app.utils.executors import cpu_executor
+from app.utils.microbatch import MicroBatcher
+
+
+class MatchBatcher(MicroBatcher):
+    """매칭 요청을 모아 한 번의 행렬 연산으로 점수 계산
+
+    최대 max_batch_size 개 또는 첫 요청 이후 max_wait_ms 동안 모인 요청을
+    engine.rank_batch 로 처리하고, 각 요청자에게 자기 순위 목록을 돌려준다.
+    순위 목록은 요청한 k 와 depth 중 큰 수만큼 계산한다 (후속 요청용 후보 목록).
+    stop() 은 대기 중인 요청까지 처리한 뒤 종료한다.
+    """
+
+    item_label = "requests"
+
+    def __init__(self, engine, max_batch_size=32, max_wait_ms=5, depth=1):
+        super().__init__(max_batch_size, max_wait_ms)
+        self.engine = engine
+        self.depth = max(1, depth)
+
+    async def submit(self, query):
+        """MatchQuery 를 배치에 넣고 점수 순 Recommendation 목록을 기다림"""
+        return await super().submit(query)
+
+    async def process_batch(self, queries):
+        return await cpu_executor.run(self.engine.rank_batch, queries, self.depth)
+
+
+match_batcher = MatchBatcher(engine, MATCH_BATCH_SIZE, MATCH_BATCH_WAIT_MS, MATCH_CANDIDATE_DEPTH)
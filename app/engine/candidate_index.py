@@ -0,0 +1,230 @@
+import math
+import threading
+import numpy as np
+from app.engine.features import normalize_value
+
+
+# 나이 버킷을 배열로 내보낼 때 알 수 없는 나이
+NO_AGE_BUCKET = np.iinfo(np.int32).min
+
+
+def age_bucket(value):
+    """나이를 정수 버킷으로. 알 수 없으면 None"""
+    try:
+        age = float(value)
+    except (TypeError, ValueError):
+        return None
+    return int(math.floor(age)) if math.isfinite(age) else None
+
+
+def _normalize_codes(codes, dictionary, normalize):
+    """사전 값을 normalize 한 값끼리 묶은 (값 목록, 행별 값 코드)"""
+    keys = {}
+    mapping = np.array([keys.setdefault(normalize(value), len(keys)) for value in dictionary], dtype=np.int64)
+    return list(keys), mapping[codes]
+
+
+class CandidateIndex:
+    """하드 조건용 후보 인덱스
+
+    사용자마다 고정 슬롯을 배정하고 성별/나이 버킷/학과별 비트맵(bool 배열)을 유지한다.
+    요청의 후보 집합은 비트맵 교집합에서 제외 목록을 뺀 것이다. 특성 저장소가 사용자
+    변경마다 upsert/remove 로 한 사용자씩 갱신하므로 전체 재구성이 필요 없다.
+    삭제된 슬롯은 재사용하지 않고, compact() 로 한꺼번에 정리하면 epoch 가 바뀐다.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.uuids = []
+        self.slots = {}
+        self.alive = np.zeros(0, dtype=bool)
+        self.by_gender = {}
+        self.by_age = {}
+        self.by_major = {}
+        self._attributes = []
+        self.version = 0
+        self.epoch = 0
+
+    def __len__(self):
+        return len(self.uuids)
+
+    @classmethod
+    def from_arrays(cls, uuids, genders, gender_codes, buckets, majors, major_codes, epoch=0):
+        """발행된 특성 스냅샷의 속성 배열로 만든 읽기 전용 인덱스 (비트맵은 배열 비교로 한 번에 생성)
+
+        buckets 는 나이 버킷 배열이고 NO_AGE_BUCKET 은 나이를 알 수 없는 행이다.
+        """
+        index = cls()
+        index._set_arrays(uuids, genders, gender_codes, buckets, majors, major_codes)
+        index.epoch = epoch
+        return index
+
+    def _set_arrays(self, uuids, genders, gender_codes, buckets, majors, major_codes):
+        self.uuids = list(uuids)
+        self.slots = {uuid: slot for slot, uuid in enumerate(self.uuids)}
+        self.alive = np.ones(len(self.uuids), dtype=bool)
+        self.by_gender = {gender: gender_codes == code for code, gender in enumerate(genders)}
+        self.by_age = {int(bucket): buckets == bucket for bucket in np.unique(buckets) if bucket != NO_AGE_BUCKET}
+        self.by_major = {major: major_codes == code for code, major in enumerate(majors)}
+
+    # ---- 갱신 ----
+
+    def _grow(self, size):
+        capacity = len(self.alive)
+        if size <= capacity:
+            return
+        capacity = max(size, capacity * 2, 1024)
+        self.alive = np.resize(self.alive, capacity)
+        self.alive[len(self.uuids):] = False
+        for bitmaps in (self.by_gender, self.by_age, self.by_major):
+            for key, bitmap in bitmaps.items():
+                grown = np.zeros(capacity, dtype=bool)
+                grown[:len(bitmap)] = bitmap
+                bitmaps[key] = grown
+
+    def _bitmap(self, bitmaps, key):
+        if key not in bitmaps:
+            bitmaps[key] = np.zeros(len(self.alive), dtype=bool)
+        return bitmaps[key]
+
+    def _set_attributes(self, slot, attributes, value):
+        gender, bucket, major = attributes
+        self._bitmap(self.by_gender, gender)[slot] = value
+        if bucket is not None:
+            self._bitmap(self.by_age, bucket)[slot] = value
+        self._bitmap(self.by_major, major)[slot] = value
+
+    def upsert(self, uuid, user):
+        """사용자 추가/수정. 배정된 슬롯 반환"""
+        with self._lock:
+            self.version += 1
+            return self._upsert(uuid, user)
+
+    def remove(self, uuid):
+        """사용자 삭제(슬롯 tombstone). 비워진 슬롯 반환, 없으면 None"""
+        with self._lock:
+            self.version += 1
+            return self._remove(uuid)
+
+    def build(self, table):
+        """적재 직후 전체 사용자 UserTable 로 인덱스 생성. 슬롯은 테이블 행 순서"""
+        with self._lock:
+            self._build(table)
+            self.version += 1
+            self.epoch += 1
+
+    def compact(self, keep):
+        """keep 마스크(슬롯 길이)에 남는 슬롯만 앞으로 당겨 정리"""
+        with self._lock:
+            size = len(self.uuids)
+            keep = keep[:size]
+            self.uuids = [uuid for uuid, kept in zip(self.uuids, keep) if kept]
+            self._attributes = [attributes for attributes, kept in zip(self._attributes, keep) if kept]
+            self.slots = {uuid: slot for slot, uuid in enumerate(self.uuids)}
+            self.alive = self.alive[:size][keep]
+            for bitmaps in (self.by_gender, self.by_age, self.by_major):
+                for key in list(bitmaps):
+                    bitmaps[key] = bitmaps[key][:size][keep]
+            self.version += 1
+            self.epoch += 1
+
+    def _upsert(self, uuid, user):
+        attributes = (
+            normalize_value(user.get("gender")).upper(),
+            age_bucket(user.get("age")),
+            normalize_value(user.get("major")),
+        )
+        slot = self.slots.get(uuid)
+        if slot is None:
+            slot = len(self.uuids)
+            self._grow(slot + 1)
+            self.uuids.append(uuid)
+            self._attributes.append(None)
+            self.slots[uuid] = slot
+        elif self._attributes[slot] is not None:
+            self._set_attributes(slot, self._attributes[slot], False)
+        self._attributes[slot] = attributes
+        self._set_attributes(slot, attributes, True)
+        self.alive[slot] = True
+        return slot
+
+    def _remove(self, uuid):
+        slot = self.slots.pop(uuid, None)
+        if slot is None:
+            return None
+        self._set_attributes(slot, self._attributes[slot], False)
+        self._attributes[slot] = None
+        self.uuids[slot] = None
+        self.alive[slot] = False
+        return slot
+
+    def _build(self, table):
+        genders, gender_codes = _normalize_codes(*table.encoded("gender"), lambda value: normalize_value(value).upper())
+        majors, major_codes = _normalize_codes(*table.encoded("major"), normalize_value)
+        ages = table.numbers("age")
+        finite = np.isfinite(ages)
+        buckets = np.full(len(ages), NO_AGE_BUCKET, dtype=np.int64)
+        buckets[finite] = np.floor(ages[finite])
+        self._set_arrays(table.values("uuid"), genders, gender_codes, buckets, majors, major_codes)
+        self._attributes = list(zip(
+            np.array(genders, dtype=object)[gender_codes].tolist(),
+            [None if bucket == NO_AGE_BUCKET else bucket for bucket in buckets.tolist()],
+            np.array(majors, dtype=object)[major_codes].tolist(),
+        ))
+
+    # ---- 조회 ----
+
+    def attributes(self, slots=None):
+        """슬롯 순서의 (성별, 나이 버킷, 학과) 목록 (삭제된 슬롯은 None). slots 를 주면 그 슬롯만"""
+        with self._lock:
+            if slots is not None:
+                return [self._attributes[slot] for slot in slots]
+            return list(self._attributes)
+
+    def slot_uuids(self):
+        """슬롯 순서의 uuid 목록 (삭제된 슬롯은 None)"""
+        with self._lock:
+            return list(self.uuids)
+
+    def _union(self, bitmaps, keys):
+        result = np.zeros(len(self.alive), dtype=bool)
+        for key in keys:
+            result |= bitmaps[key]
+        return result
+
+    def candidates(self, query, size=None, epoch=None):
+        """MatchQuery 의 하드 조건을 만족하는 슬롯 마스크 (길이 size)
+
+        epoch 가 주어졌는데 그 사이 compact() 로 슬롯이 바뀌었으면 None
+        """
+        with self._lock:
+            if epoch is not None and epoch != self.epoch:
+                return None
+            mask = self.alive.copy()
+
+            if query.gender_option:
+                mask &= self.by_gender.get(query.gender_option, False)
+
+            if query.age_option == "OLDER":
+                mask &= self._union(self.by_age, [b for b in self.by_age if b > query.my_age])
+            elif query.age_option == "YOUNGER":
+                mask &= self._union(self.by_age, [b for b in self.by_age if b < query.my_age])
+            elif query.age_option == "EQUAL":
+                mask &= self._union(self.by_age, [b for b in self.by_age if b == query.my_age])
+
+            # 같은 학과 허용 여부 (False 면 같은 학과 제외)
+            if not query.same_major_option and query.my_major in self.by_major:
+                mask &= ~self.by_major[query.my_major]
+
+            for uuid in query.excluded:
+                slot = self.slots.get(uuid)
+                if slot is not None:
+                    mask[slot] = False
+
+        size = len(self.uuids) if size is None else size
+        if len(mask) < size:
+            mask = np.concatenate([mask, np.zeros(size - len(mask), dtype=bool)])
+        return mask[:size]
+
+
+candidate_index = CandidateIndex()
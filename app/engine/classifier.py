@@ -0,0 +1,221 @@
+import os
+import json
+import logging
+import threading
+import importlib.util
+import subprocess
+from app.config import (
+    CLASSIFIER_FILE_PATH, CLASSIFIER_MODE, CLASSIFIER_CACHE_SIZE, CLASSIFIER_CACHE_PATH,
+    HOBBY_CATEGORY_SEED_PATH, HOBBY_CENTROID_MIN_SIMILARITY,
+)
+from app.utils.cache import LRUCache
+from app.utils.executors import io_executor
+from app.utils.files import process_tmp_path
+
+logger = logging.getLogger(__name__)
+
+# 새 캐시 항목이 이만큼 쌓이면 백그라운드에서 파일에 저장
+CACHE_SAVE_INTERVAL = 100
+
+
+class ClassifierError(Exception):
+    def __init__(self, state_code, message, details=None):
+        super().__init__(message)
+        self.state_code = state_code
+        self.message = message
+        self.details = details
+
+
+def normalize_category(value):
+    """분류 캐시와 취미 벡터의 키 정규화 (앞뒤 공백 제거, 연속 공백 축약, 소문자)"""
+    return " ".join(str(value).split()).lower()
+
+
+class ScriptBackend:
+    """분류 스크립트를 실행하고 "대분류: ..." 출력 파싱"""
+
+    def __init__(self, file_path):
+        self.file_path = file_path
+
+    def classify(self, uuid, small_categories, timeout=None):
+        command = ['python', self.file_path, '--uuid', str(uuid), '--subcategory'] + list(small_categories)
+        try:
+            result = subprocess.run(command, capture_output=True, text=True, timeout=timeout)
+        except subprocess.TimeoutExpired:
+            raise ClassifierError("MTCH-007", "Request timed out")
+        if result.returncode != 0:
+            raise ClassifierError("MTCH-005", "Error running classifier script", result.stderr.strip())
+
+        output_lines = result.stdout.strip().split('\n')
+        if len(output_lines) < 2:
+            raise ClassifierError("MTCH-006", "Invalid script output")
+
+        # 출력에서 대분류 추출 (예: "대분류: 스포츠, 자기계발")
+        big_category_line = output_lines[1]
+        if not big_category_line.startswith("대분류: "):
+            raise ClassifierError("MTCH-006", "Invalid big category output")
+        return [cat.strip() for cat in big_category_line.replace("대분류: ", "").split(",")]
+
+
+class ModuleBackend:
+    """분류 스크립트를 모듈로 한 번 불러와 classify(small_categories) 를 직접 호출"""
+
+    def __init__(self, file_path):
+        spec = importlib.util.spec_from_file_location("hobby_classifier_module", file_path)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        if not callable(getattr(module, "classify", None)):
+            raise ImportError(f"{file_path} has no classify() function")
+        self._classify = module.classify
+
+    def classify(self, uuid, small_categories, timeout=None):
+        try:
+            return [str(cat).strip() for cat in self._classify(list(small_categories))]
+        except Exception as e:
+            raise ClassifierError("MTCH-005", "Error running classifier script", str(e))
+
+
+class EmbeddingBackend:
+    """소분류 벡터와 가장 가까운 대분류 중심 벡터로 분류 (외부 스크립트/네트워크 없이 동작)
+
+    중심은 대분류별 라벨된 소분류 벡터 평균이다. 라벨은 만들 때 한 번 모으므로(시드 파일 + 분류 캐시)
+    이 백엔드가 낸 결과가 다시 중심을 움직이지 않는다.
+    """
+
+    def __init__(self, index, labels, min_similarity=0.2):
+        self.index = index
+        self.min_similarity = min_similarity
+        self.names, self.centroids = index.centroids(labels)
+        logger.info("Embedding classifier built %d centroids from %d labels", len(self.names), len(labels))
+
+    def classify(self, uuid, small_categories, timeout=None):
+        if not self.names:
+            raise ClassifierError("MTCH-005", "No labeled categories for embedding classifier")
+        results = []
+        for small, (big, similarity) in zip(small_categories, self.index.nearest(small_categories, self.names, self.centroids)):
+            if similarity < self.min_similarity:
+                raise ClassifierError("MTCH-006", "Unknown category", small)
+            results.append(big)
+        return results
+
+
+def load_category_seed(path):
+    """{대분류: [소분류, ...]} JSON → {정규화한 소분류: 대분류}"""
+    if not path or not os.path.exists(path):
+        return {}
+    with open(path, mode="r", encoding="utf-8") as file:
+        seed = json.load(file)
+    return {normalize_category(small): big for big, smalls in seed.items() for small in smalls}
+
+
+class HobbyClassifier:
+    """한 번 적재해 계속 쓰는 소분류 → 대분류 분류기
+
+    결과는 정규화한 소분류를 키로 LRU 캐시에 보관하고, 캐시에 없는 소분류만 백엔드로 보낸다.
+    cache_path 가 있으면 캐시를 파일로 저장해 재시작 후에도 사용한다. 저장은 io_executor 에서 하므로
+    분류 요청은 파일 쓰기를 기다리지 않는다. 종료할 때 save_cache() 로 남은 항목을 저장한다.
+    """
+
+    def __init__(self, file_path, mode="script", cache_size=10000, cache_path=None, seed_path=None):
+        self.file_path = file_path
+        self.seed_path = seed_path
+        self.mode = mode
+        self.cache = LRUCache(cache_size)
+        self.cache_path = cache_path
+        self._backend = None
+        self._backend_lock = threading.Lock()
+        self._unsaved = 0
+        self._saving = False
+        self._lock = threading.Lock()
+        self._save_lock = threading.Lock()
+
+    @property
+    def backend(self):
+        with self._backend_lock:
+            if self._backend is None:
+                if self.mode == "module":
+                    self._backend = ModuleBackend(self.file_path)
+                elif self.mode == "embedding":
+                    from app.engine.hobby_vectors import hobby_vectors  # embedding 모드에서만 필요
+                    labels = dict(self.cache.items())
+                    labels.update(load_category_seed(self.seed_path))
+                    self._backend = EmbeddingBackend(hobby_vectors, labels, HOBBY_CENTROID_MIN_SIMILARITY)
+                else:
+                    self._backend = ScriptBackend(self.file_path)
+            return self._backend
+
+    def lookup(self, small_categories):
+        """캐시에서만 조회. 없는 항목은 None"""
+        return [self.cache.get(normalize_category(cat)) for cat in small_categories]
+
+    def classify(self, uuid, small_categories, cached=None, timeout=None):
+        """소분류 목록을 대분류 목록으로 변환 (캐시 미스만 백엔드에서 분류). timeout(초)은 스크립트 실행 한도"""
+        results = list(cached) if cached is not None else self.lookup(small_categories)
+        misses = []
+        for i, result in enumerate(results):
+            if result is None and small_categories[i] not in misses:
+                misses.append(small_categories[i])
+        if not misses:
+            return results
+
+        big_categories = self.backend.classify(uuid, misses, timeout)
+        if len(big_categories) == 1 and len(misses) > 1:
+            # 단일 대분류를 smallCategory 개수만큼 반복 (어느 항목의 결과인지 알 수 없으므로 캐시하지 않음)
+            classified = {cat: big_categories[0] for cat in misses}
+        elif len(big_categories) != len(misses):
+            raise ClassifierError("MTCH-006", "Mismatch in category count")
+        else:
+            classified = dict(zip(misses, big_categories))
+            for small, big in classified.items():
+                self.cache.put(normalize_category(small), big)
+            with self._lock:
+                self._unsaved += len(classified)
+                if self.cache_path and self._unsaved >= CACHE_SAVE_INTERVAL and not self._saving:
+                    self._saving = True
+                    io_executor.submit(self._save_in_background)
+
+        return [result if result is not None else classified[small_categories[i]] for i, result in enumerate(results)]
+
+    def warm_up(self):
+        """캐시 파일을 읽고 백엔드를 미리 준비 (module 모드면 분류 모듈 import)"""
+        self.load_cache()
+        return self.backend
+
+    def load_cache(self):
+        if not self.cache_path or not os.path.exists(self.cache_path):
+            return
+        with open(self.cache_path, mode="r", encoding="utf-8") as file:
+            for key, value in json.load(file).items():
+                self.cache.put(key, value)
+        logger.info("Classifier cache loaded %d entries", len(self.cache))
+
+    def _save_in_background(self):
+        try:
+            self.save_cache()
+        except Exception as e:
+            logger.exception("Error saving classifier cache: %s", e)
+        finally:
+            self._saving = False
+
+    def save_cache(self):
+        """새 항목이 있으면 캐시 전체를 파일에 다시 씀 (백그라운드 저장과 겹치지 않게 한 번에 하나씩)"""
+        if not self.cache_path:
+            return
+        with self._save_lock:
+            with self._lock:
+                if not self._unsaved:
+                    return
+                entries = dict(self.cache.items())
+                self._unsaved = 0
+            tmp_path = process_tmp_path(self.cache_path)
+            with open(tmp_path, mode="w", encoding="utf-8") as file:
+                json.dump(entries, file, ensure_ascii=False)
+            os.replace(tmp_path, self.cache_path)
+
+    def stats(self):
+        return dict(self.cache.stats(), mode=self.mode)
+
+
+hobby_classifier = HobbyClassifier(
+    CLASSIFIER_FILE_PATH, CLASSIFIER_MODE, CLASSIFIER_CACHE_SIZE, CLASSIFIER_CACHE_PATH, HOBBY_CATEGORY_SEED_PATH,
+)
@@ -0,0 +1,274 @@
+import logging
+import threading
+import numpy as np
+from app.config import FEATURE_COMPACT_RATIO
+from app.engine.candidate_index import candidate_index
+from app.engine.features import UserFeatures, MBTI_AXES, encode_user
+from app.storage.user_repository import user_repository
+from app.utils.executors import io_executor
+
+logger = logging.getLogger(__name__)
+
+# 압축을 고려하기 시작하는 최소 슬롯 수
+COMPACT_MIN_SLOTS = 1024
+
+
+def _frozen(view):
+    view.flags.writeable = False
+    return view
+
+
+class FeatureStore:
+    """사용자당 인코딩된 특성 한 행을 유지하는 저장소
+
+    사용자 저장소의 변경을 구독해 CREATE 는 행 추가, UPDATE 는 행 수정, DELETE 는 tombstone 으로
+    처리한다. 슬롯 배정은 후보 인덱스가 맡으므로 행 번호가 인덱스 슬롯과 같다. tombstone 이
+    많아지면 백그라운드에서 압축하고, 점수 계산은 snapshot() 의 float32 행렬을 그대로 읽는다.
+
+    snapshot() 은 내보낸 뒤 바뀌지 않는다. 내보낸 행을 고치는 UPDATE 는 배열을 복사한 뒤 새 배열에 쓰고
+    (다음 스냅샷까지는 그 배열에 바로 씀), 스냅샷 범위 밖에 붙는 CREATE 와 alive 만 바꾸는 DELETE 는 복사하지 않는다.
+    """
+
+    def __init__(self, index, compact_ratio=0.25):
+        self.index = index
+        self.compact_ratio = compact_ratio
+        self._lock = threading.RLock()
+        self.loaded = False
+        self.version = 0
+        self.epoch = 0
+        self.count = 0
+        self.tombstones = 0
+        self.uuids = np.empty(0, dtype=object)
+        self.alive = np.zeros(0, dtype=bool)
+        self.age = np.zeros(0, dtype=np.float32)
+        self.contact = np.zeros(0, dtype=np.float32)
+        self.mbti = np.zeros((0, 2 * len(MBTI_AXES)), dtype=np.float32)
+        self.hobby = np.zeros((0, 0), dtype=np.float32)
+        self.hobby_vocab = {}
+        self._snapshot = None
+        # 내보낸 스냅샷이 보고 있는 행 수. 이 범위의 행은 제자리에서 고치지 않는다
+        self._shared = 0
+        # 마지막 export() 이후 바뀐 uuid (발행 스냅샷의 변경분). None 이면 변경분으로 나타낼 수 없음
+        self._dirty = None
+        self._compacting = False
+
+    # ---- 사용자 저장소 리스너 ----
+
+    def on_change(self, op, uuid, user):
+        with self._lock:
+            if op == "LOAD":
+                self._build(user)
+                return
+            if self._dirty is not None:
+                self._dirty.add(uuid)
+            if op == "DELETE":
+                slot = self.index.remove(uuid)
+                if slot is not None:
+                    self._tombstone(slot)
+            else:
+                self._patch(self.index.upsert(uuid, user), uuid, user)
+        if self._should_compact():
+            self._compacting = True
+            io_executor.submit(self.compact)
+
+    def _build(self, table):
+        self.index.build(table)
+        features = UserFeatures(table)
+        self.uuids = features.uuids
+        self.alive = np.ones(len(features), dtype=bool)
+        self.age = features.age
+        self.contact = features.contact
+        self.mbti = features.mbti
+        self.hobby = features.hobby
+        self.hobby_vocab = features.hobby_vocab
+        self.count = len(features)
+        self.tombstones = 0
+        self.epoch = self.index.epoch
+        self.loaded = True
+        self._shared = 0
+        # 취미 열 번호가 새로 정해지므로 이전 발행 스냅샷 위의 변경분으로는 나타낼 수 없음
+        self._dirty = None
+        self._changed()
+
+    def _changed(self):
+        self.version += 1
+        self._snapshot = None
+
+    def _grow_rows(self, size):
+        capacity = len(self.uuids)
+        if size <= capacity:
+            return
+        capacity = max(size, capacity * 2, 1024)
+
+        def grow(array, fill=0):
+            grown = np.full((capacity,) + array.shape[1:], fill, dtype=array.dtype)
+            grown[:len(array)] = array
+            return grown
+
+        self.uuids = grow(self.uuids, "")
+        self.alive = grow(self.alive, False)
+        self.age = grow(self.age, np.nan)
+        self.contact = grow(self.contact, np.nan)
+        self.mbti = grow(self.mbti)
+        self.hobby = grow(self.hobby)
+
+    def _detach(self, slot):
+        """slot 행이 내보낸 스냅샷 범위 안이면 특성 배열을 복사해 스냅샷과 떼어냄"""
+        if slot >= self._shared:
+            return
+        self.uuids = self.uuids.copy()
+        self.age = self.age.copy()
+        self.contact = self.contact.copy()
+        self.mbti = self.mbti.copy()
+        self.hobby = self.hobby.copy()
+        self._shared = 0
+
+    def _hobby_column(self, hobby):
+        column = self.hobby_vocab.get(hobby)
+        if column is None:
+            column = len(self.hobby_vocab)
+            self.hobby_vocab[hobby] = column
+            if column >= self.hobby.shape[1]:
+                grown = np.zeros((self.hobby.shape[0], max(column + 1, self.hobby.shape[1] * 2, 16)), dtype=np.float32)
+                grown[:, :self.hobby.shape[1]] = self.hobby
+                self.hobby = grown
+        return column
+
+    def _patch(self, slot, uuid, user):
+        """한 사용자 행만 추가 또는 수정"""
+        age, contact, mbti, hobbies = encode_user(user)
+        self._detach(slot)
+        self._grow_rows(slot + 1)
+        self.count = max(self.count, slot + 1)
+        columns = [self._hobby_column(hobby) for hobby in hobbies]
+        self.uuids[slot] = uuid
+        self.alive[slot] = True
+        self.age[slot] = age
+        self.contact[slot] = contact
+        self.mbti[slot] = mbti
+        self.hobby[slot] = 0.0
+        self.hobby[slot, columns] = 1.0
+        self._changed()
+
+    def _tombstone(self, slot):
+        # 삭제된 슬롯은 후보 인덱스가 거르므로 특성 행은 압축 때까지 그대로 둔다
+        self.alive[slot] = False
+        self.tombstones += 1
+        self._changed()
+
+    # ---- 압축 ----
+
+    def _should_compact(self):
+        return (
+            not self._compacting
+            and self.count >= COMPACT_MIN_SLOTS
+            and self.tombstones > self.count * self.compact_ratio
+        )
+
+    def compact(self):
+        """tombstone 행을 제거하고 후보 인덱스 슬롯도 같은 순서로 정리"""
+        try:
+            with self._lock:
+                keep = self.alive[:self.count].copy()
+                self.uuids = self.uuids[:self.count][keep]
+                self.alive = self.alive[:self.count][keep]
+                self.age = self.age[:self.count][keep]
+                self.contact = self.contact[:self.count][keep]
+                self.mbti = self.mbti[:self.count][keep]
+                self.hobby = self.hobby[:self.count][keep]
+                self.index.compact(keep)
+                removed = self.tombstones
+                self.count = len(self.uuids)
+                self.tombstones = 0
+                self.epoch = self.index.epoch
+                self._shared = 0
+                self._changed()
+            logger.info("Feature store compacted: %d users, %d tombstones removed", self.count, removed)
+        except Exception as e:
+            logger.exception("Error compacting feature store: %s", e)
+        finally:
+            self._compacting = False
+
+    # ---- 조회 ----
+
+    def snapshot(self):
+        """현재 특성 행렬의 읽기 전용 스냅샷 (UserFeatures). 변경이 없으면 같은 객체를 재사용
+
+        이후의 변경은 이 스냅샷에 보이지 않으므로 점수 계산 스레드가 락 없이 읽어도 된다.
+        """
+        with self._lock:
+            if self._snapshot is None:
+                snapshot = object.__new__(UserFeatures)
+                snapshot.uuids = _frozen(self.uuids[:self.count])
+                snapshot.age = _frozen(self.age[:self.count])
+                snapshot.contact = _frozen(self.contact[:self.count])
+                snapshot.mbti = _frozen(self.mbti[:self.count])
+                snapshot.hobby = _frozen(self.hobby[:self.count])
+                snapshot.hobby_vocab = dict(self.hobby_vocab)
+                snapshot.epoch = self.epoch
+                self._snapshot = snapshot
+                self._shared = self.count
+            return self._snapshot
+
+    def export(self):
+        """살아 있는 행만 모은 특성 배열과 후보 인덱스 속성의 복사본 (다른 프로세스에 발행용)
+
+        이후 export_changes() 는 이 시점부터 바뀐 사용자만 담는다.
+        """
+        with self._lock:
+            keep = self.alive[:self.count].copy()
+            attributes = [attributes for attributes, kept in zip(self.index.attributes(), keep) if kept]
+            self._dirty = set()
+            return self._exported(np.flatnonzero(keep), attributes)
+
+    def export_changes(self, limit):
+        """마지막 export() 이후 바뀐 사용자만 담은 export() 형식의 복사본
+
+        "deleted" 에 그 사이 삭제된 uuid 목록, "users" 에 지금 살아 있는 사용자 수를 더한다.
+        바뀐 사용자가 limit 명을 넘거나 그 사이 전체를 다시 적재했으면 None (전체를 export() 해야 함)
+        """
+        with self._lock:
+            if self._dirty is None or len(self._dirty) > limit:
+                return None
+            slots, deleted = [], []
+            for uuid in sorted(self._dirty):
+                slot = self.index.slots.get(uuid)
+                if slot is None:
+                    deleted.append(uuid)
+                else:
+                    slots.append(slot)
+            slots = np.array(sorted(slots), dtype=np.int64)
+            exported = self._exported(slots, self.index.attributes(slots.tolist()))
+            exported["deleted"] = deleted
+            exported["users"] = len(self)
+            return exported
+
+    def _exported(self, slots, attributes):
+        vocab = sorted(self.hobby_vocab, key=self.hobby_vocab.get)
+        return {
+            "version": self.version,
+            "uuids": self.uuids[slots].tolist(),
+            "age": self.age[slots],
+            "contact": self.contact[slots],
+            "mbti": self.mbti[slots],
+            "hobby": self.hobby[slots, :len(vocab)],
+            "hobbyVocab": vocab,
+            "attributes": attributes,
+        }
+
+    def __len__(self):
+        """살아 있는 사용자 수"""
+        return self.count - self.tombstones
+
+    def stats(self):
+        return {
+            "slots": self.count,
+            "tombstones": self.tombstones,
+            "hobbyVocabulary": len(self.hobby_vocab),
+            "epoch": self.epoch,
+            "version": self.version,
+        }
+
+
+feature_store = FeatureStore(candidate_index, FEATURE_COMPACT_RATIO)
+user_repository.add_listener(feature_store.on_change)
@@ -0,0 +1,146 @@
+import ast
+import numpy as np
+
+# MBTI 네 개 축 (앞 글자를 1, 뒷 글자를 0 으로 인코딩)
+MBTI_AXES = ("EI", "SN", "TF", "JP")
+
+# 연락 빈도 서열값
+CONTACT_FREQUENCY_LEVELS = {
+    "FREQUENT": 2.0, "자주": 2.0,
+    "NORMAL": 1.0, "보통": 1.0,
+    "RARE": 0.0, "가끔": 0.0, "적음": 0.0,
+}
+
+# 옵션 값 중 "상관없음" 으로 취급하는 값
+NO_PREFERENCE = {"", "NONE", "ANY", "ALL", "RANDOM", "UNDEFINED", "NULL", "NAN", "상관없음"}
+
+def parse_hobbies(value):
+    """hobby 컬럼/옵션 값을 문자열 리스트로 변환"""
+    if value is None:
+        return []
+    if isinstance(value, float) and np.isnan(value):
+        return []
+    if isinstance(value, (list, tuple, set)):
+        items = value
+    else:
+        text = str(value).strip()
+        if text.startswith("["):
+            try:
+                items = ast.literal_eval(text)
+            except (ValueError, SyntaxError):
+                items = text.strip("[]").split(",")
+        else:
+            items = text.replace("|", ",").split(",")
+    return [cleaned for item in items if (cleaned := str(item).strip().strip("'\""))]
+
+
+def parse_bool(value):
+    if isinstance(value, str):
+        return value.strip().upper() in ("TRUE", "1", "Y", "YES")
+    return bool(value)
+
+
+def is_no_preference(value):
+    if value is None:
+        return True
+    return str(value).strip().upper() in NO_PREFERENCE
+
+
+def encode_mbti(value):
+    """MBTI 문자열을 (값, 마스크) 4차원 벡터로 변환. 알 수 없는 축은 마스크 0"""
+    vec = np.zeros(len(MBTI_AXES), dtype=np.float32)
+    mask = np.zeros(len(MBTI_AXES), dtype=np.float32)
+    if value is None or (isinstance(value, float) and np.isnan(value)):
+        return vec, mask
+    for letter in str(value).upper():
+        for i, axis in enumerate(MBTI_AXES):
+            if letter in axis:
+                vec[i] = 1.0 if letter == axis[0] else 0.0
+                mask[i] = 1.0
+    return vec, mask
+
+
+def encode_mbti_pairs(value):
+    """MBTI 를 8차원 벡터 [앞 글자 일치용 4, 뒷 글자 일치용 4] 로 변환
+
+    두 벡터의 내적이 곧 양쪽 모두 알려진 축 중 일치하는 축의 수가 된다.
+    """
+    vec, mask = encode_mbti(value)
+    return np.concatenate([mask * vec, mask * (1.0 - vec)])
+
+
+def encode_contact_frequency(value):
+    if value is None:
+        return np.nan
+    return CONTACT_FREQUENCY_LEVELS.get(str(value).strip().upper(), CONTACT_FREQUENCY_LEVELS.get(str(value).strip(), np.nan))
+
+
+def normalize_value(value):
+    if value is None or (isinstance(value, float) and np.isnan(value)):
+        return ""
+    return str(value).strip()
+
+
+def encode_user(user):
+    """사용자 한 명을 (age, contact, mbti 8차원, 취미 목록) 으로 인코딩"""
+    try:
+        age = float(user.get("age"))
+    except (TypeError, ValueError):
+        age = np.nan
+    return (
+        age,
+        encode_contact_frequency(user.get("contactFrequency")),
+        encode_mbti_pairs(user.get("mbti")),
+        parse_hobbies(user.get("hobby")),
+    )
+
+
+class UserFeatures:
+    """후보 사용자 전체의 인코딩된 특성 행렬 (행 순서는 후보 인덱스 슬롯 순서)
+
+    UserTable 의 컬럼 사전 값마다 한 번씩 인코딩한 뒤 코드 배열로 행을 채운다.
+    epoch 는 이 행렬을 만들 때의 후보 인덱스 슬롯 배치 세대
+    """
+
+    epoch = 0
+
+    def __init__(self, table):
+        codes, dictionary = table.encoded("uuid")
+        self.uuids = np.array([value.strip() for value in dictionary], dtype=object)[codes]
+        self.age = table.numbers("age")
+
+        codes, dictionary = table.encoded("contactFrequency")
+        self.contact = np.array([encode_contact_frequency(v) for v in dictionary], dtype=np.float32)[codes]
+
+        codes, dictionary = table.encoded("mbti")
+        mbti = np.zeros((len(dictionary), 2 * len(MBTI_AXES)), dtype=np.float32)
+        for i, value in enumerate(dictionary):
+            mbti[i] = encode_mbti_pairs(value)
+        self.mbti = mbti[codes]
+
+        # 취미 열 번호는 행 순서로 처음 나온 순서 (쓰이지 않는 사전 값은 건너뜀)
+        codes, dictionary = table.encoded("hobby")
+        used, first = np.unique(codes, return_index=True)
+        self.hobby_vocab = {}
+        columns = {}
+        for code in used[np.argsort(first, kind="stable")].tolist():
+            columns[code] = [self.hobby_vocab.setdefault(hobby, len(self.hobby_vocab)) for hobby in parse_hobbies(dictionary[code])]
+        hobby = np.zeros((len(dictionary), len(self.hobby_vocab)), dtype=np.float32)
+        for code, hobby_columns in columns.items():
+            hobby[code, hobby_columns] = 1.0
+        self.hobby = hobby[codes]
+
+    def __len__(self):
+        return len(self.uuids)
+
+    def subset(self, columns):
+        """지정한 행만 담은 UserFeatures (hobby_vocab 은 공유)"""
+        subset = object.__new__(UserFeatures)
+        subset.uuids = self.uuids[columns]
+        subset.age = self.age[columns]
+        subset.contact = self.contact[columns]
+        subset.mbti = self.mbti[columns]
+        subset.hobby = self.hobby[columns]
+        subset.hobby_vocab = self.hobby_vocab
+        subset.epoch = self.epoch
+        return subset
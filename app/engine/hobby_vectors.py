@@ -0,0 +1,301 @@
+"""취미/소분류 문자열 벡터
+
+정규화한 취미 문자열마다 단위 벡터 하나를 두고 매칭의 취미 점수와 embedding 분류 모드에서 쓴다.
+벡터는 임베딩 제공자(PROVIDERS)가 만들고, 한 번 만든 벡터는 섹션 파일(app.storage.snapshot 형식)에
+float32 행렬로 저장해 다음 시작 때 memmap 으로 연다. 여러 프로세스가 같은 파일을 열면 페이지 캐시를 공유한다.
+
+제공자:
+    local   문자 n-gram 해시 인코더. 결정적이고 외부 호출이 없어 오프라인/벤치마크에서도 같은 결과
+    openai  OpenAI 임베딩 API (openai 패키지와 OPENAI_API_KEY 필요)
+"""
+import os
+import zlib
+import logging
+import threading
+import numpy as np
+from app.config import (
+    HOBBY_EMBEDDING_PROVIDER, HOBBY_EMBEDDING_DIM, HOBBY_EMBEDDING_MODEL, HOBBY_VECTOR_PATH,
+)
+from app.engine.classifier import normalize_category
+from app.storage.snapshot import FORMAT_VERSION, SectionFile, SnapshotFormatError, write_sections, column_sections
+from app.utils.executors import io_executor
+from app.utils.files import process_tmp_path
+
+logger = logging.getLogger(__name__)
+
+# 새 벡터가 이만큼 쌓이면 백그라운드에서 파일에 저장
+SAVE_INTERVAL = 100
+
+
+def _normalize_rows(matrix):
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    return matrix / np.where(norms > 0, norms, 1.0)
+
+
+class HashingEncoder:
+    """문자 1~3-gram 과 단어를 해시해 dim 차원에 부호와 함께 더한 벡터
+
+    crc32 를 쓰므로 프로세스/실행마다 같은 벡터가 나온다. 글자를 공유하는 취미끼리 유사도가 높다.
+    """
+
+    def __init__(self, dim=256):
+        self.dim = dim
+        self.name = f"local-hash-{dim}"
+
+    def _features(self, text):
+        padded = f" {text} "
+        for n in (1, 2, 3):
+            for i in range(len(padded) - n + 1):
+                gram = padded[i:i + n]
+                if gram.strip():
+                    yield f"{n}:{gram}"
+        for word in text.split():
+            yield f"w:{word}"
+
+    def encode(self, texts):
+        vectors = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            hashes = np.array([zlib.crc32(feature.encode("utf-8")) for feature in self._features(text)], dtype=np.uint64)
+            if not len(hashes):
+                continue
+            signs = np.where((hashes // self.dim) % 2 == 0, 1.0, -1.0).astype(np.float32)
+            np.add.at(vectors[row], (hashes % self.dim).astype(np.intp), signs)
+        return vectors
+
+
+class OpenAIEncoder:
+    """OpenAI 임베딩 API 로 벡터 생성 (한 번에 batch_size 개씩)"""
+
+    def __init__(self, dim=256, model="text-embedding-3-small", batch_size=512):
+        self.dim = dim
+        self.model = model
+        self.batch_size = batch_size
+        self.name = f"openai-{model}-{dim}"
+        self._client = None
+
+    def encode(self, texts):
+        if self._client is None:
+            from openai import OpenAI  # 선택 의존성이라 이 제공자를 쓸 때만 불러옴
+            self._client = OpenAI()
+        vectors = []
+        for start in range(0, len(texts), self.batch_size):
+            response = self._client.embeddings.create(
+                model=self.model, input=list(texts[start:start + self.batch_size]), dimensions=self.dim,
+            )
+            vectors.extend(item.embedding for item in response.data)
+        return np.array(vectors, dtype=np.float32).reshape(len(texts), self.dim)
+
+
+# 제공자 이름 → 생성자(dim, model). 새 제공자는 encode(texts) → (len(texts), dim) 와 name 을 갖추고 여기에 등록
+PROVIDERS = {
+    "local": lambda dim, model: HashingEncoder(dim),
+    "openai": lambda dim, model: OpenAIEncoder(dim, model),
+}
+
+
+def make_provider(name, dim, model=None):
+    if name not in PROVIDERS:
+        raise ValueError(f"Unknown hobby embedding provider: {name}")
+    return PROVIDERS[name](dim, model)
+
+
+class HobbyVectorIndex:
+    """정규화한 취미 문자열 → 단위 벡터 저장소
+
+    파일에서 연 행렬(memmap, 읽기 전용)과 이번 프로세스에서 새로 만든 행을 합쳐 쓴다. 없는 문자열은
+    한 번에 모아 제공자에게 보내고, 새 행이 SAVE_INTERVAL 개 쌓이면 I/O 풀에서 파일 전체를 다시 쓴다
+    (점수 계산 스레드는 저장을 기다리지 않음). 종료할 때 save() 로 남은 행을 저장한다.
+    파일의 제공자 이름이 다르면(다른 모델/차원) 파일을 무시하고 새로 만든다.
+    """
+
+    def __init__(self, provider, path=None):
+        self.provider = provider
+        self.dim = provider.dim
+        self.path = path
+        self._rows = {}
+        self._base = np.zeros((0, self.dim), dtype=np.float32)
+        self._added = np.zeros((0, self.dim), dtype=np.float32)
+        self._added_count = 0
+        self._unsaved = 0
+        self._saving = False
+        self._loaded = False
+        self._lock = threading.Lock()
+        self._save_lock = threading.Lock()
+        # set_similarity 용 취미 열 행렬 캐시 (마지막 vocab 하나)
+        self._vocab_cache = None
+        self._vocab_lock = threading.Lock()
+
+    def load(self):
+        """벡터 파일을 memmap 으로 열기 (없거나 제공자가 다르면 빈 상태로 시작)"""
+        with self._lock:
+            self._load_locked()
+        return len(self._rows)
+
+    def _load_locked(self):
+        if self._loaded:
+            return
+        self._loaded = True
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            file = SectionFile(self.path)
+        except (OSError, SnapshotFormatError) as e:
+            logger.warning("Could not open hobby vector file %s: %s", self.path, e)
+            return
+        if file.meta.get("kind") != "hobbyVectors" or file.meta.get("provider") != self.provider.name:
+            logger.info("Ignoring hobby vector file %s made by %s", self.path, file.meta.get("provider"))
+            return
+        keys = file.strings("key")
+        self._base = file.section("vectors")
+        self._rows = {key: row for row, key in enumerate(keys)}
+        logger.info("Hobby vectors loaded %d entries (%s)", len(keys), self.provider.name)
+
+    def _append(self, keys, vectors):
+        needed = self._added_count + len(keys)
+        if needed > len(self._added):
+            grown = np.zeros((max(needed, len(self._added) * 2, 64), self.dim), dtype=np.float32)
+            grown[:self._added_count] = self._added[:self._added_count]
+            self._added = grown
+        self._added[self._added_count:needed] = vectors
+        base = len(self._base)
+        for offset, key in enumerate(keys):
+            self._rows[key] = base + self._added_count + offset
+        self._added_count = needed
+        self._unsaved += len(keys)
+
+    def vectors(self, texts):
+        """문자열마다 단위 벡터 (len(texts) × dim). 없는 문자열은 제공자로 한 번에 계산해 보관"""
+        keys = [normalize_category(text) for text in texts]
+        with self._lock:
+            self._load_locked()
+            missing = list(dict.fromkeys(key for key in keys if key not in self._rows))
+            if missing:
+                self._append(missing, _normalize_rows(self.provider.encode(missing)))
+            rows = np.array([self._rows[key] for key in keys], dtype=np.intp)
+            base = len(self._base)
+            result = np.empty((len(keys), self.dim), dtype=np.float32)
+            stored = rows < base
+            result[stored] = self._base[rows[stored]]
+            result[~stored] = self._added[rows[~stored] - base]
+            if self.path and self._unsaved >= SAVE_INTERVAL and not self._saving:
+                self._saving = True
+                io_executor.submit(self._save_in_background)
+        return result
+
+    def _save_in_background(self):
+        try:
+            self.save()
+        except Exception as e:
+            logger.exception("Error saving hobby vectors: %s", e)
+        finally:
+            self._saving = False
+
+    def set_vectors(self, hobby_sets):
+        """취미 목록마다 벡터 평균을 정규화한 집합 벡터 (len(hobby_sets) × dim). 빈 목록은 0 벡터"""
+        flat = [hobby for hobbies in hobby_sets for hobby in hobbies]
+        result = np.zeros((len(hobby_sets), self.dim), dtype=np.float32)
+        if not flat:
+            return result
+        vectors = self.vectors(flat)
+        owners = np.repeat(np.arange(len(hobby_sets)), [len(hobbies) for hobbies in hobby_sets])
+        np.add.at(result, owners, vectors)
+        return _normalize_rows(result)
+
+    def set_similarity(self, hobby_sets, hobby_matrix, vocab):
+        """요청 취미 목록들과 후보 취미 행렬의 집합 벡터 코사인 유사도 (요청 수 × 후보 수, 0~1)
+
+        hobby_matrix 는 후보 × 취미 열 0/1 행렬, vocab 은 {취미: 열}. 열별 취미 벡터를 E 라 하면 후보 집합
+        벡터는 H @ E 이고, 점수는 (요청 집합 벡터 @ E.T) @ H.T 를 후보 집합 벡터 길이로 나눈 값이다.
+        후보 쪽 행렬 곱은 취미 열 수 기준이라 같은 문자열 비율 계산과 비용이 같다. 후보 집합 벡터 길이는
+        취미 열 수가 차원보다 작으면 E @ E.T 로 계산한다. E 와 E @ E.T 는 vocab 이 바뀔 때만 다시 만든다.
+        """
+        columns, gram = self._vocab_matrix(vocab, hobby_matrix.shape[1])
+        if gram is not None:
+            norms = np.sqrt(np.maximum(((hobby_matrix @ gram) * hobby_matrix).sum(axis=1), 0.0))
+        else:
+            norms = np.linalg.norm(hobby_matrix @ columns, axis=1)
+        queries = self.set_vectors(hobby_sets) @ columns.T
+        scores = (queries @ hobby_matrix.T) / np.where(norms > 0, norms, 1.0)
+        # 계산 순서에 따른 float 오차로 같은 취미 집합의 순위가 샤드별로 갈리지 않도록 반올림
+        return np.round(np.clip(scores, 0.0, 1.0), 6)
+
+    def _vocab_matrix(self, vocab, width):
+        """vocab 의 열별 단위 벡터 행렬 E (width × dim) 와 width 가 차원 이하일 때의 E @ E.T
+
+        vocab 은 열 번호 순서로 취미를 덧붙여 가는 사전이다 (특성 저장소와 발행 스냅샷 모두). 그래서 열 순서
+        취미 목록이 vocab 의 버전이 되고, 캐시한 목록이 지금 목록의 앞부분이면 새로 붙은 취미의 벡터만 계산한다.
+        """
+        keys = list(vocab)
+        with self._vocab_lock:
+            cache = self._vocab_cache
+            if cache is not None and cache["width"] == width and cache["keys"] == keys:
+                return cache["columns"], cache["gram"]
+            if cache is not None and keys[:len(cache["keys"])] == cache["keys"]:
+                known = cache["vectors"]
+            else:
+                known = np.zeros((0, self.dim), dtype=np.float32)
+            added = keys[len(known):]
+            vectors = np.concatenate([known, self.vectors(added)]) if added else known
+            columns = np.zeros((width, self.dim), dtype=np.float32)
+            columns[:len(keys)] = vectors
+            gram = columns @ columns.T if width <= self.dim else None
+            self._vocab_cache = {"keys": keys, "width": width, "vectors": vectors, "columns": columns, "gram": gram}
+            return columns, gram
+
+    def centroids(self, labels):
+        """{소분류: 대분류} → (대분류 이름 목록, 대분류별 단위 중심 벡터 행렬)"""
+        names = sorted(set(labels.values()))
+        if not names:
+            return names, np.zeros((0, self.dim), dtype=np.float32)
+        small = list(labels)
+        codes = {name: i for i, name in enumerate(names)}
+        centroids = np.zeros((len(names), self.dim), dtype=np.float32)
+        np.add.at(centroids, [codes[labels[key]] for key in small], self.vectors(small))
+        return names, _normalize_rows(centroids)
+
+    def nearest(self, texts, names, centroids):
+        """문자열마다 가장 가까운 중심의 (이름, 코사인 유사도)"""
+        if not len(names):
+            return [(None, 0.0) for _ in texts]
+        scores = self.vectors(texts) @ centroids.T
+        best = scores.argmax(axis=1)
+        return [(names[j], float(scores[i, j])) for i, j in enumerate(best)]
+
+    def save(self):
+        """새 벡터가 있으면 기존 행과 합쳐 파일에 다시 씀 (백그라운드 저장과 겹치지 않게 한 번에 하나씩)"""
+        if not self.path:
+            return
+        with self._save_lock:
+            with self._lock:
+                if not self._unsaved:
+                    return
+                keys = sorted(self._rows, key=self._rows.get)
+                matrix = np.concatenate([np.asarray(self._base), self._added[:self._added_count]])
+                self._unsaved = 0
+            self._write(keys, matrix)
+
+    def _write(self, keys, matrix):
+        meta = {"version": FORMAT_VERSION, "kind": "hobbyVectors", "provider": self.provider.name, "dim": self.dim}
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        def sections():
+            yield from column_sections("key", keys)
+            yield "vectors", matrix.astype("<f4")
+
+        write_sections(self.path, meta, sections(), tmp_path=process_tmp_path(self.path))
+
+    def stats(self):
+        return {
+            "provider": self.provider.name,
+            "dim": self.dim,
+            "vectors": len(self._rows),
+            "mapped": len(self._base),
+            "unsaved": self._unsaved,
+        }
+
+
+hobby_vectors = HobbyVectorIndex(
+    make_provider(HOBBY_EMBEDDING_PROVIDER, HOBBY_EMBEDDING_DIM, HOBBY_EMBEDDING_MODEL), HOBBY_VECTOR_PATH,
+)
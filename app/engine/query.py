@@ -0,0 +1,96 @@
+from dataclasses import dataclass
+from app.config import MATCH_MAX_K
+from app.engine.features import parse_hobbies, parse_bool, is_no_preference
+
+# 매칭 요청의 필수 필드
+MATCH_REQUIRED_FIELDS = [
+    "matcherUuid",
+    "contactFrequencyOption",
+    "hobbyOption",
+    "genderOption",
+    "sameMajorOption",
+    "ageOption",
+    "mbtiOption",
+    "myMajor",
+    "myAge",
+    "duplicationList",
+    #"importantOption",
+    "mbtiWeight",
+    "ageWeight",
+    "hobbyWeight",
+    "contactFrequencyWeight",
+]
+
+
+@dataclass(frozen=True)
+class MatchWeights:
+    mbti: float
+    age: float
+    hobby: float
+    contact_frequency: float
+
+
+@dataclass(frozen=True)
+class MatchQuery:
+    """요청 단위의 매칭 조건. 사용자 테이블을 건드리지 않고 점수 계산에 바로 전달된다"""
+
+    matcher_uuid: str
+    gender_option: str
+    age_option: str
+    same_major_option: bool
+    mbti_option: str
+    hobby_option: tuple
+    contact_frequency_option: str
+    my_major: str
+    my_age: float
+    weights: MatchWeights
+    excluded: frozenset
+    # 요청한 추천 인원 수 (없으면 기존처럼 한 명만 응답)
+    k: int = None
+
+    @property
+    def top_k(self):
+        return self.k or 1
+
+    @classmethod
+    def from_request(cls, data):
+        """요청 데이터에서 MatchQuery 생성. 값이 잘못되면 ValueError"""
+        try:
+            my_age = float(data["myAge"])
+            weights = MatchWeights(
+                mbti=float(data["mbtiWeight"]),
+                age=float(data["ageWeight"]),
+                hobby=float(data["hobbyWeight"]),
+                contact_frequency=float(data["contactFrequencyWeight"]),
+            )
+        except (TypeError, ValueError) as e:
+            raise ValueError(f"Invalid numeric field: {e}")
+
+        matcher_uuid = str(data["matcherUuid"])
+        duplication_list = data.get("duplicationList") or []
+        if not isinstance(duplication_list, list):
+            raise ValueError("duplicationList must be a list")
+
+        k = data.get("k")
+        if k is not None:
+            if isinstance(k, bool) or not isinstance(k, (int, str)) or not str(k).strip().isdigit():
+                raise ValueError("k must be a positive integer")
+            k = int(k)
+            if not 1 <= k <= MATCH_MAX_K:
+                raise ValueError(f"k must be between 1 and {MATCH_MAX_K}")
+
+        gender_option = data.get("genderOption")
+        return cls(
+            matcher_uuid=matcher_uuid,
+            gender_option="" if is_no_preference(gender_option) else str(gender_option).strip().upper(),
+            age_option=str(data.get("ageOption") or "").strip().upper(),
+            same_major_option=parse_bool(data.get("sameMajorOption")),
+            mbti_option=str(data.get("mbtiOption") or ""),
+            hobby_option=tuple(parse_hobbies(data.get("hobbyOption"))),
+            contact_frequency_option=str(data.get("contactFrequencyOption") or ""),
+            my_major=str(data.get("myMajor") or "").strip(),
+            my_age=my_age,
+            weights=weights,
+            excluded=frozenset(str(uuid) for uuid in duplication_list) | {matcher_uuid},
+            k=k,
+        )
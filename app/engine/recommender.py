@@ -0,0 +1,209 @@
+import logging
+from dataclasses import dataclass
+import numpy as np
+from app.config import HOBBY_SIMILARITY
+from app.storage.user_repository import user_repository
+from app.engine.candidate_index import candidate_index
+from app.engine.feature_store import feature_store
+from app.engine.features import encode_mbti_pairs, encode_contact_frequency
+from app.engine.hobby_vectors import hobby_vectors
+from app.engine.shards import shard_pool
+
+logger = logging.getLogger(__name__)
+
+# 나이 차이가 이 값 이상이면 나이 점수는 0
+AGE_SPAN = 10.0
+
+
+@dataclass
+class Recommendation:
+    uuid: str
+    score: float
+
+
+class RecommendationEngine:
+    """프로세스에 상주하는 추천 엔진. 특성 저장소의 행렬을 읽어 요청마다 벡터 연산으로 점수 계산
+
+    특성 행렬과 후보 인덱스는 사용자 CRUD 마다 특성 저장소가 한 행씩 갱신하므로 다시 적재하지 않는다.
+    hobby_vectors 가 있으면 취미 점수를 같은 문자열 비율 대신 취미 집합 벡터 유사도로 계산한다.
+    """
+
+    def __init__(self, repository, store, index, shards=None, hobby_vectors=None):
+        self.repository = repository
+        self.shards = shards
+        self.hobby_vectors = hobby_vectors
+        self._sources = (store, index)
+
+    @property
+    def store(self):
+        return self._sources[0]
+
+    @property
+    def index(self):
+        return self._sources[1]
+
+    def swap(self, store, index):
+        """특성 저장소와 후보 인덱스를 한 번에 교체. 진행 중인 배치는 이전 쌍으로 끝까지 계산한다"""
+        self._sources = (store, index)
+
+    @property
+    def version(self):
+        """현재 특성 저장소의 데이터 version (결과 캐시 키)"""
+        return self.store.version
+
+    def load(self):
+        """사용자 저장소를 적재하고(이미 적재됐으면 그대로) 현재 특성 스냅샷 반환"""
+        self.repository.ensure_loaded()
+        features = self.store.snapshot()
+        logger.info("Recommendation engine loaded %d user slots", len(features))
+        return features
+
+    def _snapshot(self, store):
+        if not store.loaded:
+            self.load()
+        return store.snapshot()
+
+    @property
+    def features(self):
+        return self._snapshot(self.store)
+
+    def user_count(self):
+        """매칭 대상 사용자 수 (적재 전이면 적재)"""
+        store = self.store
+        self._snapshot(store)
+        return len(store)
+
+    def candidate_mask(self, query, features, index=None):
+        """하드 조건(본인/중복 목록, 성별, 나이, 학과)을 만족하는 후보 마스크. 슬롯이 압축돼 epoch 가 바뀌었으면 None"""
+        index = self.index if index is None else index
+        return index.candidates(query, len(features), features.epoch)
+
+    def _weighted_scores(self, queries, features):
+        """후보 특성에 대한 (요청 수 × 후보 수) 가중 점수"""
+        # MBTI 일치도: 요청에서 지정한 축 중 일치하는 비율
+        mbti_query = np.stack([encode_mbti_pairs(query.mbti_option) for query in queries])
+        mbti_count = mbti_query.sum(axis=1, keepdims=True)
+        mbti_score = (mbti_query @ features.mbti.T) / np.maximum(mbti_count, 1.0)
+
+        # 나이 근접도
+        my_age = np.array([[query.my_age] for query in queries], dtype=np.float32)
+        age_score = 1.0 - np.minimum(np.abs(features.age[None, :] - my_age), AGE_SPAN) / AGE_SPAN
+        age_score = np.nan_to_num(age_score, nan=0.0)
+
+        if self.hobby_vectors is not None:
+            # 취미 유사도: 요청 취미 집합 벡터와 후보 취미 집합 벡터의 코사인
+            hobby_score = self.hobby_vectors.set_similarity(
+                [query.hobby_option for query in queries], features.hobby, features.hobby_vocab,
+            )
+        else:
+            # 취미 일치도: 요청 취미 중 후보가 가진 비율
+            hobby_query = np.zeros((len(queries), features.hobby.shape[1]), dtype=np.float32)
+            hobby_count = np.ones((len(queries), 1), dtype=np.float32)
+            for i, query in enumerate(queries):
+                hobby_count[i, 0] = max(len(query.hobby_option), 1)
+                for hobby in query.hobby_option:
+                    index = features.hobby_vocab.get(hobby)
+                    if index is not None:
+                        hobby_query[i, index] = 1.0
+            hobby_score = (hobby_query @ features.hobby.T) / hobby_count
+
+        # 연락 빈도 근접도 (옵션을 알 수 없으면 0)
+        contact_option = np.array([[encode_contact_frequency(query.contact_frequency_option)] for query in queries], dtype=np.float32)
+        contact_score = 1.0 - np.abs(features.contact[None, :] - contact_option) / 2.0
+        contact_score = np.nan_to_num(contact_score, nan=0.0)
+
+        weights = np.array(
+            [[q.weights.mbti, q.weights.age, q.weights.hobby, q.weights.contact_frequency] for q in queries],
+            dtype=np.float32,
+        )
+        return (
+            weights[:, 0:1] * mbti_score
+            + weights[:, 1:2] * age_score
+            + weights[:, 2:3] * hobby_score
+            + weights[:, 3:4] * contact_score
+        ).astype(np.float32)
+
+    def score_candidates(self, queries):
+        """후보 인덱스로 거른 열만 점수 계산
+
+        (특성 스냅샷, 열 번호, 점수) 를 반환한다. 열은 배치 안 요청들의 후보 합집합이고,
+        해당 요청의 후보가 아닌 칸은 -inf. 계산 중 슬롯이 압축되면 새 스냅샷으로 다시 거른다.
+        특성 저장소와 후보 인덱스는 시작할 때 한 쌍으로 잡으므로 도중에 swap() 돼도 섞이지 않는다.
+        """
+        store, index = self._sources
+        while True:
+            features = self._snapshot(store)
+            masks = [self.candidate_mask(query, features, index) for query in queries]
+            if all(mask is not None for mask in masks):
+                break
+        masks = np.stack(masks)
+        columns = np.flatnonzero(masks.any(axis=0))
+        scores = self._weighted_scores(queries, features.subset(columns))
+        scores[~masks[:, columns]] = -np.inf
+        return features, columns, scores
+
+    def score_batch(self, queries):
+        """여러 MatchQuery 의 점수를 (요청 수 × 전체 슬롯 수) 행렬로 계산. 조건에 맞지 않는 후보는 -inf"""
+        features, columns, candidate_scores = self.score_candidates(queries)
+        scores = np.full((len(queries), len(features)), -np.inf, dtype=np.float32)
+        scores[:, columns] = candidate_scores
+        return scores
+
+    def score(self, query):
+        """MatchQuery 하나의 전체 후보 점수"""
+        return self.score_batch([query])[0]
+
+    def rank_batch(self, queries, depth=1):
+        """요청마다 점수 순 상위 max(k, depth) 명. 전체 정렬 대신 argpartition 으로 상위만 골라 정렬
+
+        발행된 스냅샷을 읽는 중이고 샤드가 켜져 있으면 샤드 프로세스들의 결과를 합친다.
+        """
+        store, index = self._sources
+        if self.shards is not None and self.shards.enabled and getattr(store, "path", None):
+            try:
+                return self._merge(self.shards.rank_batch(store.path, queries, depth), queries, depth, index)
+            except Exception as e:
+                logger.warning("Sharded scoring failed, scoring locally: %s", e)
+        return self._rank_local(queries, depth)
+
+    @staticmethod
+    def _merge(gathered, queries, depth, index):
+        """샤드별 상위 목록을 (점수 내림차순, 전체 슬롯 오름차순) 으로 합쳐 상위 max(k, depth) 명"""
+        results = []
+        for query, pairs in zip(queries, gathered):
+            pairs.sort(key=lambda pair: (-pair[1], index.slots[pair[0]]))
+            results.append([Recommendation(uuid=uuid, score=score) for uuid, score in pairs[:max(query.top_k, depth)]])
+        return results
+
+    def _rank_local(self, queries, depth):
+        features, columns, scores = self.score_candidates(queries)
+        results = []
+        for query, row in zip(queries, scores):
+            count = min(max(query.top_k, depth), len(columns))
+            if count == 0:
+                results.append([])
+                continue
+            if count < len(row):
+                # k 번째 점수 이상인 열만 (경계의 동점은 모두 포함해 앞 슬롯 우선이 유지되도록)
+                threshold = row[np.argpartition(-row, count - 1)[count - 1]]
+                top = np.flatnonzero((row >= threshold) & np.isfinite(row))
+            else:
+                top = np.flatnonzero(np.isfinite(row))
+            # 점수 내림차순, 같은 점수는 앞 슬롯 우선
+            top = top[np.lexsort((top, -row[top]))][:count]
+            results.append([Recommendation(uuid=str(features.uuids[columns[j]]), score=float(row[j])) for j in top])
+        return results
+
+    def recommend_batch(self, queries):
+        """요청마다 가장 점수가 높은 후보 한 명. 후보가 없으면 None"""
+        return [ranked[0] if ranked else None for ranked in self.rank_batch(queries)]
+
+    def recommend(self, query):
+        """가장 점수가 높은 후보 한 명 반환. 후보가 없으면 None"""
+        return self.recommend_batch([query])[0]
+
+
+engine = RecommendationEngine(
+    user_repository, feature_store, candidate_index, shard_pool,
+    hobby_vectors if HOBBY_SIMILARITY == "embedding" else None,
+)
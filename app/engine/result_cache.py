@@ -0,0 +1,82 @@
+from dataclasses import replace
+from app.config import (
+    MATCH_RESULT_CACHE_SIZE, MATCH_RESULT_CACHE_TTL,
+    MATCH_CANDIDATE_CACHE_SIZE, MATCH_CANDIDATE_TTL, MATCH_CANDIDATE_DEPTH,
+)
+from app.engine.recommender import engine
+from app.utils.cache import LRUCache
+
+
+class MatchResultCache:
+    """매칭 결과 캐시
+
+    키는 (특성 데이터 version, MatchQuery) 이다. MatchQuery 는 매칭 옵션, 가중치, 제외 목록을 담은
+    불변 객체라 그대로 해시 키가 된다. 사용자 CREATE/UPDATE/DELETE 와 스냅샷 교체마다 version 이 올라가므로
+    이전 version 으로 계산한 결과는 다시 조회되지 않고 LRU/TTL 로 밀려난다.
+    """
+
+    def __init__(self, source, capacity=10000, ttl=60):
+        self.source = source
+        self.cache = LRUCache(capacity, ttl)
+
+    @property
+    def version(self):
+        return self.source.version
+
+    def get(self, query):
+        """캐시된 결과 (점수 순 Recommendation 목록) 를 (적중 여부, 결과) 로 반환"""
+        entry = self.cache.get((self.version, query))
+        return (True, entry[0]) if entry is not None else (False, None)
+
+    def put(self, version, query, ranked):
+        """version 은 점수 계산 전에 읽은 값 (계산 중 변경이 있으면 그 결과는 이후 조회되지 않음)"""
+        self.cache.put((version, query), (ranked,))
+
+    def stats(self):
+        return dict(self.cache.stats(), version=self.version)
+
+
+class MatchCandidateCache:
+    """매칭 요청자별로 미리 계산한 점수 순 후보 목록
+
+    같은 요청자가 방금 받은 사람을 duplicationList 에 넣어 다시 요청하면, 전체를 다시 계산하지 않고
+    보관한 목록에서 제외 목록에 없는 다음 후보를 꺼낸다. 키는 (특성 데이터 version, 제외 목록과 k 를 뺀
+    MatchQuery) 이다. 목록을 만들 때의 제외 목록이 새 요청 제외 목록의 부분집합이고, 남은 후보가 k 명
+    이상이거나 목록이 후보 전체일 때만 사용하므로 다시 계산한 결과와 같다.
+    """
+
+    def __init__(self, source, capacity=10000, ttl=30, depth=20):
+        self.source = source
+        self.depth = max(1, depth)
+        self.cache = LRUCache(capacity, ttl)
+        self.served = 0
+
+    @staticmethod
+    def _key(version, query):
+        return version, replace(query, excluded=frozenset(), k=None)
+
+    def get(self, query):
+        """보관한 목록으로 답할 수 있으면 상위 k 명 목록, 아니면 None"""
+        entry = self.cache.get(self._key(self.source.version, query))
+        if entry is None:
+            return None
+        excluded, ranked, complete = entry
+        if not excluded <= query.excluded:
+            return None
+        remaining = [recommendation for recommendation in ranked if recommendation.uuid not in query.excluded]
+        if len(remaining) < query.top_k and not complete:
+            return None
+        self.served += 1
+        return remaining[:query.top_k]
+
+    def put(self, version, query, ranked):
+        """점수 계산 결과 보관. 요청한 수보다 적게 나왔으면 후보 전체가 담긴 목록"""
+        complete = len(ranked) < max(query.top_k, self.depth)
+        self.cache.put(self._key(version, query), (query.excluded, ranked, complete))
+
+    def stats(self):
+        return dict(self.cache.stats(), depth=self.depth, served=self.served)
+
+
+match_result_cache = MatchResultCache(engine, MATCH_RESULT_CACHE_SIZE, MATCH_RESULT_CACHE_TTL)
+match_candidate_cache = MatchCandidateCache(engine, MATCH_CANDIDATE_CACHE_SIZE, MATCH_CANDIDATE_TTL, MATCH_CANDIDATE_DEPTH)
@@ -0,0 +1,129 @@
+"""샤드 분산 점수 계산 (scatter-gather)
+
+발행된 특성 스냅샷(app.engine.shared_snapshot)의 행을 uuid 해시로 K 개 샤드에 나누고, 샤드마다 전용
+프로세스가 자기 행만 메모리에 올려 둔다. 조정 프로세스는 매칭 배치를 모든 샤드에 보내고, 샤드별 상위
+목록을 받아 (점수 내림차순, 전체 슬롯 오름차순) 으로 합친다. 샤드 번호는 uuid 해시 % K 라서 다른
+사용자가 생성/삭제돼도 바뀌지 않는다.
+"""
+import zlib
+import logging
+import threading
+import multiprocessing
+import numpy as np
+from app.config import MATCH_SHARDS
+
+logger = logging.getLogger(__name__)
+
+
+class ShardError(Exception):
+    pass
+
+
+def shard_hashes(uuids):
+    """uuid 별 샤드 해시 (CRC32)"""
+    return np.fromiter((zlib.crc32(str(uuid).encode("utf-8")) for uuid in uuids), dtype="<u4", count=len(uuids))
+
+
+def _serve_shard(connection, shard, shards):
+    """샤드 프로세스 본체. (스냅샷 경로, 요청 목록, depth) 를 받아 요청마다 로컬 상위 [(uuid, 점수)] 를 돌려줌
+
+    스냅샷 경로가 바뀔 때만 새 파일에서 자기 샤드 행을 다시 읽는다.
+    """
+    # 자식 프로세스에서만 필요한 모듈 (조정 프로세스의 import 순환을 피함)
+    from app.engine.recommender import RecommendationEngine
+    from app.engine.shared_snapshot import open_feature_snapshot
+    from app.engine.hobby_vectors import hobby_vectors
+    from app.config import HOBBY_SIMILARITY
+
+    # 조정 프로세스와 같은 취미 점수 방식 (벡터 파일은 같은 memmap 을 공유)
+    similarity = hobby_vectors if HOBBY_SIMILARITY == "embedding" else None
+    engine, current = None, None
+    while True:
+        try:
+            message = connection.recv()
+        except EOFError:
+            break
+        if message is None:
+            break
+        path, queries, depth = message
+        try:
+            if path != current:
+                store, index = open_feature_snapshot(path, shard, shards)
+                engine = RecommendationEngine(None, store, index, hobby_vectors=similarity)
+                current = path
+            ranked = engine.rank_batch(queries, depth)
+            connection.send((True, [[(item.uuid, item.score) for item in items] for items in ranked]))
+        except Exception as e:
+            connection.send((False, f"shard {shard}: {e!r}"))
+
+
+class ShardPool:
+    """샤드 프로세스 K 개. 처음 사용할 때 spawn 으로 띄운다"""
+
+    def __init__(self, shards):
+        self.shards = shards
+        self._workers = []
+        self._lock = threading.Lock()
+        self.batches = 0
+        self.failures = 0
+
+    @property
+    def enabled(self):
+        return self.shards > 1
+
+    def _start(self):
+        if self._workers:
+            return
+        context = multiprocessing.get_context("spawn")
+        for shard in range(self.shards):
+            parent, child = context.Pipe()
+            process = context.Process(target=_serve_shard, args=(child, shard, self.shards), daemon=True)
+            process.start()
+            child.close()
+            self._workers.append((parent, process))
+        logger.info("Started %d scoring shards", self.shards)
+
+    def _stop(self):
+        workers, self._workers = self._workers, []
+        for connection, process in workers:
+            try:
+                connection.send(None)
+            except (OSError, ValueError):
+                pass
+            connection.close()
+        for _, process in workers:
+            process.join(timeout=5)
+            if process.is_alive():
+                process.terminate()
+
+    def rank_batch(self, path, queries, depth):
+        """배치를 모든 샤드에 보내고 (scatter) 샤드별 상위 목록을 받아 (gather) 요청마다 [(uuid, 점수)] 로 합침
+
+        샤드 하나라도 실패하면 ShardError. 연결이 끊겼으면 다음 호출에서 샤드를 다시 띄운다.
+        """
+        with self._lock:
+            try:
+                self._start()
+                for connection, _ in self._workers:
+                    connection.send((path, queries, depth))
+                replies = [connection.recv() for connection, _ in self._workers]
+            except (OSError, EOFError) as e:
+                self.failures += 1
+                self._stop()
+                raise ShardError(f"Shard connection lost: {e!r}")
+            self.batches += 1
+        errors = [result for ok, result in replies if not ok]
+        if errors:
+            self.failures += 1
+            raise ShardError(errors[0])
+        return [[pair for _, result in replies for pair in result[i]] for i in range(len(queries))]
+
+    def close(self):
+        with self._lock:
+            self._stop()
+
+    def stats(self):
+        return {"shards": self.shards if self.enabled else 0, "batches": self.batches, "failures": self.failures}
+
+
+shard_pool = ShardPool(MATCH_SHARDS)
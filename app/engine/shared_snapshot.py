@@ -0,0 +1,409 @@
+"""다중 프로세스 서빙용 특성 스냅샷 발행/구독
+
+쓰기 프로세스(SERVING_ROLE=writer)만 사용자 저장소를 바꾸고, 특성 저장소가 바뀌면 살아 있는 행만 모은
+불변 스냅샷 파일을 새 번호로 발행한다. 파일은 섹션 파일 형식(app.storage.snapshot)이라 읽기 워커는
+numpy.memmap 으로 복사 없이 열고, 같은 페이지 캐시를 모든 워커가 공유한다.
+
+    {디렉터리}/features-{번호}.snap   발행된 스냅샷 (한 번 쓰면 바꾸지 않음)
+    {디렉터리}/CURRENT                가장 최근 스냅샷 파일 이름 (임시 파일에 쓴 뒤 교체)
+
+스냅샷은 전체 스냅샷이거나, 마지막 전체 스냅샷(base) 이후 바뀐 사용자 행과 삭제된 uuid 만 담은 변경분
+스냅샷이다. 바뀐 사용자가 base 사용자 수의 delta_ratio 를 넘으면 전체 스냅샷을 새로 쓴다. 변경분을 열면
+base 의 특성 행렬은 memmap 그대로 두고 변경분 행을 뒤에 이어 붙이며, 바뀌거나 삭제된 base 행은 후보에서 뺀다.
+
+읽기 워커는 CURRENT 가 바뀌면 새 파일을 열어 특성 저장소와 후보 인덱스 한 쌍을 만들고 엔진에서 한 번에
+교체한다. 이미 점수 계산 중인 배치는 이전 쌍으로 끝나므로 요청 사이에서만 버전이 바뀐다.
+"""
+import os
+import json
+import time
+import asyncio
+import logging
+import threading
+import numpy as np
+from app.config import (
+    SHARED_SNAPSHOT_DIR, SHARED_SNAPSHOT_INTERVAL, SHARED_SNAPSHOT_POLL, SHARED_SNAPSHOT_KEEP, SHARED_SNAPSHOT_DELTA_RATIO,
+)
+from app.engine.candidate_index import CandidateIndex, NO_AGE_BUCKET
+from app.engine.feature_store import feature_store
+from app.engine.features import UserFeatures
+from app.engine.recommender import engine
+from app.engine.shards import shard_hashes
+from app.storage.snapshot import FORMAT_VERSION, SectionFile, write_sections, column_sections
+from app.utils.executors import io_executor
+
+logger = logging.getLogger(__name__)
+
+POINTER_NAME = "CURRENT"
+SNAPSHOT_PREFIX = "features-"
+SNAPSHOT_SUFFIX = ".snap"
+
+
+def write_feature_snapshot(path, sequence, exported, base=None):
+    """FeatureStore.export() 결과를 특성 스냅샷 파일로 저장
+
+    base 를 주면 export_changes() 결과를 그 전체 스냅샷 파일(같은 디렉터리의 이름) 위의 변경분으로 저장
+    """
+    attributes = exported["attributes"]
+    buckets = np.array(
+        [NO_AGE_BUCKET if bucket is None else bucket for _, bucket, _ in attributes], dtype="<i4"
+    )
+
+    def sections():
+        yield from column_sections("uuid", exported["uuids"])
+        yield "shardHash", shard_hashes(exported["uuids"])
+        yield "age", exported["age"].astype("<f4")
+        yield "contact", exported["contact"].astype("<f4")
+        yield "mbti", exported["mbti"].astype("<f4")
+        yield "hobby", exported["hobby"].astype("<f4")
+        yield from column_sections("gender", [gender for gender, _, _ in attributes])
+        yield "ageBucket", buckets
+        yield from column_sections("major", [major for _, _, major in attributes])
+        if base is not None:
+            yield from column_sections("deleted", exported["deleted"])
+
+    meta = {
+        "version": FORMAT_VERSION,
+        "kind": "features",
+        "sequence": sequence,
+        "count": len(exported["uuids"]),
+        "hobbyVocab": exported["hobbyVocab"],
+    }
+    if base is not None:
+        meta["base"] = base
+    write_sections(path, meta, sections())
+
+
+class _StackedRows:
+    """base 행렬 아래에 변경분 행렬을 이어 붙인 것처럼 행을 고르는 뷰 (복사 없이 base memmap 을 그대로 둠)
+
+    base 의 열 수가 더 적으면 (그 뒤에 생긴 취미 열) 0 으로 채운다.
+    """
+
+    def __init__(self, base, delta):
+        self.base = base
+        self.delta = delta
+        self.shape = (len(base) + len(delta), delta.shape[1])
+        self.dtype = delta.dtype
+
+    def __len__(self):
+        return self.shape[0]
+
+    def __getitem__(self, rows):
+        rows = np.arange(*rows.indices(self.shape[0])) if isinstance(rows, slice) else np.asarray(rows)
+        result = np.zeros((len(rows), self.shape[1]), dtype=self.dtype)
+        in_base = rows < len(self.base)
+        result[in_base, :self.base.shape[1]] = self.base[rows[in_base]]
+        result[~in_base] = self.delta[rows[~in_base] - len(self.base)]
+        return result
+
+
+def _snapshot_columns(file):
+    """스냅샷 파일 하나의 행별 배열. 성별/학과는 (사전, 코드)"""
+    return {
+        "uuids": np.array(file.strings("uuid"), dtype=object)[file.section("uuid.codes")],
+        "shardHash": file.section("shardHash"),
+        "age": file.section("age"),
+        "contact": file.section("contact"),
+        "mbti": file.section("mbti"),
+        "hobby": file.section("hobby"),
+        "gender": (file.strings("gender"), file.section("gender.codes")),
+        "ageBucket": file.section("ageBucket"),
+        "major": (file.strings("major"), file.section("major.codes")),
+    }
+
+
+def _stack_codes(below, above):
+    """두 (사전, 코드) 를 한 사전 위의 이어 붙인 코드로"""
+    dictionary = {value: code for code, value in enumerate(below[0])}
+    mapping = np.array([dictionary.setdefault(value, len(dictionary)) for value in above[0]], dtype=np.int64)
+    return list(dictionary), np.concatenate([below[1].astype(np.int64), mapping[above[1]]])
+
+
+def _read_feature_snapshot(path):
+    """(행별 배열, 살아 있는 행 마스크, meta). 변경분 스냅샷이면 base 행 뒤에 변경분 행을 이어 붙임
+
+    전체 스냅샷이면 모든 행이 살아 있으므로 마스크는 None
+    """
+    file = SectionFile(path)
+    columns = _snapshot_columns(file)
+    base = file.meta.get("base")
+    if base is None:
+        return columns, None, file.meta
+
+    below = _snapshot_columns(SectionFile(os.path.join(os.path.dirname(path), base)))
+    deleted = file.strings("deleted")
+    replaced = np.array(columns["uuids"].tolist() + deleted, dtype=object)
+    alive = np.ones(len(below["uuids"]) + len(columns["uuids"]), dtype=bool)
+    if len(replaced):
+        alive[:len(below["uuids"])] = ~np.isin(below["uuids"], replaced)
+    stacked = {
+        name: np.concatenate([below[name], columns[name]])
+        for name in ("uuids", "shardHash", "age", "contact", "mbti", "ageBucket")
+    }
+    stacked["hobby"] = _StackedRows(below["hobby"], columns["hobby"])
+    stacked["gender"] = _stack_codes(below["gender"], columns["gender"])
+    stacked["major"] = _stack_codes(below["major"], columns["major"])
+    stacked["deleted"] = deleted
+    return stacked, alive, file.meta
+
+
+class PublishedFeatureStore:
+    """발행된 스냅샷 하나를 감싼 읽기 전용 특성 저장소 (엔진이 FeatureStore 대신 사용)"""
+
+    loaded = True
+
+    def __init__(self, features, sequence, path=None, count=None):
+        self.features = features
+        self.path = path
+        self.version = sequence
+        self.epoch = features.epoch
+        self.count = len(features) if count is None else count
+
+    def snapshot(self):
+        return self.features
+
+    def __len__(self):
+        """살아 있는 사용자 수"""
+        return self.count
+
+    def stats(self):
+        return {
+            "slots": len(self.features),
+            "users": self.count,
+            "hobbyVocabulary": len(self.features.hobby_vocab),
+            "version": self.version,
+        }
+
+
+def open_feature_snapshot(path, shard=None, shards=1):
+    """특성 스냅샷 파일을 열어 (PublishedFeatureStore, CandidateIndex) 반환
+
+    전체를 열면 특성 행렬은 memmap 뷰이다 (변경분 스냅샷이면 base 는 memmap, 변경분 행만 메모리).
+    shard 를 주면 uuid 해시가 그 샤드인 살아 있는 행만 복사해 담는다.
+    """
+    columns, alive, meta = _read_feature_snapshot(path)
+    sequence = meta["sequence"]
+    (genders, gender_codes), (majors, major_codes) = columns["gender"], columns["major"]
+    if shard is not None:
+        selected = columns["shardHash"] % shards == shard
+        rows = np.flatnonzero(selected if alive is None else selected & alive)
+        alive = None
+        columns = {name: columns[name][rows] for name in ("uuids", "age", "contact", "mbti", "hobby", "ageBucket")}
+        gender_codes, major_codes = gender_codes[rows], major_codes[rows]
+    uuids = columns["uuids"]
+
+    features = object.__new__(UserFeatures)
+    features.uuids = uuids
+    features.age = columns["age"]
+    features.contact = columns["contact"]
+    features.mbti = columns["mbti"]
+    features.hobby = columns["hobby"]
+    features.hobby_vocab = {hobby: column for column, hobby in enumerate(meta["hobbyVocab"])}
+    features.epoch = sequence
+
+    index = CandidateIndex.from_arrays(
+        uuids, genders, gender_codes, columns["ageBucket"], majors, major_codes, epoch=sequence,
+    )
+    if alive is None:
+        return PublishedFeatureStore(features, sequence, path), index
+
+    # 변경분에서 바뀌거나 삭제된 base 행은 후보에서 뺌. 바뀐 uuid 는 뒤에 붙은 변경분 행을 가리키고 삭제된 uuid 는 없앰
+    index.alive &= alive
+    for slot in np.flatnonzero(~alive).tolist():
+        index.uuids[slot] = None
+    for uuid in columns["deleted"]:
+        index.slots.pop(uuid, None)
+    return PublishedFeatureStore(features, sequence, path, int(alive.sum())), index
+
+
+def read_pointer(directory):
+    """CURRENT 내용 ({"file", "sequence", "users"}). 아직 발행 전이면 None"""
+    try:
+        with open(os.path.join(directory, POINTER_NAME), mode="r", encoding="utf-8") as file:
+            return json.load(file)
+    except FileNotFoundError:
+        return None
+
+
+def _write_pointer(directory, pointer):
+    path = os.path.join(directory, POINTER_NAME)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, mode="w", encoding="utf-8") as file:
+        json.dump(pointer, file)
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(tmp_path, path)
+
+
+class SnapshotPublisher:
+    """쓰기 프로세스에서 특성 저장소가 바뀔 때마다 (최대 interval 초에 한 번) 새 스냅샷 발행
+
+    특성 저장소 version 이 마지막 발행과 같으면 아무것도 쓰지 않는다. 마지막 전체 스냅샷 이후 바뀐 사용자가
+    그 사용자 수의 delta_ratio 이하이면 바뀐 행만 담은 변경분 스냅샷을 쓰고, 넘으면 전체 스냅샷을 새로 쓴다
+    (delta_ratio 가 0 이면 항상 전체).
+
+    번호는 마이크로초 시각 이상으로 늘어나므로 쓰기 프로세스를 다시 시작해도 이전 번호와 겹치지 않는다.
+    오래된 파일은 keep 개만 남기고 지운다 (이미 열어 둔 워커의 매핑은 그대로 유효, 현재 base 는 남김).
+    """
+
+    def __init__(self, store, directory, interval=1.0, keep=3, delta_ratio=0.1):
+        self.store = store
+        self.directory = directory
+        self.interval = interval
+        self.keep = max(1, keep)
+        self.delta_ratio = max(0.0, delta_ratio)
+        self.sequence = 0
+        self.published_version = None
+        self.published = 0
+        self.deltas = 0
+        # 마지막 전체 스냅샷 {"file", "users"}
+        self.base = None
+        self._lock = threading.Lock()
+        self._task = None
+
+    def publish(self):
+        """특성 저장소가 마지막 발행 이후 바뀌었으면 발행. 발행한 번호 반환, 변경이 없으면 None"""
+        with self._lock:
+            if not self.store.loaded or self.store.version == self.published_version:
+                return None
+            return self._publish()
+
+    def _publish(self):
+        os.makedirs(self.directory, exist_ok=True)
+        exported = None
+        if self.base is not None and self.delta_ratio > 0:
+            exported = self.store.export_changes(int(self.base["users"] * self.delta_ratio))
+        base = self.base["file"] if exported is not None else None
+        if exported is None:
+            exported = self.store.export()
+        self.sequence = max(self.sequence + 1, time.time_ns() // 1000)
+        name = f"{SNAPSHOT_PREFIX}{self.sequence:020d}{SNAPSHOT_SUFFIX}"
+        write_feature_snapshot(os.path.join(self.directory, name), self.sequence, exported, base)
+        users = exported.get("users", len(exported["uuids"]))
+        if base is None:
+            self.base = {"file": name, "users": users}
+        else:
+            self.deltas += 1
+        _write_pointer(self.directory, {"file": name, "sequence": self.sequence, "users": users})
+        self.published_version = exported["version"]
+        self.published += 1
+        self._prune(name)
+        logger.debug("Published feature snapshot %s (%d rows, base %s)", name, len(exported["uuids"]), base)
+        return self.sequence
+
+    def _prune(self, current):
+        names = sorted(
+            name for name in os.listdir(self.directory)
+            if name.startswith(SNAPSHOT_PREFIX) and name.endswith(SNAPSHOT_SUFFIX)
+            and name not in (current, self.base["file"])
+        )
+        for name in names[:max(len(names) - (self.keep - 1), 0)]:
+            try:
+                os.remove(os.path.join(self.directory, name))
+            except OSError as e:
+                logger.warning("Could not remove old feature snapshot %s: %s", name, e)
+
+    async def start(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def _run(self):
+        while True:
+            try:
+                await io_executor.run(self.publish)
+            except Exception as e:
+                logger.exception("Error publishing feature snapshot: %s", e)
+            await asyncio.sleep(self.interval)
+
+    async def stop(self):
+        """발행 루프를 멈추고 마지막 변경까지 발행"""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        try:
+            await io_executor.run(self.publish)
+        except Exception as e:
+            logger.error("Error publishing final feature snapshot: %s", e)
+
+    def stats(self):
+        return {
+            "directory": self.directory,
+            "sequence": self.sequence,
+            "published": self.published,
+            "deltas": self.deltas,
+            "base": self.base["file"] if self.base else None,
+            "storeVersion": self.published_version,
+        }
+
+
+class SnapshotSubscriber:
+    """읽기 워커에서 CURRENT 를 poll 초마다 확인해 새 스냅샷이면 엔진의 특성 저장소/후보 인덱스를 교체"""
+
+    def __init__(self, engine, directory, poll=0.2):
+        self.engine = engine
+        self.directory = directory
+        self.poll = poll
+        self.current = None
+        self.swaps = 0
+        self._task = None
+
+    def refresh(self):
+        """새 스냅샷이 발행됐으면 열어서 교체. 교체했으면 True"""
+        pointer = read_pointer(self.directory)
+        if pointer is None or pointer == self.current:
+            return False
+        try:
+            store, index = open_feature_snapshot(os.path.join(self.directory, pointer["file"]))
+        except FileNotFoundError:
+            # 읽는 사이 더 새 스냅샷으로 교체되고 정리된 경우. 다음 확인에서 다시 읽음
+            return False
+        self.engine.swap(store, index)
+        self.current = pointer
+        self.swaps += 1
+        logger.debug("Switched to feature snapshot %s (%d users)", pointer["file"], len(store))
+        return True
+
+    async def wait_ready(self):
+        """첫 스냅샷을 열 때까지 대기"""
+        logged = None
+        while not await io_executor.run(self.refresh):
+            if logged is None or time.monotonic() - logged >= 10:
+                logger.info("Waiting for a feature snapshot in %s", self.directory)
+                logged = time.monotonic()
+            await asyncio.sleep(self.poll)
+
+    async def start(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.poll)
+            try:
+                await io_executor.run(self.refresh)
+            except Exception as e:
+                logger.exception("Error loading feature snapshot: %s", e)
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def stats(self):
+        return {"directory": self.directory, "current": self.current, "swaps": self.swaps}
+
+
+snapshot_publisher = SnapshotPublisher(
+    feature_store, SHARED_SNAPSHOT_DIR, SHARED_SNAPSHOT_INTERVAL, SHARED_SNAPSHOT_KEEP, SHARED_SNAPSHOT_DELTA_RATIO,
+)
+snapshot_subscriber = SnapshotSubscriber(engine, SHARED_SNAPSHOT_DIR, SHARED_SNAPSHOT_POLL)
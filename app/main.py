@@ -1,20 +1,95 @@
+import logging
 from app import app
-from app.routes import users, recommend, classifier
+from app.config import LOG_LEVEL, SERVING_ROLE
+from app.routes import users, recommend, classifier, stats, metrics, ready, profiling
 from app.consumers import match_consumer, user_crud_consumer, classifier_consumer
+from app.engine.recommender import engine
+from app.engine.batcher import match_batcher
+from app.engine.classifier import hobby_classifier
+from app.engine.hobby_vectors import hobby_vectors
+from app.engine.shards import shard_pool
+from app.engine.shared_snapshot import snapshot_publisher, snapshot_subscriber
+from app.storage.user_repository import user_repository
+from app.storage.write_coalescer import user_writer
+from app.utils.publisher import publisher
+from app.utils.reply_pipeline import reply_pipeline
+from app.utils.executors import io_executor, cpu_executor, shutdown_executors
+from app.utils.metrics import MetricsMiddleware
+from app.utils.startup import startup
 import asyncio
 
+logging.basicConfig(level=LOG_LEVEL, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+logger = logging.getLogger(__name__)
+
+app.add_middleware(MetricsMiddleware)
+
+# 소비 태스크 (이벤트 루프는 태스크를 약하게 참조하므로 종료 때까지 여기서 붙잡아 둠)
+consumer_tasks = []
+
+async def _load_users():
+    await io_executor.run(user_repository.load)
+    await cpu_executor.run(engine.load)
+
+
 @app.on_event("startup")
 async def startup_event():
-    print("Starting up FastAPI application...")
+    logger.info("Starting up FastAPI application (role: %s)...", SERVING_ROLE)
     try:
-        asyncio.create_task(match_consumer.consume_from_match_queue())
-        asyncio.create_task(user_crud_consumer.consume_user_crud_queue())
-        asyncio.create_task(classifier_consumer.consume_from_classifier_queue())
-        print("Consumers started successfully.")
+        # 사용자 저장소/특성, 분류기, 응답 발행 연결을 동시에 준비한 뒤 소비 시작
+        # (실패해도 첫 요청에서 다시 시도하며, /ready 는 필수 단계가 끝나야 준비 상태)
+        await startup.preload({
+            "users": _load_users(),
+            "classifier": io_executor.run(hobby_classifier.warm_up),
+            "hobbyVectors": io_executor.run(hobby_vectors.load),
+            "publisher": publisher.start(),
+        }, optional=("classifier", "hobbyVectors", "publisher"))
+
+        # writer 는 사용자 변경만 소비하고 매칭/분류는 특성 스냅샷을 읽는 워커(app.worker)가 처리
+        consumers = [user_crud_consumer.consumer]
+        if SERVING_ROLE == "writer":
+            await snapshot_publisher.start()
+        else:
+            # 샤드 점수 계산은 발행된 스냅샷을 나눠 읽으므로 한 프로세스에서도 발행과 구독을 함께 켬
+            if shard_pool.enabled:
+                await snapshot_publisher.start()
+                await snapshot_subscriber.start()
+            consumer_tasks.append(asyncio.create_task(match_consumer.consume_from_match_queue()))
+            consumer_tasks.append(asyncio.create_task(classifier_consumer.consume_from_classifier_queue()))
+            consumers += [match_consumer.consumer, classifier_consumer.consumer]
+        consumer_tasks.append(asyncio.create_task(user_crud_consumer.consume_user_crud_queue()))
+        startup.mark_ready(consumers)
+        logger.info("Consumers started successfully (role: %s).", SERVING_ROLE)
     except Exception as e:
-        print(f"Error during startup: {e}")
+        logger.error("Error during startup: %s", e)
         raise e
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    # 새 메시지 수신을 멈추고 처리 중인 메시지를 마무리한 뒤 연결 종료
+    await asyncio.gather(
+        match_consumer.consumer.stop(),
+        user_crud_consumer.consumer.stop(),
+        classifier_consumer.consumer.stop(),
+    )
+    # 제때 멈추지 않은 소비 태스크는 취소하고 끝날 때까지 대기
+    for task in consumer_tasks:
+        task.cancel()
+    await asyncio.gather(*consumer_tasks, return_exceptions=True)
+    consumer_tasks.clear()
+    await match_batcher.stop()
+    await user_writer.stop()
+    await snapshot_subscriber.stop()
+    await snapshot_publisher.stop()
+    shard_pool.close()
+    # 버퍼에 남은 응답을 모두 발행한 뒤 연결 종료
+    await reply_pipeline.stop()
+    await publisher.close()
+    # 남은 변경 로그를 스냅샷에 반영
+    user_repository.close()
+    hobby_classifier.save_cache()
+    hobby_vectors.save()
+    shutdown_executors()
+
 @app.get("/")
 async def read_root():
     return {"message": "Hello World"}
@@ -23,3 +98,7 @@ async def read_root():
 app.include_router(users.router)
 app.include_router(recommend.router)
 app.include_router(classifier.router)
+app.include_router(stats.router)
+app.include_router(metrics.router)
+app.include_router(ready.router)
+app.include_router(profiling.router)
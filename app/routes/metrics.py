@@ -0,0 +1,10 @@
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+from app.utils.metrics import registry
+
+router = APIRouter()
+
+@router.get("/metrics")
+async def get_metrics():
+    """Prometheus 텍스트 형식의 큐/경로별 단계 지연 히스토그램과 응답 카운터"""
+    return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4")
@@ -0,0 +1,58 @@
+import hmac
+from fastapi import APIRouter, Header
+from fastapi.responses import JSONResponse, Response
+from app.config import ADMIN_TOKEN
+from app.utils.profiler import profiler
+
+router = APIRouter()
+
+FORBIDDEN = {"message": "Invalid admin token"}
+
+
+def _authorized(token):
+    """X-Admin-Token 이 설정된 토큰과 같은지 (상수 시간 비교). 토큰이 설정되지 않았으면 항상 거부"""
+    if not ADMIN_TOKEN or token is None:
+        return False
+    return hmac.compare_digest(token.encode("utf-8"), ADMIN_TOKEN.encode("utf-8"))
+
+@router.get("/admin/profiling")
+async def get_profiling(x_admin_token: str = Header(None)):
+    """프로파일링 설정과 보관 중인 프로파일 목록"""
+    if not _authorized(x_admin_token):
+        return JSONResponse(content=FORBIDDEN, status_code=403)
+    return dict(profiler.stats(), profiles=profiler.profiles())
+
+@router.put("/admin/profiling")
+async def configure_profiling(settings: dict, x_admin_token: str = Header(None)):
+    """프로파일링 설정 변경. {"rate": 0~1, "mode": "cprofile" | "sample", "capacity": 보관 개수} 중 필요한 것만"""
+    if not _authorized(x_admin_token):
+        return JSONResponse(content=FORBIDDEN, status_code=403)
+    try:
+        profiler.configure(settings.get("rate"), settings.get("mode"), settings.get("capacity"))
+    except (TypeError, ValueError) as e:
+        return JSONResponse(content={"message": str(e)}, status_code=400)
+    return profiler.stats()
+
+@router.delete("/admin/profiling")
+async def clear_profiles(x_admin_token: str = Header(None)):
+    """보관 중인 프로파일 삭제"""
+    if not _authorized(x_admin_token):
+        return JSONResponse(content=FORBIDDEN, status_code=403)
+    profiler.clear()
+    return profiler.stats()
+
+@router.get("/admin/profiling/{profile_id}")
+async def download_profile(profile_id: int, x_admin_token: str = Header(None)):
+    """프로파일 내려받기. cprofile 은 pstats 파일(pstats.Stats 로 열기), sample 은 collapsed stack 텍스트"""
+    if not _authorized(x_admin_token):
+        return JSONResponse(content=FORBIDDEN, status_code=403)
+    entry = profiler.get(profile_id)
+    if entry is None:
+        return JSONResponse(content={"message": "Profile not found"}, status_code=404)
+    media_type = "application/octet-stream" if entry["format"] == "pstats" else "text/plain"
+    filename = f"{entry['name']}-{entry['id']}.{entry['format']}"
+    return Response(
+        content=entry["data"],
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
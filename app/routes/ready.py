@@ -0,0 +1,20 @@
+from fastapi import APIRouter
+from fastapi.responses import JSONResponse
+from app.config import SERVING_ROLE
+from app.engine.recommender import engine
+from app.engine.shared_snapshot import snapshot_publisher, snapshot_subscriber
+from app.utils.startup import startup
+
+router = APIRouter()
+
+@router.get("/ready")
+async def get_ready():
+    """준비 상태: 시작 단계별 소요 시간, 소비자 연결, 현재 사용자 데이터 version. 준비 전이면 503"""
+    status = startup.status()
+    status.update({
+        "role": SERVING_ROLE,
+        "snapshotVersion": engine.version,
+        "publishedSequence": snapshot_publisher.sequence or None,
+        "subscribedSnapshot": snapshot_subscriber.current,
+    })
+    return JSONResponse(content=status, status_code=200 if status["ready"] else 503)
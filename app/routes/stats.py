@@ -0,0 +1,41 @@
+from fastapi import APIRouter
+from app.consumers import match_consumer, classifier_consumer
+from app.engine.batcher import match_batcher
+from app.engine.classifier import hobby_classifier
+from app.engine.feature_store import feature_store
+from app.engine.hobby_vectors import hobby_vectors
+from app.engine.result_cache import match_result_cache, match_candidate_cache
+from app.engine.shards import shard_pool
+from app.engine.shared_snapshot import snapshot_publisher
+from app.storage.write_coalescer import user_writer
+from app.utils.executors import executor_stats
+from app.utils.profiler import profiler
+from app.utils.publisher import publisher
+from app.utils.reply_pipeline import reply_pipeline
+from app.utils.reply_store import reply_store
+
+router = APIRouter()
+
+@router.get("/stats")
+async def get_stats():
+    """실행 풀 포화도, 요청 거절, 배치, 샤드, 사용자 변경 모아 쓰기, 결과 캐시, 특성 저장소, 스냅샷 발행, 분류 캐시, 취미 벡터, 응답 발행, 응답 발행 대기열, 재전달 응답 보관, 프로파일링 통계"""
+    return {
+        "executors": executor_stats(),
+        "admission": {
+            "match": dict(match_consumer.admission.stats(), queued=match_consumer.consumer.queued),
+            "classifier": dict(classifier_consumer.admission.stats(), queued=classifier_consumer.consumer.queued),
+        },
+        "matchBatcher": match_batcher.stats(),
+        "matchShards": shard_pool.stats(),
+        "userWriter": user_writer.stats(),
+        "matchResultCache": match_result_cache.stats(),
+        "matchCandidateCache": match_candidate_cache.stats(),
+        "featureStore": feature_store.stats(),
+        "sharedSnapshot": snapshot_publisher.stats(),
+        "classifier": hobby_classifier.stats(),
+        "hobbyVectors": hobby_vectors.stats(),
+        "publisher": publisher.stats(),
+        "replyPipeline": reply_pipeline.stats(),
+        "replyStore": reply_store.stats(),
+        "profiler": profiler.stats(),
+    }
@@ -0,0 +1,45 @@
+"""다중 프로세스 서빙 실행
+
+쓰기 프로세스 하나(uvicorn, 사용자 변경 + 특성 스냅샷 발행)와 매칭/분류 읽기 워커 N 개(app.worker)를 띄운다.
+워커는 스냅샷 파일만 읽으므로 사용자 파일을 두고 프로세스끼리 경쟁하지 않는다.
+
+    python -m app.serve --workers 4 --host 0.0.0.0 --port 8000
+"""
+import os
+import sys
+import argparse
+import subprocess
+
+# 워커가 끝나기를 기다리는 시간(초). 넘으면 강제 종료
+WORKER_STOP_TIMEOUT = 60
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run one writer process and N matching worker processes")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="number of reader worker processes")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8000)
+    args = parser.parse_args(argv)
+
+    # 워커끼리 코어를 나눠 쓰도록 점수 계산 스레드 수를 기본으로 나눔
+    env = dict(os.environ, SERVING_ROLE="reader")
+    env.setdefault("CPU_EXECUTOR_WORKERS", str(max(1, (os.cpu_count() or 1) // max(1, args.workers))))
+    workers = [subprocess.Popen([sys.executable, "-m", "app.worker"], env=env) for _ in range(max(0, args.workers))]
+
+    os.environ["SERVING_ROLE"] = "writer"
+    try:
+        import uvicorn
+        uvicorn.run("app.main:app", host=args.host, port=args.port)
+    finally:
+        for worker in workers:
+            worker.terminate()
+        for worker in workers:
+            try:
+                worker.wait(timeout=WORKER_STOP_TIMEOUT)
+            except subprocess.TimeoutExpired:
+                worker.kill()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,67 @@
+from app.engine.classifier import hobby_classifier, ClassifierError
+from app.utils.deadline import remaining
+from app.utils.executors import io_executor
+from app.utils.helpers import send_to_queue
+from app.utils.metrics import stage
+from app.utils.profiler import profiled
+
+
+@profiled("classify_categories")
+async def classify_categories(data):
+    """취미 소분류 → 대분류 분류. (응답 내용, 상태 코드) 반환"""
+    try:
+        # props가 데이터에 포함되어 있는지 확인
+        props = data.get('props')
+
+        # 만약 props에 reply_to나 correlation_id가 없으면 오류 반환
+        if not props or not props.get('reply_to') or not props.get('correlation_id'):
+            response_content = {"stateCode": "MTCH-001", "bigCategory": [], "message": "Field Missing"}
+            await send_to_queue(None, props, response_content)
+            return {"error": "Missing properties (reply_to or correlation_id)"}, 400
+
+        # 필수 필드 확인
+        required_fields = ["uuid", "smallCategory"]
+        for field in required_fields:
+            if field not in data:
+                response_content = {"stateCode": "MTCH-001", "bigCategory": [], "message": "Field Missing"}
+                await send_to_queue(None, props, response_content)
+                return response_content, 400
+
+        if not isinstance(data["smallCategory"], list):
+            response_content = {"stateCode": "MTCH-002", "bigCategory": [], "message": "smallCategory must be a list"}
+            await send_to_queue(None, props, response_content)
+            return response_content, 400
+
+        # 캐시에 모두 있으면 바로 응답하고, 없는 소분류만 분류기로 보냄
+        small_categories = data["smallCategory"]
+        with stage("cache"):
+            big_categories = hobby_classifier.lookup(small_categories)
+        if any(category is None for category in big_categories):
+            # 호출 측이 더 기다리지 않으면 분류 스크립트를 실행하지 않고, 실행하더라도 남은 시간까지만
+            left = remaining()
+            if left is not None and left <= 0:
+                response_content = {"stateCode": "MTCH-007", "bigCategory": [], "message": "Request timed out"}
+                await send_to_queue(None, props, response_content)
+                return response_content, 504
+            try:
+                with stage("classify"):
+                    big_categories = await io_executor.run(
+                        hobby_classifier.classify, data["uuid"], small_categories, big_categories, left
+                    )
+            except ClassifierError as e:
+                response_content = {"stateCode": e.state_code, "bigCategory": [], "message": e.message}
+                await send_to_queue(None, props, response_content)
+                if e.details:
+                    response_content.update({"details": e.details})
+                return response_content, 500
+
+        # 응답 형식 생성
+        response_content = {"stateCode": "MTCH-000", "bigCategory": big_categories, "message": "Success"}
+        await send_to_queue(None, props, response_content)
+        return response_content, 200
+
+    except Exception as e:
+        response_content = {"stateCode": "MTCH-004", "bigCategory": [], "message": "An unexpected error occurred"}
+        await send_to_queue(None, data.get("props", {}), response_content)
+        response_content.update({"details": str(e)})
+        return response_content, 500
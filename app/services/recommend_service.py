@@ -0,0 +1,105 @@
+import logging
+from app.engine.batcher import match_batcher
+from app.engine.recommender import engine
+from app.engine.query import MatchQuery, MATCH_REQUIRED_FIELDS
+from app.engine.result_cache import match_result_cache, match_candidate_cache
+from app.utils.deadline import expired
+from app.utils.executors import io_executor
+from app.utils.helpers import send_to_queue
+from app.utils.metrics import stage
+from app.utils.profiler import profiled
+
+logger = logging.getLogger(__name__)
+
+
+@profiled("recommend_user")
+async def recommend_user(data):
+    """매칭 요청 처리. (응답 내용, 상태 코드) 반환"""
+    props = data.get('props')
+    logger.debug("props: %s", props)
+
+    if not props or not props.get('reply_to') or not props.get('correlation_id'):
+        response_content = {"stateCode": "MTCH-001", "message": "Field Missing"}
+        await send_to_queue(None, props, response_content)
+        return {"error": "Missing properties (reply_to or correlation_id)"}, 400
+
+    # 필수 필드 확인
+    required_fields = MATCH_REQUIRED_FIELDS
+    for field in required_fields:
+        if field not in data:
+            response_content = {"stateCode": "MTCH-001", "message": f"Missing field: {field}"}
+            await send_to_queue(None, props, response_content)
+            return response_content, 400
+
+    # 요청 단위 매칭 조건 (사용자 테이블은 수정하지 않음)
+    try:
+        with stage("validate"):
+            query = MatchQuery.from_request(data)
+    except ValueError as e:
+        response_content = {"stateCode": "MTCH-002", "message": "Invalid field value"}
+        await send_to_queue(None, props, response_content)
+        response_content.update({"details": str(e)})
+        return response_content, 400
+
+    # 같은 사용자 데이터 version 에서 같은 조건으로 계산한 결과가 있으면 점수 계산 생략
+    with stage("cache"):
+        cached, ranked = match_result_cache.get(query)
+    if cached:
+        return await _reply(props, query, ranked)
+
+    # 같은 요청자의 직전 후보 목록에서 제외 목록에 없는 다음 후보를 꺼냄
+    with stage("cache"):
+        ranked = match_candidate_cache.get(query)
+    if ranked is not None:
+        match_result_cache.put(match_result_cache.version, query, ranked)
+        return await _reply(props, query, ranked)
+
+    # 사용자 저장소 확인
+    try:
+        with stage("storage"):
+            user_count = await io_executor.run(engine.user_count)
+        if user_count == 0:
+            response_content = {"stateCode": "MTCH-003", "message": "CSV file is empty"}
+            await send_to_queue(None, props, response_content)
+            return response_content, 404
+
+    except Exception as e:
+        response_content = {"stateCode": "MTCH-004", "message": "File open fail", "details": str(e)}
+        await send_to_queue(None, props, response_content)
+        return response_content, 500
+
+    # 호출 측이 더 기다리지 않는 요청이면 점수 계산을 건너뜀
+    if expired():
+        response_content = {"stateCode": "MTCH-007", "message": "Request timed out"}
+        await send_to_queue(None, props, response_content)
+        return response_content, 504
+
+    # 다른 매칭 요청과 함께 배치로 점수 계산
+    try:
+        version = match_result_cache.version
+        with stage("score"):
+            candidates = await match_batcher.submit(query)
+        match_candidate_cache.put(version, query, candidates)
+        ranked = candidates[:query.top_k]
+        match_result_cache.put(version, query, ranked)
+
+    except Exception as e:
+        response_content = {"stateCode": "MTCH-005", "message": "Error running model"}
+        await send_to_queue(None, props, response_content)
+        response_content.update({"details": str(e)})
+        return response_content, 500
+
+    return await _reply(props, query, ranked)
+
+
+async def _reply(props, query, ranked):
+    """최종 응답. enemyUuid 는 1순위, k 를 요청했으면 enemyUuids 에 점수 순 목록"""
+    response_content = {"stateCode": "MTCH-000", "message": "Success"}
+    if ranked:
+        response_content.update({"enemyUuid": ranked[0].uuid})
+    if query.k is not None:
+        response_content.update({"enemyUuids": [recommendation.uuid for recommendation in ranked]})
+    logger.debug("Final response content: %s", response_content)
+
+    await send_to_queue(None, props, response_content)
+    return response_content, 200
@@ -0,0 +1,148 @@
+from fastapi import HTTPException
+import os
+import logging
+from app.config import CSV_FILE_PATH
+from app.storage.user_repository import UserAlreadyExists, UserNotFound
+from app.storage.write_coalescer import user_writer
+from app.utils.helpers import send_to_queue
+from app.utils.metrics import stage
+from app.utils.profiler import profiled
+
+logger = logging.getLogger(__name__)
+
+
+@profiled("create_user")
+async def create_user(user):
+    """사용자 생성. (응답 내용, 상태 코드) 반환"""
+    try:
+        props = user.get('props')
+        if not props or not props.get('reply_to') or not props.get('correlation_id'):
+            return {"error": "Missing properties (reply_to or correlation_id)"}, 400
+
+        response_content = {}
+        # 필수 필드 확인
+        required_fields = ["type", "uuid", "age", "contactFrequency", "gender", "hobby", "major", "mbti"]
+        for field in required_fields:
+            if field not in user:
+                response_content = {"stateCode": "CRUD-001", "message": "Field Missing", "requestType": "CREATE", "userId": user["uuid"]}
+                raise HTTPException(status_code=400, detail=f"Missing required field: {field}")
+
+        csv_file_path = CSV_FILE_PATH
+
+        # type 필드를 제거한 후 나머지 필드만 저장
+        user_data_to_save = {k: v for k, v in user.items() if k not in ["type", "props"]}
+        user_data_to_save.update({"duplication": "FALSE", "": ""})
+
+        if os.path.exists(csv_file_path):
+                # 중복된 UUID 확인과 저장을 저장소 락 안에서 함께 처리 (다른 변경과 모아 한 번에 기록)
+                try:
+                    with stage("storage"):
+                        await user_writer.create(user_data_to_save)
+                except UserAlreadyExists:
+                    response_content = {"stateCode": "CRUD-004", "message": "User Already Exists"}
+                    raise HTTPException(status_code=400, detail=f"User Already Exists")
+        else:
+            response_content = {"stateCode": "GEN-001", "message": "File not found"}
+            raise FileNotFoundError("CSV file not found")
+
+        # 성공 응답
+        response_content = {"stateCode": "CRUD-000", "message": "CRUD Success"}
+        await send_to_queue(None, props, response_content)
+        return response_content, 201
+
+    except Exception as e:
+        if not response_content:
+            response_content = {"stateCode": "CRUD-005", "message": f"Error processing user: {str(e)}"}
+        await send_to_queue(None, props, response_content)
+        return response_content, 500
+
+
+@profiled("update_user")
+async def update_user(user):
+    """사용자 수정. (응답 내용, 상태 코드) 반환"""
+    try:
+        props = user.get('props')
+        if not props or not props.get('reply_to') or not props.get('correlation_id'):
+            return {"error": "Missing properties (reply_to or correlation_id)"}, 400
+
+        response_content = {}
+
+        required_fields = ["type", "uuid", "age", "contactFrequency", "gender", "hobby", "major", "mbti"]
+        for field in required_fields:
+            if field not in user:
+                response_content = {"stateCode": "CRUD-001", "message": "Field Missing", "requestType": "UPDATE", "userId": user["uuid"]}
+                raise HTTPException(status_code=400, detail=f"Missing required field: {field}")
+
+        user["duplication"] = "FALSE"
+        csv_file_path = CSV_FILE_PATH
+
+        if not os.path.exists(csv_file_path):
+            response_content = {"stateCode": "GEN-001", "message": "File open fail", "requestType": "UPDATE", "userId": user["uuid"]}
+            raise FileNotFoundError("CSV file not found")
+
+        # 업데이트할 데이터 준비
+        updated_data = {k: v for k, v in user.items() if k not in ["type", "props"]}
+        logger.debug("updated_data: %s", updated_data)
+
+        # UUID를 기준으로 데이터 찾기
+        try:
+            with stage("storage"):
+                await user_writer.update(updated_data)
+        except UserNotFound:
+            response_content = {
+                "stateCode": "CRUD-003",
+                "message": "Unmatched User",
+                "requestType": "UPDATE",
+                "userId": user["uuid"],
+            }
+            raise HTTPException(status_code=404, detail="User not found")
+
+        # 성공 응답
+        response_content = {"stateCode": "GEN-000", "message": "Success", "requestType": "UPDATE", "userId": user["uuid"]}
+        await send_to_queue(None, props, response_content)
+        return response_content, 201
+
+    except Exception as e:
+        response_content = {"stateCode": "GEN-001", "message": f"An error occurred: {str(e)}", "requestType": "UPDATE", "userId": user["uuid"]}
+        await send_to_queue(None, props, response_content)
+        return response_content, 500
+
+
+@profiled("delete_user")
+async def delete_user(user):
+    """사용자 삭제. (응답 내용, 상태 코드) 반환"""
+    try:
+        props = user.get('props')
+        if not props or not props.get('reply_to') or not props.get('correlation_id'):
+            return {"error": "Missing properties (reply_to or correlation_id)"}, 400
+
+        response_content = {}
+
+        csv_file_path = CSV_FILE_PATH
+
+        if not os.path.exists(csv_file_path):
+            response_content = {"stateCode": "GEN-001", "message": "File open fail", "requestType": "DELETE", "userId": user["uuid"]}
+            raise HTTPException(status_code=404, detail="CSV file not found")
+
+        # 저장소에서 삭제 (다른 변경과 모아 변경 로그에 기록)
+        try:
+            with stage("storage"):
+                await user_writer.delete(user["uuid"])
+        except UserNotFound:
+            response_content = {
+                "stateCode": "CRUD-003",
+                "message": "Unmatched User",
+                "requestType": "DELETE",
+                "userId": user["uuid"],
+            }
+            raise HTTPException(status_code=404, detail="User not found")
+
+        # 성공 응답
+        response_content = {"stateCode": "GEN-000", "message": "Success", "requestType": "DELETE", "userId": user["uuid"]}
+        await send_to_queue(None, props, response_content)
+        return response_content, 201
+
+    except Exception as e:
+        response_content = {"stateCode": "GEN-001", "message": f"An error occurred: {str(e)}", "requestType": "DELETE", "userId": user["uuid"]}
+        await send_to_queue(None, props, response_content)
+        return response_content, 500
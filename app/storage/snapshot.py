@@ -0,0 +1,406 @@
+"""사용자 테이블의 컬럼형 바이너리 스냅샷
+
+CSV 는 프로세스마다 텍스트를 다시 파싱해야 하므로, 같은 내용을 numpy.memmap 으로 바로 열 수 있는
+한 파일로도 저장한다. 컬럼마다 문자열 사전(UTF-8 바이트 + 오프셋)과 고정 폭 코드 배열을 두고,
+모든 값이 정수(또는 빈 값)인 컬럼(나이 등)은 int32 값 배열 하나로 둔다.
+
+적재할 때는 행 목록을 만들지 않고 UserTable(컬럼별 코드 배열 + 사전)로 넘겨, 특성 행렬과 후보 인덱스를
+코드 배열에서 바로 만든다. 행은 요청할 때만 문자열로 만든다.
+
+파일 구조 (리틀 엔디언)
+    [0:64)   매직 8바이트, 메타데이터 오프셋 u8, 메타데이터 길이 u8, 나머지 0
+    [64:...) 섹션. 각 섹션은 64바이트 경계에서 시작
+    끝       메타데이터 JSON (헤더 2행, 컬럼, 행 수, 원본 CSV 정보, 섹션 위치)
+
+같은 섹션 파일 형식(write_sections / SectionFile)을 다중 프로세스용 특성 스냅샷도 사용한다.
+
+변환:
+    python -m app.storage.snapshot export users.csv users.snap
+    python -m app.storage.snapshot import users.snap users.csv
+"""
+import os
+import csv
+import sys
+import json
+import struct
+import numpy as np
+
+MAGIC = b"CMSNAP1\n"
+FORMAT_VERSION = 1
+ALIGNMENT = 64
+_HEADER = struct.Struct("<8sQQ")
+
+# 숫자 컬럼의 빈 값
+NULL_NUMBER = np.iinfo(np.int32).min
+
+
+class SnapshotFormatError(Exception):
+    pass
+
+
+# ---- CSV ----
+
+def read_csv_table(csv_path, default_columns=None):
+    """스냅샷 CSV 를 (헤더 2행, 컬럼, 사용자 행 목록) 으로 읽음"""
+    with open(csv_path, mode="r", newline="", encoding="utf-8") as file:
+        reader = list(csv.reader(file))
+    header_rows = reader[:2]
+    columns = reader[2] if len(reader) > 2 else list(default_columns or [])
+    rows = [row for row in reader[3:] if row]
+    return header_rows, columns, rows
+
+
+def write_csv_table(csv_path, header_rows, columns, rows):
+    """임시 파일에 쓴 뒤 교체 (헤더 2행 + 사용자 헤더 + 사용자 행)"""
+    tmp_path = f"{csv_path}.tmp"
+    with open(tmp_path, mode="w", newline="", encoding="utf-8") as file:
+        writer = csv.writer(file)
+        writer.writerows(header_rows)
+        writer.writerow(columns)
+        writer.writerows(rows)
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(tmp_path, csv_path)
+
+
+def source_stamp(csv_path):
+    """스냅샷이 어떤 CSV 에서 만들어졌는지 비교하기 위한 (크기, mtime_ns)"""
+    try:
+        stat = os.stat(csv_path)
+    except (OSError, TypeError):
+        return None
+    return {"size": stat.st_size, "mtimeNs": stat.st_mtime_ns}
+
+
+# ---- 바이너리 스냅샷 ----
+
+def _code_dtype(size):
+    if size <= np.iinfo(np.uint8).max + 1:
+        return np.dtype("<u1")
+    if size <= np.iinfo(np.uint16).max + 1:
+        return np.dtype("<u2")
+    return np.dtype("<i4")
+
+
+def _dictionary_encode(values, dictionary=None):
+    """문자열 목록 → (코드 목록, {문자열: 코드}). 사전은 처음 나온 순서. dictionary 를 주면 이어서 채움"""
+    dictionary = {} if dictionary is None else dictionary
+    codes = [dictionary.setdefault(value, len(dictionary)) for value in values]
+    return codes, dictionary
+
+
+def _encode_column(values):
+    """문자열 목록 → (코드 배열, 사전 오프셋, 사전 UTF-8 바이트)"""
+    codes, dictionary = _dictionary_encode(values)
+    encoded = [value.encode("utf-8") for value in dictionary]
+    offsets = np.zeros(len(encoded) + 1, dtype="<i8")
+    offsets[1:] = np.cumsum([len(value) for value in encoded], dtype=np.int64)
+    data = np.frombuffer(b"".join(encoded), dtype=np.uint8)
+    return np.array(codes, dtype=_code_dtype(len(encoded))), offsets, data
+
+
+def write_sections(path, meta, sections, tmp_path=None):
+    """(이름, 배열) 을 64바이트 정렬 섹션으로 쓰고 meta 에 섹션 위치를 더해 끝에 저장 (임시 파일에 쓴 뒤 교체)
+
+    sections 는 이터레이터여도 되므로 큰 배열을 하나씩 만들어 바로 쓸 수 있다.
+    """
+    placed = {}
+    tmp_path = tmp_path or f"{path}.tmp"
+    with open(tmp_path, mode="wb") as file:
+        file.write(b"\0" * ALIGNMENT)
+        for name, array in sections:
+            offset = file.tell()
+            padding = -offset % ALIGNMENT
+            file.write(b"\0" * padding)
+            placed[name] = {"offset": offset + padding, "dtype": array.dtype.str, "shape": list(array.shape)}
+            file.write(np.ascontiguousarray(array).tobytes())
+
+        encoded = json.dumps(dict(meta, sections=placed), ensure_ascii=False).encode("utf-8")
+        meta_offset = file.tell()
+        file.write(encoded)
+        file.seek(0)
+        file.write(_HEADER.pack(MAGIC, meta_offset, len(encoded)))
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(tmp_path, path)
+
+
+class SectionFile:
+    """write_sections 로 쓴 파일을 memmap 으로 연 읽기 전용 뷰
+
+    섹션 배열은 파일 매핑의 뷰라서 열 때 복사가 없고, 여러 프로세스가 같은 페이지 캐시를 공유한다.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, mode="rb") as file:
+            magic, meta_offset, meta_length = _HEADER.unpack(file.read(_HEADER.size))
+            if magic != MAGIC:
+                raise SnapshotFormatError(f"Not a snapshot file: {path}")
+            file.seek(meta_offset)
+            self.meta = json.loads(file.read(meta_length).decode("utf-8"))
+        if self.meta.get("version") != FORMAT_VERSION:
+            raise SnapshotFormatError(f"Unsupported snapshot version: {self.meta.get('version')}")
+        self._buffer = np.memmap(path, dtype=np.uint8, mode="r")
+
+    def section(self, name):
+        section = self.meta["sections"][name]
+        dtype = np.dtype(section["dtype"])
+        size = int(np.prod(section["shape"])) * dtype.itemsize
+        start = section["offset"]
+        return self._buffer[start:start + size].view(dtype).reshape(section["shape"])
+
+    def strings(self, name):
+        """_encode_column 으로 쓴 {name}.offsets / {name}.data 섹션의 문자열 사전"""
+        offsets = self.section(f"{name}.offsets").tolist()
+        data = self.section(f"{name}.data").tobytes()
+        if data.isascii():
+            # ASCII 면 바이트 오프셋이 곧 글자 오프셋이라 한 번에 디코딩
+            text = data.decode("ascii")
+            return [text[start:end] for start, end in zip(offsets, offsets[1:])]
+        return [data[start:end].decode("utf-8") for start, end in zip(offsets, offsets[1:])]
+
+
+def column_sections(name, values):
+    """문자열 컬럼 하나의 (코드, 사전 오프셋, 사전 바이트) 섹션"""
+    codes, offsets, data = _encode_column(values)
+    yield f"{name}.codes", codes
+    yield f"{name}.offsets", offsets
+    yield f"{name}.data", data
+
+
+def _integer_column(values):
+    """모든 값이 정수 문자열(다시 문자열로 바꿔도 같은 값)이나 빈 값이면 int32 배열, 아니면 None"""
+    numbers = np.empty(len(values), dtype="<i4")
+    for i, value in enumerate(values):
+        if value == "":
+            numbers[i] = NULL_NUMBER
+            continue
+        try:
+            number = int(value)
+        except ValueError:
+            return None
+        if str(number) != value or not NULL_NUMBER < number <= np.iinfo(np.int32).max:
+            return None
+        numbers[i] = number
+    return numbers
+
+
+def _parse_numbers(values):
+    """문자열 목록 → float32 배열 (숫자가 아니면 nan)"""
+    numbers = np.full(len(values), np.nan, dtype=np.float32)
+    for i, value in enumerate(values):
+        try:
+            numbers[i] = float(value)
+        except (TypeError, ValueError):
+            pass
+    return numbers
+
+
+def write_snapshot(snapshot_path, header_rows, columns, rows, source=None):
+    """사용자 행을 바이너리 스냅샷으로 저장 (임시 파일에 쓴 뒤 교체)"""
+    width = len(columns)
+    rows = [(list(row) + [""] * width)[:width] for row in rows]
+    numeric = []
+
+    def sections():
+        for i in range(width):
+            values = [row[i] for row in rows]
+            numbers = _integer_column(values)
+            if numbers is not None:
+                numeric.append(i)
+                yield f"{i}.values", numbers
+            else:
+                yield from column_sections(str(i), values)
+
+    meta = {
+        "version": FORMAT_VERSION,
+        "count": len(rows),
+        "headerRows": header_rows,
+        "columns": columns,
+        "source": source,
+        "numeric": numeric,
+    }
+    # meta 는 섹션을 모두 쓴 뒤 저장되므로 numeric 이 채워진 상태로 기록된다
+    write_sections(snapshot_path, meta, sections())
+
+
+class UserTable:
+    """사용자 테이블의 컬럼형 읽기 뷰
+
+    문자열 컬럼은 codes(column) 의 코드 배열과 dictionary(column) 의 사전으로, 숫자 컬럼은 numbers(column) 로
+    읽는다. 없는 컬럼은 모두 빈 값이다. 행 목록(rows)과 행 dict(records)는 부를 때만 만든다.
+    """
+
+    def __init__(self, columns, count):
+        self.columns = list(columns)
+        self.count = count
+        self._encoded = {}
+
+    def __len__(self):
+        return self.count
+
+    def _encode(self, column):
+        """컬럼 → (코드 배열, 사전 목록)"""
+        raise NotImplementedError
+
+    def encoded(self, column):
+        if column not in self._encoded:
+            if column in self.columns:
+                self._encoded[column] = self._encode(column)
+            else:
+                self._encoded[column] = (np.zeros(self.count, dtype=np.uint8), [""])
+        return self._encoded[column]
+
+    def codes(self, column):
+        """컬럼의 사전 코드 배열"""
+        return self.encoded(column)[0]
+
+    def dictionary(self, column):
+        """컬럼의 문자열 사전 (코드 → 문자열)"""
+        return self.encoded(column)[1]
+
+    def numbers(self, column):
+        """컬럼을 숫자로 읽은 float32 배열 (빈 값이나 숫자가 아닌 값은 nan)"""
+        codes, dictionary = self.encoded(column)
+        return _parse_numbers(dictionary)[codes]
+
+    def values(self, column):
+        """컬럼의 행별 문자열 목록"""
+        codes, dictionary = self.encoded(column)
+        return np.array(dictionary, dtype=object)[codes].tolist()
+
+    def rows(self):
+        """CSV 와 같은 사용자 행 목록"""
+        if not self.columns:
+            return [[] for _ in range(self.count)]
+        return [list(row) for row in zip(*(self.values(column) for column in self.columns))]
+
+    def records(self):
+        """행마다 {컬럼: 값} dict"""
+        return [dict(zip(self.columns, row)) for row in self.rows()]
+
+
+class RowTable(UserTable):
+    """행 목록으로 만든 테이블
+
+    base 와 slots 를 주면 slots[i] 가 0 이상인 행은 base 의 그 행이고, -1 인 자리는 rows 가 순서대로 채운다.
+    """
+
+    def __init__(self, columns, rows, base=None, slots=None):
+        if slots is None:
+            slots = np.full(len(rows), -1, dtype=np.int64)
+        super().__init__(columns, len(slots))
+        self.base = base
+        self.slots = slots
+        self.added = rows
+
+    def _encode(self, column):
+        position = self.columns.index(column)
+        added = [row[position] for row in self.added]
+        codes = np.empty(self.count, dtype=np.int32)
+        if self.base is None:
+            added_codes, dictionary = _dictionary_encode(added)
+            codes[:] = added_codes
+            return codes, list(dictionary)
+        base_codes, base_dictionary = self.base.encoded(column)
+        stored = self.slots >= 0
+        codes[stored] = base_codes[self.slots[stored]]
+        added_codes, dictionary = _dictionary_encode(added, {value: code for code, value in enumerate(base_dictionary)})
+        codes[~stored] = added_codes
+        return codes, list(dictionary)
+
+    def numbers(self, column):
+        if self.base is None or column not in self.columns:
+            return super().numbers(column)
+        position = self.columns.index(column)
+        numbers = np.empty(self.count, dtype=np.float32)
+        stored = self.slots >= 0
+        numbers[stored] = self.base.numbers(column)[self.slots[stored]]
+        numbers[~stored] = _parse_numbers([row[position] for row in self.added])
+        return numbers
+
+
+class UserSnapshot(UserTable):
+    """사용자 테이블 바이너리 스냅샷의 읽기 전용 뷰
+
+    코드/값 배열은 memmap 뷰이고, 문자열 사전은 처음 필요할 때 한 번만 디코딩한다.
+    """
+
+    def __init__(self, snapshot_path):
+        self.path = snapshot_path
+        self._file = SectionFile(snapshot_path)
+        meta = self._file.meta
+        super().__init__(meta["columns"], meta["count"])
+        self.header_rows = meta["headerRows"]
+        self.source = meta.get("source")
+        self._numeric = set(meta.get("numeric", []))
+
+    def _position(self, column):
+        try:
+            return self.columns.index(column)
+        except ValueError:
+            raise KeyError(column)
+
+    def is_numeric(self, column):
+        return column in self.columns and self._position(column) in self._numeric
+
+    def _encode(self, column):
+        position = self._position(column)
+        if position in self._numeric:
+            unique, codes = np.unique(self._file.section(f"{position}.values"), return_inverse=True)
+            return codes, ["" if value == NULL_NUMBER else str(value) for value in unique.tolist()]
+        return self._file.section(f"{position}.codes"), self._file.strings(str(position))
+
+    def numbers(self, column):
+        if not self.is_numeric(column):
+            return super().numbers(column)
+        values = self._file.section(f"{self._position(column)}.values")
+        return np.where(values == NULL_NUMBER, np.nan, values).astype(np.float32)
+
+    def row(self, slot):
+        """slot 번째 사용자 행 하나"""
+        row = []
+        for position, column in enumerate(self.columns):
+            if position in self._numeric:
+                value = int(self._file.section(f"{position}.values")[slot])
+                row.append("" if value == NULL_NUMBER else str(value))
+            else:
+                codes, dictionary = self.encoded(column)
+                row.append(dictionary[codes[slot]])
+        return row
+
+    def is_current(self, csv_path):
+        """CSV 가 없거나 이 스냅샷을 만든 뒤 바뀌지 않았으면 True"""
+        stamp = source_stamp(csv_path)
+        return stamp is None or stamp == self.source
+
+
+def export_snapshot(csv_path, snapshot_path):
+    """CSV → 바이너리 스냅샷"""
+    source = source_stamp(csv_path)
+    header_rows, columns, rows = read_csv_table(csv_path)
+    write_snapshot(snapshot_path, header_rows, columns, rows, source)
+    return len(rows)
+
+
+def import_snapshot(snapshot_path, csv_path):
+    """바이너리 스냅샷 → CSV"""
+    snapshot = UserSnapshot(snapshot_path)
+    write_csv_table(csv_path, snapshot.header_rows, snapshot.columns, snapshot.rows())
+    return len(snapshot)
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if len(argv) != 3 or argv[0] not in ("export", "import"):
+        print("usage: python -m app.storage.snapshot export <csv> <snapshot> | import <snapshot> <csv>")
+        return 2
+    command, source, target = argv
+    count = export_snapshot(source, target) if command == "export" else import_snapshot(source, target)
+    print(f"{command}: {count} users, {source} -> {target}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,351 @@
+import os
+import csv
+import json
+import logging
+import threading
+from app.config import CSV_FILE_PATH, USER_LOG_FILE_PATH, USER_LOG_COMPACT_THRESHOLD, USER_SNAPSHOT_PATH
+import numpy as np
+from app.storage.snapshot import (
+    UserSnapshot, RowTable, SnapshotFormatError, read_csv_table, write_snapshot, source_stamp,
+)
+from app.utils.executors import io_executor
+
+logger = logging.getLogger(__name__)
+
+# 스냅샷 CSV 의 세 번째 행이 없을 때 사용할 기본 컬럼
+DEFAULT_USER_COLUMNS = ["uuid", "age", "contactFrequency", "gender", "hobby", "major", "mbti", "duplication", ""]
+
+
+class UserAlreadyExists(Exception):
+    pass
+
+
+class UserNotFound(Exception):
+    pass
+
+
+def _cell(value):
+    return "" if value is None else str(value)
+
+
+class UserRepository:
+    """uuid → 행 해시 인덱스를 메모리에 유지하는 사용자 저장소
+
+    변경은 append-only 로그에 기록하고, 로그가 쌓이면 백그라운드에서 스냅샷 CSV 로 압축한다.
+    스냅샷 CSV 는 기존 형식(헤더 2행 + 사용자 헤더 + 사용자 행)을 그대로 유지한다.
+    snapshot_path 가 있으면 같은 내용의 바이너리 스냅샷도 함께 유지하고, CSV 와 같은 상태일 때는 그쪽에서 적재한다.
+    바이너리 스냅샷에서 적재한 행은 인덱스에 스냅샷 행 번호만 두고, 읽을 때 그 행을 문자열로 만든다.
+    """
+
+    def __init__(self, csv_file_path, log_file_path=None, compact_threshold=1000, snapshot_path=None):
+        self.csv_file_path = csv_file_path
+        self.log_file_path = log_file_path or (f"{csv_file_path}.log" if csv_file_path else None)
+        self.compact_threshold = compact_threshold
+        self.snapshot_path = snapshot_path
+        self.lock = threading.RLock()
+        self._snapshot_lock = threading.Lock()
+        # 압축은 같은 임시 파일과 로그 오프셋을 쓰므로 한 번에 하나만
+        self._compact_lock = threading.Lock()
+        self.version = 0
+        self._header_rows = []
+        self._columns = list(DEFAULT_USER_COLUMNS)
+        # uuid → 행 (문자열 목록, 또는 self._base 의 행 번호)
+        self._rows = {}
+        self._base = None
+        # 스냅샷에서 적재한 뒤 바뀐 행이 없으면 True (LOAD 때 스냅샷 코드 배열을 그대로 넘김)
+        self._base_current = False
+        self._loaded = False
+        self._log_file = None
+        self._pending = 0
+        self._compacting = False
+        self._listeners = []
+
+    def add_listener(self, listener):
+        """변경 리스너 등록. listener(op, uuid, user) 는 저장소 락 안에서 호출된다
+
+        op 는 CREATE/UPDATE/DELETE, 적재 직후에는 LOAD(user 자리에 전체 사용자의 UserTable)
+        """
+        self._listeners.append(listener)
+
+    def _notify(self, op, uuid, user):
+        for listener in self._listeners:
+            try:
+                listener(op, uuid, user)
+            except Exception as e:
+                logger.exception("Error in user repository listener: %s", e)
+
+    # ---- 적재 ----
+
+    def load(self):
+        """스냅샷(바이너리 또는 CSV)을 읽고 변경 로그를 재생"""
+        snapshot = self._open_snapshot()
+        if snapshot is None and (not self.csv_file_path or not os.path.exists(self.csv_file_path)):
+            raise FileNotFoundError("CSV file not found")
+        with self.lock:
+            if snapshot is not None:
+                header_rows, columns = snapshot.header_rows, snapshot.columns
+                self._base = snapshot
+                self._base_current = True
+                self._rows = dict(zip(snapshot.values(columns[0]), range(len(snapshot)))) if columns else {}
+            else:
+                source = source_stamp(self.csv_file_path)
+                header_rows, columns, rows = read_csv_table(self.csv_file_path, self._columns)
+                self._base = None
+                self._rows = {}
+            self._header_rows = header_rows
+            self._columns = columns
+            if snapshot is None:
+                for row in rows:
+                    self._rows[row[0]] = self._fit(row)
+
+            self._pending = 0
+            if os.path.exists(self.log_file_path):
+                with open(self.log_file_path, mode="r", encoding="utf-8") as log:
+                    for line in log:
+                        if line.strip():
+                            self._apply(json.loads(line))
+                            self._pending += 1
+            self._loaded = True
+            self.version += 1
+            self._notify("LOAD", None, self._table())
+        logger.info(
+            "User repository loaded %d users from %s (%d pending log entries)",
+            len(self._rows), "binary snapshot" if snapshot else "CSV", self._pending,
+        )
+
+        # 바이너리 스냅샷이 없거나 오래됐으면 방금 읽은 CSV 내용으로 만들어 둠
+        if self.snapshot_path and snapshot is None:
+            io_executor.submit(self._export_snapshot, header_rows, columns, rows, source)
+
+    def _open_snapshot(self):
+        """CSV 와 같은 상태의 바이너리 스냅샷. 없거나 오래됐으면 None"""
+        if not self.snapshot_path or not os.path.exists(self.snapshot_path):
+            return None
+        try:
+            snapshot = UserSnapshot(self.snapshot_path)
+        except (OSError, ValueError, KeyError, SnapshotFormatError) as e:
+            logger.warning("Ignoring unreadable user snapshot: %s", e)
+            return None
+        return snapshot if snapshot.is_current(self.csv_file_path) else None
+
+    def _export_snapshot(self, header_rows, columns, rows, source):
+        try:
+            with self._snapshot_lock:
+                if self._open_snapshot() is None:
+                    write_snapshot(self.snapshot_path, header_rows, columns, rows, source)
+                    logger.info("User snapshot written: %d users", len(rows))
+        except Exception as e:
+            logger.exception("Error writing user snapshot: %s", e)
+
+    def ensure_loaded(self):
+        """아직 적재하지 않았으면 적재 (동시에 불려도 한 번만)"""
+        if not self._loaded:
+            with self.lock:
+                if not self._loaded:
+                    self.load()
+
+    def _fit(self, row):
+        width = len(self._columns)
+        return (list(row) + [""] * width)[:width]
+
+    def _to_row(self, user):
+        return [_cell(user.get(column, "")) for column in self._columns]
+
+    def _row(self, row):
+        """인덱스 값을 행 목록으로 (스냅샷 행 번호면 그 행을 만듦)"""
+        return self._base.row(row) if isinstance(row, int) else row
+
+    def _table(self):
+        """현재 사용자 전체의 UserTable (인덱스 순서). 락 안에서 호출"""
+        if self._base_current and len(self._rows) == len(self._base):
+            return self._base
+        values = list(self._rows.values())
+        if self._base is None:
+            return RowTable(self._columns, values)
+        added = [row for row in values if not isinstance(row, int)]
+        slots = np.array([row if isinstance(row, int) else -1 for row in values], dtype=np.int64)
+        return RowTable(self._columns, added, self._base, slots)
+
+    # ---- 조회 ----
+
+    def __len__(self):
+        self.ensure_loaded()
+        return len(self._rows)
+
+    def exists(self, uuid):
+        self.ensure_loaded()
+        return uuid in self._rows
+
+    def get(self, uuid):
+        self.ensure_loaded()
+        row = self._rows.get(uuid)
+        return dict(zip(self._columns, self._row(row))) if row is not None else None
+
+    @property
+    def columns(self):
+        self.ensure_loaded()
+        return list(self._columns)
+
+    def rows(self):
+        """현재 사용자 행 목록의 복사본"""
+        self.ensure_loaded()
+        with self.lock:
+            return self._table().rows()
+
+    def to_dataframe(self):
+        import pandas as pd  # 무거운 모듈이라 필요할 때 불러옴
+
+        with self.lock:
+            return pd.DataFrame(self.rows(), columns=self.columns)
+
+    # ---- 변경 ----
+
+    def create(self, user):
+        self.ensure_loaded()
+        with self.lock:
+            if user["uuid"] in self._rows:
+                raise UserAlreadyExists(user["uuid"])
+            self._commit([{"op": "CREATE", "uuid": user["uuid"], "row": self._to_row(user)}])
+
+    def update(self, user):
+        self.ensure_loaded()
+        with self.lock:
+            if user["uuid"] not in self._rows:
+                raise UserNotFound(user["uuid"])
+            self._commit([{"op": "UPDATE", "uuid": user["uuid"], "row": self._to_row(user)}])
+
+    def delete(self, uuid):
+        self.ensure_loaded()
+        with self.lock:
+            if uuid not in self._rows:
+                raise UserNotFound(uuid)
+            self._commit([{"op": "DELETE", "uuid": uuid}])
+
+    def apply_batch(self, operations):
+        """(op, user) 목록을 순서대로 검사한 뒤 한 번의 로그 쓰기로 반영
+
+        결과는 op 마다 None(성공) 또는 UserAlreadyExists/UserNotFound 예외 객체로, 하나씩 처리했을 때와 같다.
+        같은 uuid 의 성공한 변경은 마지막 상태 하나로 합친다 (마지막 쓰기 우선, 그 뒤에 삭제가 있으면 삭제).
+        """
+        self.ensure_loaded()
+        with self.lock:
+            state = {}
+            results = []
+            for op, user in operations:
+                uuid = user["uuid"]
+                exists = state[uuid] is not None if uuid in state else uuid in self._rows
+                if op == "CREATE" and exists:
+                    results.append(UserAlreadyExists(uuid))
+                elif op != "CREATE" and not exists:
+                    results.append(UserNotFound(uuid))
+                else:
+                    state[uuid] = None if op == "DELETE" else self._to_row(user)
+                    results.append(None)
+
+            entries = []
+            for uuid, row in state.items():
+                if row is not None:
+                    entries.append({"op": "UPDATE" if uuid in self._rows else "CREATE", "uuid": uuid, "row": row})
+                elif uuid in self._rows:
+                    entries.append({"op": "DELETE", "uuid": uuid})
+            if entries:
+                self._commit(entries)
+            return results
+
+    def _apply(self, entry):
+        self._base_current = False
+        if entry["op"] == "DELETE":
+            self._rows.pop(entry["uuid"], None)
+        else:
+            self._rows[entry["uuid"]] = self._fit(entry["row"])
+
+    def _commit(self, entries):
+        """로그에 먼저 기록한 뒤 메모리 인덱스에 반영 (여러 항목도 한 번에 기록)"""
+        if self._log_file is None:
+            self._log_file = open(self.log_file_path, mode="a", encoding="utf-8")
+        self._log_file.write("".join(json.dumps(entry, ensure_ascii=False) + "\n" for entry in entries))
+        self._log_file.flush()
+        for entry in entries:
+            self._apply(entry)
+        self._pending += len(entries)
+        self.version += 1
+        for entry in entries:
+            row = self._rows.get(entry["uuid"])
+            self._notify(entry["op"], entry["uuid"], dict(zip(self._columns, row)) if entry["op"] != "DELETE" else None)
+        if self._pending >= self.compact_threshold and not self._compacting:
+            self._compacting = True
+            io_executor.submit(self.compact)
+
+    # ---- 압축 ----
+
+    def compact(self):
+        """현재 상태를 스냅샷 CSV 로 쓰고, 그 사이 추가된 로그만 남김 (진행 중인 압축이 있으면 끝날 때까지 기다림)"""
+        with self._compact_lock:
+            try:
+                self._compact()
+            finally:
+                self._compacting = False
+
+    def _compact(self):
+        snapshot_locked = False
+        try:
+            with self.lock:
+                if not self._loaded:
+                    return
+                header_rows = [list(row) for row in self._header_rows]
+                columns = list(self._columns)
+                rows = self._table().rows()
+                if self._log_file is not None:
+                    self._log_file.flush()
+                log_offset = os.path.getsize(self.log_file_path) if os.path.exists(self.log_file_path) else 0
+                compacted = self._pending
+
+            tmp_path = f"{self.csv_file_path}.tmp"
+            with open(tmp_path, mode="w", newline="", encoding="utf-8") as file:
+                writer = csv.writer(file)
+                writer.writerows(header_rows)
+                writer.writerow(columns)
+                writer.writerows(rows)
+                file.flush()
+                os.fsync(file.fileno())
+
+            # 바이너리 스냅샷은 새 CSV 와 같은 내용으로 쓰고 CSV 와 함께 교체
+            if self.snapshot_path:
+                self._snapshot_lock.acquire()
+                snapshot_locked = True
+                write_snapshot(f"{self.snapshot_path}.next", header_rows, columns, rows, source_stamp(tmp_path))
+
+            with self.lock:
+                os.replace(tmp_path, self.csv_file_path)
+                if self.snapshot_path:
+                    os.replace(f"{self.snapshot_path}.next", self.snapshot_path)
+                tail = b""
+                if os.path.exists(self.log_file_path):
+                    with open(self.log_file_path, mode="rb") as log:
+                        log.seek(log_offset)
+                        tail = log.read()
+                if self._log_file is not None:
+                    self._log_file.close()
+                    self._log_file = None
+                with open(f"{self.log_file_path}.tmp", mode="wb") as log:
+                    log.write(tail)
+                os.replace(f"{self.log_file_path}.tmp", self.log_file_path)
+                self._pending -= compacted
+            logger.info("User log compacted: %d users, %d entries", len(rows), compacted)
+        except Exception as e:
+            logger.exception("Error compacting user log: %s", e)
+        finally:
+            if snapshot_locked:
+                self._snapshot_lock.release()
+
+    def close(self):
+        """종료 시 남은 로그를 스냅샷에 반영 (백그라운드 압축이 돌고 있으면 끝난 뒤에)"""
+        if self._loaded and self._pending:
+            self.compact()
+        with self.lock:
+            if self._log_file is not None:
+                self._log_file.close()
+                self._log_file = None
+
+
+user_repository = UserRepository(CSV_FILE_PATH, USER_LOG_FILE_PATH, USER_LOG_COMPACT_THRESHOLD, USER_SNAPSHOT_PATH)
@@ -0,0 +1,38 @@
+from app.config import USER_CRUD_BATCH_SIZE, USER_CRUD_BATCH_WAIT_MS
+from app.storage.user_repository import user_repository
+from app.utils.executors import io_executor
+from app.utils.microbatch import MicroBatcher
+
+
+class UserWriteCoalescer(MicroBatcher):
+    """사용자 CREATE/UPDATE/DELETE 를 모아 저장소에 한 번에 기록
+
+    최대 max_batch_size 개 또는 첫 요청 이후 max_wait_ms 동안 들어온 변경을 도착 순서대로
+    repository.apply_batch 로 넘긴다. 요청마다 자기 결과를 받으므로 중복 생성, 없는 사용자
+    같은 개별 응답은 하나씩 처리할 때와 같다. stop() 은 모으는 중인 변경까지 반영한 뒤 종료한다.
+    """
+
+    item_label = "operations"
+
+    def __init__(self, repository, max_batch_size=256, max_wait_ms=10):
+        super().__init__(max_batch_size, max_wait_ms)
+        self.repository = repository
+
+    async def submit(self, op, user):
+        """변경 하나를 배치에 넣고 반영될 때까지 기다림. 실패하면 UserAlreadyExists/UserNotFound"""
+        await super().submit((op, user))
+
+    async def create(self, user):
+        await self.submit("CREATE", user)
+
+    async def update(self, user):
+        await self.submit("UPDATE", user)
+
+    async def delete(self, uuid):
+        await self.submit("DELETE", {"uuid": uuid})
+
+    async def process_batch(self, operations):
+        return await io_executor.run(self.repository.apply_batch, operations)
+
+
+user_writer = UserWriteCoalescer(user_repository, USER_CRUD_BATCH_SIZE, USER_CRUD_BATCH_WAIT_MS)
@@ -0,0 +1,63 @@
+import time
+import contextvars
+from contextlib import contextmanager
+
+# 현재 요청의 마감 시각 (epoch 초). 호출 측이 이 시각까지만 응답을 기다린다
+_deadline = contextvars.ContextVar("comatching_deadline", default=None)
+
+
+def _epoch_millis(value):
+    try:
+        return float(value) / 1000
+    except (TypeError, ValueError):
+        return None
+
+
+def message_deadline(message, payload, received_at, default_timeout=0):
+    """큐 메시지의 마감 시각 (epoch 초). 없으면 None
+
+    다음 중 가장 이른 값을 쓴다.
+    - AMQP expiration(ms): 발행 시각(timestamp, 없으면 수신 시각)부터
+    - 헤더 x-deadline 또는 본문 deadline: epoch 밀리초
+    - 둘 다 없으면 수신 시각 + default_timeout(초, 0 이면 마감 없음)
+    """
+    published = message_timestamp(message) or received_at
+    candidates = []
+    expiration = getattr(message, "expiration", None)
+    if expiration:
+        candidates.append(published + float(expiration))
+    headers = getattr(message, "headers", None) or {}
+    for value in (headers.get("x-deadline"), payload.get("deadline")):
+        deadline = _epoch_millis(value)
+        if deadline:
+            candidates.append(deadline)
+    if not candidates and default_timeout > 0:
+        candidates.append(received_at + default_timeout)
+    return min(candidates) if candidates else None
+
+
+def message_timestamp(message):
+    """AMQP timestamp(발행 시각, epoch 초). 없으면 None"""
+    timestamp = getattr(message, "timestamp", None)
+    return timestamp.timestamp() if timestamp is not None else None
+
+
+@contextmanager
+def deadline_scope(deadline):
+    """블록 안의 remaining()/expired() 가 이 마감 시각을 사용"""
+    token = _deadline.set(deadline)
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def remaining():
+    """현재 요청의 남은 시간(초). 마감이 없으면 None"""
+    deadline = _deadline.get()
+    return None if deadline is None else deadline - time.time()
+
+
+def expired():
+    left = remaining()
+    return left is not None and left <= 0
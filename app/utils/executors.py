@@ -0,0 +1,78 @@
+import asyncio
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from app.config import IO_EXECUTOR_WORKERS, CPU_EXECUTOR_WORKERS
+
+
+class MonitoredExecutor:
+    """스레드 풀을 감싸 대기열 길이와 사용률을 집계
+
+    풀은 처음 작업이 들어올 때 만든다.
+    """
+
+    def __init__(self, name, workers):
+        self.name = name
+        self.workers = max(1, workers)
+        self._executor = None
+        self._lock = threading.Lock()
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+
+    def _get_executor(self):
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix=f"{self.name}-pool")
+            return self._executor
+
+    def submit(self, fn, *args, **kwargs):
+        """작업 제출. concurrent.futures.Future 반환"""
+        if kwargs:
+            fn = functools.partial(fn, **kwargs)
+        future = self._get_executor().submit(fn, *args)
+        with self._lock:
+            self.submitted += 1
+        future.add_done_callback(self._on_done)
+        return future
+
+    def _on_done(self, future):
+        with self._lock:
+            self.completed += 1
+            if future.cancelled() or future.exception() is not None:
+                self.failed += 1
+
+    async def run(self, fn, *args, **kwargs):
+        """이벤트 루프를 막지 않고 작업 실행 결과를 기다림"""
+        return await asyncio.wrap_future(self.submit(fn, *args, **kwargs))
+
+    def stats(self):
+        in_flight = self.submitted - self.completed
+        return {
+            "workers": self.workers,
+            "inFlight": in_flight,
+            "queueDepth": max(in_flight - self.workers, 0),
+            "utilization": min(in_flight, self.workers) / self.workers,
+            "submitted": self.submitted,
+            "completed": self.completed,
+            "failed": self.failed,
+        }
+
+    def shutdown(self, wait=True):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait)
+
+
+io_executor = MonitoredExecutor("io", IO_EXECUTOR_WORKERS)
+cpu_executor = MonitoredExecutor("cpu", CPU_EXECUTOR_WORKERS)
+
+
+def executor_stats():
+    return {executor.name: executor.stats() for executor in (io_executor, cpu_executor)}
+
+
+def shutdown_executors():
+    for executor in (io_executor, cpu_executor):
+        executor.shutdown()
@@ -0,0 +1,9 @@
+import os
+
+
+def process_tmp_path(path):
+    """path 를 교체하기 전에 내용을 쓸 임시 파일 경로
+
+    여러 워커 프로세스가 같은 경로에 저장할 수 있으므로 임시 파일은 프로세스별로 둔다.
+    """
+    return f"{path}.{os.getpid()}.tmp"
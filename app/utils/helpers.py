@@ -1,21 +1,18 @@
-import aio_pika
-import json
-from app.config import RABBITMQ_URL
+import logging
+from app.utils.metrics import stage, count_reply
+from app.utils.reply_pipeline import reply_pipeline
+from app.utils.reply_store import reply_store
+
+logger = logging.getLogger(__name__)
 
 async def send_to_queue(method, props, message):
+    count_reply(message.get("stateCode"))
+    reply_store.record(message)
     try:
-        print(f"Sending message to queue: {message}")
-        connection = await aio_pika.connect_robust(RABBITMQ_URL)
-        async with connection:
-            channel = await connection.channel()
-
-            await channel.default_exchange.publish(
-                aio_pika.Message(
-                    body=json.dumps(message).encode(),
-                    correlation_id=props["correlation_id"]
-                ),
-                routing_key=props["reply_to"],
-            )
-            print(f"Message sent to queue '{props['reply_to']}'") ###
+        logger.debug("Sending message to queue: %s", message)
+        # 발행은 reply_pipeline 이 모아서 하므로 여기서는 버퍼에 넣는 시간만 든다
+        with stage("publish"):
+            await reply_pipeline.put(props["reply_to"], props["correlation_id"], message)
+        logger.debug("Message queued for '%s'", props["reply_to"])
     except Exception as e:
-        print(f"Error sending message to queue: {str(e)}")
+        logger.error("Error sending message to queue: %s", e)
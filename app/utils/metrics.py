@@ -0,0 +1,203 @@
+import time
+import bisect
+import threading
+import contextvars
+from contextlib import contextmanager
+
+# 지연 히스토그램 버킷(초)
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labels):
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in labels) + "}"
+
+
+def _format_value(value):
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    """라벨별 누적 카운터"""
+
+    kind = "counter"
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1, **labels):
+        key = tuple(labels.get(name, "") for name in self.labelnames)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def samples(self):
+        with self._lock:
+            values = dict(self._values)
+        for key, value in sorted(values.items()):
+            yield self.name, tuple(zip(self.labelnames, key)), value
+
+
+class Histogram:
+    """라벨별 누적 버킷 히스토그램"""
+
+    kind = "histogram"
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value, **labels):
+        key = tuple(labels.get(name, "") for name in self.labelnames)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            entry = self._values.get(key)
+            if entry is None:
+                entry = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            entry[0][index] += 1
+            entry[1] += value
+            entry[2] += 1
+
+    def samples(self):
+        with self._lock:
+            values = {key: (list(counts), total, count) for key, (counts, total, count) in self._values.items()}
+        for key, (counts, total, count) in sorted(values.items()):
+            labels = tuple(zip(self.labelnames, key))
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += bucket_count
+                yield f"{self.name}_bucket", labels + (("le", _format_value(float(bound))),), cumulative
+            yield f"{self.name}_sum", labels, total
+            yield f"{self.name}_count", labels, count
+
+
+class CallbackCounter:
+    """다른 객체가 누적하는 값을 내보내는 카운터. 렌더링할 때 callback() 이 {라벨 값 튜플: 값} 을 돌려준다"""
+
+    kind = "counter"
+
+    def __init__(self, name, documentation, labelnames, callback):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.callback = callback
+
+    def samples(self):
+        for key, value in sorted(self.callback().items()):
+            yield self.name, tuple(zip(self.labelnames, key)), value
+
+
+class CallbackGauge(CallbackCounter):
+    """렌더링할 때 callback() 으로 현재 값을 읽는 게이지"""
+
+    kind = "gauge"
+
+
+class Registry:
+    """Prometheus 텍스트 형식(0.0.4)으로 내보낼 지표 모음"""
+
+    def __init__(self):
+        self._metrics = []
+
+    def register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def render(self):
+        lines = []
+        for metric in self._metrics:
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            for name, labels, value in metric.samples():
+                lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+request_seconds = registry.register(Histogram(
+    "comatching_request_seconds", "End-to-end request handling time", ("transport", "endpoint"),
+))
+stage_seconds = registry.register(Histogram(
+    "comatching_stage_seconds", "Time spent in each request stage", ("transport", "endpoint", "stage"),
+))
+replies_total = registry.register(Counter(
+    "comatching_replies_total", "Replies sent, by state code", ("transport", "endpoint", "state_code"),
+))
+errors_total = registry.register(Counter(
+    "comatching_errors_total", "Requests that failed with an unhandled exception", ("transport", "endpoint"),
+))
+
+# 현재 요청의 (transport, endpoint). 큐 메시지는 ("queue", 큐 이름), HTTP 는 ("http", 경로)
+_source = contextvars.ContextVar("comatching_metrics_source", default=("internal", ""))
+
+
+@contextmanager
+def request_context(transport, endpoint):
+    """요청 하나의 범위. 안에서 기록한 단계 지연과 응답 수는 이 transport/endpoint 라벨로 집계된다"""
+    token = _source.set((transport, endpoint))
+    started = time.perf_counter()
+    try:
+        yield
+    except Exception:
+        errors_total.inc(transport=transport, endpoint=endpoint)
+        raise
+    finally:
+        request_seconds.observe(time.perf_counter() - started, transport=transport, endpoint=endpoint)
+        _source.reset(token)
+
+
+def observe_stage(stage, seconds):
+    transport, endpoint = _source.get()
+    stage_seconds.observe(seconds, transport=transport, endpoint=endpoint, stage=stage)
+
+
+@contextmanager
+def stage(name):
+    """블록 실행 시간을 현재 요청의 name 단계로 기록"""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe_stage(name, time.perf_counter() - started)
+
+
+def count_reply(state_code):
+    transport, endpoint = _source.get()
+    replies_total.inc(transport=transport, endpoint=endpoint, state_code=state_code or "")
+
+
+class MetricsMiddleware:
+    """HTTP 요청마다 request_context 를 여는 ASGI 미들웨어 (등록된 경로만 라벨로 사용)"""
+
+    def __init__(self, app):
+        self.app = app
+        self._paths = None
+
+    def _endpoint(self, scope):
+        if self._paths is None:
+            router = scope.get("app")
+            self._paths = {getattr(route, "path", None) for route in getattr(router, "routes", [])}
+        path = scope.get("path", "")
+        return path if path in self._paths else "other"
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        with request_context("http", self._endpoint(scope)):
+            await self.app(scope, receive, send)
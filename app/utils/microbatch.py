@@ -0,0 +1,145 @@
+import asyncio
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class BatchCancelled(Exception):
+    """stop() 이 배치를 끝까지 처리하지 못하고 취소했을 때 남은 항목의 future 에 넣는 예외"""
+
+
+class MicroBatcher:
+    """항목을 모아 한 번에 처리하는 비동기 배치 수집기
+
+    최대 max_batch_size 개 또는 첫 항목 이후 max_wait_ms 동안 들어온 항목을 도착 순서대로 모아
+    하위 클래스의 process_batch(items) 로 넘긴다. process_batch 는 항목별 결과 목록을 돌려주고,
+    결과가 예외 객체면 그 항목의 future 에 예외로 넣는다. process_batch 가 예외를 올리면 배치 전체가 그 예외를 받는다.
+
+    buffer_size 가 있으면 대기열이 가득 찼을 때 넣는 쪽이 자리가 날 때까지 기다린다.
+    stop() 은 대기열과 모으는 중인 배치까지 모두 처리한 뒤 종료한다. drain_timeout(초) 안에 끝나지 않아
+    취소하면 결과를 받지 못한 항목의 future 에 BatchCancelled 를 넣는다.
+    """
+
+    # stats() 에서 항목 수를 나타내는 키
+    item_label = "items"
+
+    def __init__(self, max_batch_size=32, max_wait_ms=5, buffer_size=0, drain_timeout=None):
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max_wait_ms / 1000
+        self.buffer_size = max(0, buffer_size)
+        self.drain_timeout = drain_timeout
+        self._queue = None
+        self._task = None
+        # 대기열에서 꺼냈지만 아직 결과를 넣지 않은 배치 (모으는 중 포함)
+        self._current = None
+        self.batches = 0
+        self.items = 0
+        self.cancelled = 0
+
+    def _ensure_started(self):
+        if self._task is None or self._task.done():
+            if self._queue is None or self._queue.empty():
+                self._queue = asyncio.Queue(self.buffer_size)
+            self._task = asyncio.create_task(self._run())
+
+    async def put(self, item):
+        """결과를 기다리지 않고 항목을 넣음. 대기열이 가득 차 있을 때만 기다린다"""
+        self._ensure_started()
+        await self._queue.put((item, None))
+
+    async def submit(self, item):
+        """항목을 넣고 그 항목의 처리 결과를 기다림"""
+        self._ensure_started()
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((item, future))
+        return await future
+
+    def depth(self):
+        """대기열에서 기다리는 항목 수"""
+        return self._queue.qsize() if self._queue is not None else 0
+
+    async def _collect(self):
+        self._current = [await self._queue.get()]
+        batch = self._current
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            if not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+                continue
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def process_batch(self, items):
+        raise NotImplementedError
+
+    async def _run(self):
+        while True:
+            batch = await self._collect()
+            try:
+                results = await self.process_batch([item for item, _ in batch])
+                for (_, future), result in zip(batch, results):
+                    if future is None or future.done():
+                        continue
+                    if isinstance(result, BaseException):
+                        future.set_exception(result)
+                    else:
+                        future.set_result(result)
+            except Exception as e:
+                logger.exception("Error processing %s batch", type(self).__name__)
+                for _, future in batch:
+                    if future is not None and not future.done():
+                        future.set_exception(e)
+            # 취소되면 여기까지 오지 않으므로 stop() 이 이 배치의 future 를 실패 처리한다
+            self._current = None
+            self.batches += 1
+            self.items += len(batch)
+
+    def _busy(self):
+        return self._current is not None or (self._queue is not None and not self._queue.empty())
+
+    async def _drain(self):
+        while self._busy() and not self._task.done():
+            await asyncio.sleep(0.01)
+
+    async def stop(self):
+        """남은 항목을 모두 처리한 뒤 종료 (drain_timeout 을 넘기면 남은 항목을 BatchCancelled 로 실패)"""
+        if self._task is None:
+            return
+        try:
+            await asyncio.wait_for(self._drain(), self.drain_timeout)
+        except asyncio.TimeoutError:
+            logger.warning("%s did not drain in %.1fs; cancelling", type(self).__name__, self.drain_timeout)
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        self._fail_pending()
+
+    def _fail_pending(self):
+        pending = list(self._current or [])
+        self._current = None
+        while self._queue is not None and not self._queue.empty():
+            pending.append(self._queue.get_nowait())
+        if not pending:
+            return
+        self.cancelled += len(pending)
+        logger.error("%s cancelled %d unprocessed items", type(self).__name__, len(pending))
+        for _, future in pending:
+            if future is not None and not future.done():
+                future.set_exception(BatchCancelled(f"{type(self).__name__} stopped"))
+
+    def stats(self):
+        return {
+            "batches": self.batches,
+            self.item_label: self.items,
+            "avgBatchSize": self.items / self.batches if self.batches else 0.0,
+        }
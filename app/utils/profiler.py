@@ -0,0 +1,233 @@
+import os
+import sys
+import time
+import random
+import marshal
+import cProfile
+import logging
+import functools
+import itertools
+import threading
+import collections
+from contextlib import contextmanager
+from app.config import PROFILE_RATE, PROFILE_MODE, PROFILE_CAPACITY, PROFILE_INTERVAL
+
+logger = logging.getLogger(__name__)
+
+PROFILE_MODES = ("cprofile", "sample")
+
+# 대기 중인 스레드로 보고 표본에서 뺄 맨 위 프레임 (파일 이름, 함수 이름)
+_IDLE_FRAMES = {
+    ("threading.py", "wait"),
+    ("queue.py", "get"),
+    ("selectors.py", "select"),
+    ("thread.py", "_worker"),
+}
+
+
+class _CallProfile:
+    """요청을 처리하는 동안 현재 스레드의 함수 호출을 cProfile 로 기록"""
+
+    format = "pstats"
+
+    def __init__(self):
+        self._profile = cProfile.Profile()
+
+    def start(self):
+        self._profile.enable()
+
+    def stop(self):
+        self._profile.disable()
+
+    def dump(self):
+        # pstats.Stats.dump_stats() 와 같은 형식
+        self._profile.create_stats()
+        return marshal.dumps(self._profile.stats)
+
+
+class _StackSampler:
+    """요청을 처리하는 동안 모든 스레드의 호출 스택을 interval 간격으로 모아 collapsed stack 으로 기록"""
+
+    format = "collapsed"
+
+    def __init__(self, interval):
+        self.interval = interval
+        self.stacks = collections.Counter()
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="profile-sampler", daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stopped.set()
+        self._thread.join()
+
+    def _run(self):
+        own = threading.get_ident()
+        while not self._stopped.wait(self.interval):
+            self._sample(own)
+
+    def _sample(self, own):
+        names = {thread.ident: thread.name for thread in threading.enumerate()}
+        for ident, frame in sys._current_frames().items():
+            if ident == own:
+                continue
+            code = frame.f_code
+            if (os.path.basename(code.co_filename), code.co_name) in _IDLE_FRAMES:
+                continue
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                frame = frame.f_back
+            stack.append(names.get(ident, str(ident)))
+            self.stacks[";".join(reversed(stack))] += 1
+
+    def dump(self):
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.most_common()).encode()
+
+
+class RequestProfiler:
+    """처리 함수 호출 중 rate 비율을 골라 프로파일을 기록하고 최근 capacity 개를 보관
+
+    mode 가 cprofile 이면 이벤트 루프 스레드의 함수 호출을 기록해 pstats 파일로 내려받는다. 실행 풀
+    스레드에서 도는 계산(점수 계산, CSV 쓰기 등)은 잡히지 않는다. sample 이면 모든 스레드의 호출 스택을
+    interval 간격으로 모아 collapsed stack 파일(flamegraph 입력)로 내려받는다.
+
+    한 번에 한 호출만 기록하고 기록 중에 골라진 다른 호출은 건너뛴다. 기록하는 동안 같은 스레드에서
+    처리된 다른 요청도 함께 잡힌다. rate 가 0 이면 처리 함수마다 값 비교 한 번만 더 든다.
+    """
+
+    def __init__(self, rate=0.0, mode="cprofile", capacity=20, interval=0.005):
+        self.rate = 0.0
+        self.mode = "cprofile"
+        self.interval = interval
+        self.captured = 0
+        self.skipped = 0
+        self._profiles = collections.deque(maxlen=max(1, capacity))
+        self._ids = itertools.count(1)
+        self._active = False
+        self._lock = threading.Lock()
+        self.configure(rate=rate, mode=mode)
+
+    @property
+    def capacity(self):
+        return self._profiles.maxlen
+
+    def configure(self, rate=None, mode=None, capacity=None):
+        """설정 변경. 잘못된 값이면 ValueError"""
+        if rate is not None:
+            rate = float(rate)
+            if not 0.0 <= rate <= 1.0:
+                raise ValueError("rate must be between 0 and 1")
+        if mode is not None and mode not in PROFILE_MODES:
+            raise ValueError(f"mode must be one of {', '.join(PROFILE_MODES)}")
+        if capacity is not None and int(capacity) < 1:
+            raise ValueError("capacity must be at least 1")
+        with self._lock:
+            if mode is not None:
+                self.mode = mode
+            if capacity is not None:
+                self._profiles = collections.deque(self._profiles, maxlen=int(capacity))
+            if rate is not None:
+                self.rate = rate
+        logger.info("Profiling configured: rate=%s mode=%s capacity=%s", self.rate, self.mode, self.capacity)
+
+    def _claim(self):
+        if random.random() >= self.rate:
+            return False
+        with self._lock:
+            if self._active:
+                self.skipped += 1
+                return False
+            self._active = True
+            return True
+
+    @contextmanager
+    def capture(self, name):
+        """블록 실행을 골라 기록. 골라지지 않으면 그냥 실행"""
+        if not self._claim():
+            yield
+            return
+        recorder = _CallProfile() if self.mode == "cprofile" else _StackSampler(self.interval)
+        started_at = time.time()
+        started = time.perf_counter()
+        try:
+            recorder.start()
+        except Exception as e:
+            # 다른 프로파일러가 이미 켜져 있는 경우 등
+            logger.warning("Could not start profiler for %s: %s", name, e)
+            self._active = False
+            yield
+            return
+        try:
+            yield
+        finally:
+            recorder.stop()
+            elapsed = time.perf_counter() - started
+            try:
+                data = recorder.dump()
+            finally:
+                self._active = False
+            with self._lock:
+                self._profiles.append({
+                    "id": next(self._ids),
+                    "name": name,
+                    "format": recorder.format,
+                    "startedAt": started_at,
+                    "seconds": round(elapsed, 6),
+                    "size": len(data),
+                    "data": data,
+                })
+                self.captured += 1
+
+    def profiles(self):
+        """보관 중인 프로파일 목록 (내용 제외)"""
+        with self._lock:
+            return [{key: value for key, value in entry.items() if key != "data"} for entry in self._profiles]
+
+    def get(self, profile_id):
+        """프로파일 하나. 없으면 None"""
+        with self._lock:
+            for entry in self._profiles:
+                if entry["id"] == profile_id:
+                    return entry
+        return None
+
+    def clear(self):
+        with self._lock:
+            self._profiles.clear()
+
+    def stats(self):
+        return {
+            "rate": self.rate,
+            "mode": self.mode,
+            "capacity": self.capacity,
+            "stored": len(self._profiles),
+            "captured": self.captured,
+            "skipped": self.skipped,
+        }
+
+
+profiler = RequestProfiler(PROFILE_RATE, PROFILE_MODE, PROFILE_CAPACITY, PROFILE_INTERVAL)
+
+
+async def _profiled_call(name, func, args, kwargs):
+    with profiler.capture(name):
+        return await func(*args, **kwargs)
+
+
+def profiled(name):
+    """비동기 처리 함수를 프로파일링 대상으로 등록
+
+    꺼져 있으면 감싼 함수의 코루틴을 그대로 돌려줘 코루틴 프레임을 하나 더 만들지 않는다.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not profiler.rate:
+                return func(*args, **kwargs)
+            return _profiled_call(name, func, args, kwargs)
+        return wrapper
+    return decorator
@@ -0,0 +1,114 @@
+import asyncio
+import json
+import time
+import logging
+import aio_pika
+from aio_pika.pool import Pool
+from app.config import RABBITMQ_URL, RABBITMQ_CHANNEL_POOL_SIZE, RABBITMQ_PUBLISHER_CONFIRMS
+
+logger = logging.getLogger(__name__)
+
+
+class QueuePublisher:
+    """하나의 robust 연결과 채널 풀을 공유하는 응답 발행기
+
+    채널 풀 덕분에 여러 응답을 동시에(파이프라인으로) 발행할 수 있다.
+    publisher_confirms 가 켜져 있으면 publish() 도 브로커 확인까지 기다린다 (nack 이면 예외).
+    publish_batch() 는 실패한 응답을 골라 재시도하는 응답 대기열용이라 설정과 관계없이 확인 모드 채널을 쓴다.
+    """
+
+    def __init__(self, url, pool_size=8, publisher_confirms=False):
+        self.url = url
+        self.pool_size = pool_size
+        self.publisher_confirms = publisher_confirms
+        self._connection = None
+        self._channel_pool = None
+        self._confirm_pool = None
+        self._start_lock = asyncio.Lock()
+        self.published = 0
+        self.failed = 0
+        self.latency_total = 0.0
+        self.latency_max = 0.0
+
+    async def start(self):
+        async with self._start_lock:
+            if self._connection is not None:
+                return
+            self._connection = await aio_pika.connect_robust(self.url)
+            self._channel_pool = Pool(self._open_channel, self.publisher_confirms, max_size=self.pool_size)
+            if self.publisher_confirms:
+                self._confirm_pool = self._channel_pool
+            else:
+                self._confirm_pool = Pool(self._open_channel, True, max_size=self.pool_size)
+            logger.info("Publisher connected (channels=%d, confirms=%s)", self.pool_size, self.publisher_confirms)
+
+    async def _open_channel(self, publisher_confirms):
+        return await self._connection.channel(publisher_confirms=publisher_confirms)
+
+    async def close(self):
+        async with self._start_lock:
+            if self._confirm_pool is not None and self._confirm_pool is not self._channel_pool:
+                await self._confirm_pool.close()
+            self._confirm_pool = None
+            if self._channel_pool is not None:
+                await self._channel_pool.close()
+                self._channel_pool = None
+            if self._connection is not None:
+                await self._connection.close()
+                self._connection = None
+
+    @staticmethod
+    def _message(correlation_id, message):
+        return aio_pika.Message(body=json.dumps(message).encode(), correlation_id=correlation_id)
+
+    async def publish(self, routing_key, correlation_id, message):
+        """응답 메시지 발행. 실패하면 예외를 다시 올린다"""
+        started = time.perf_counter()
+        try:
+            if self._connection is None:
+                await self.start()
+            async with self._channel_pool.acquire() as channel:
+                await channel.default_exchange.publish(self._message(correlation_id, message), routing_key=routing_key)
+        except Exception:
+            self.failed += 1
+            raise
+        self._observe(1, time.perf_counter() - started)
+
+    async def publish_batch(self, replies):
+        """[(routing_key, correlation_id, message)] 를 확인 모드 채널 하나에서 한꺼번에 발행하고 확인을 기다림
+
+        응답별 오류 목록(성공이면 None)을 반환한다. 연결 자체에 실패하면 모든 응답이 같은 오류를 받는다.
+        """
+        started = time.perf_counter()
+        try:
+            if self._connection is None:
+                await self.start()
+            async with self._confirm_pool.acquire() as channel:
+                results = await asyncio.gather(*(
+                    channel.default_exchange.publish(self._message(correlation_id, message), routing_key=routing_key)
+                    for routing_key, correlation_id, message in replies
+                ), return_exceptions=True)
+        except Exception as e:
+            results = [e] * len(replies)
+        errors = [result if isinstance(result, BaseException) else None for result in results]
+        failed = sum(error is not None for error in errors)
+        self.failed += failed
+        if failed < len(errors):
+            self._observe(len(errors) - failed, time.perf_counter() - started)
+        return errors
+
+    def _observe(self, count, elapsed):
+        self.published += count
+        self.latency_total += elapsed * count
+        self.latency_max = max(self.latency_max, elapsed)
+
+    def stats(self):
+        return {
+            "published": self.published,
+            "failed": self.failed,
+            "latencyAvgMs": (self.latency_total / self.published * 1000) if self.published else 0.0,
+            "latencyMaxMs": self.latency_max * 1000,
+        }
+
+
+publisher = QueuePublisher(RABBITMQ_URL, RABBITMQ_CHANNEL_POOL_SIZE, RABBITMQ_PUBLISHER_CONFIRMS)
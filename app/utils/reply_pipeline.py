@@ -0,0 +1,103 @@
+import asyncio
+import time
+import logging
+from app.config import (
+    REPLY_BUFFER_SIZE, REPLY_BATCH_SIZE, REPLY_BATCH_WAIT_MS,
+    REPLY_PUBLISH_ATTEMPTS, REPLY_RETRY_MIN, REPLY_RETRY_MAX,
+)
+from app.utils.metrics import registry, Histogram, CallbackGauge
+from app.utils.microbatch import MicroBatcher
+from app.utils.publisher import publisher
+
+logger = logging.getLogger(__name__)
+
+# 한 배치를 발행(재시도 포함)하는 데 걸린 시간과 응답이 버퍼에 들어간 뒤 발행되기까지의 시간
+flush_seconds = registry.register(Histogram(
+    "comatching_reply_flush_seconds", "Time to publish one batch of replies, including retries",
+))
+reply_delay_seconds = registry.register(Histogram(
+    "comatching_reply_delay_seconds", "Time from enqueueing a reply to its confirmed publish",
+))
+
+
+class ReplyPipeline(MicroBatcher):
+    """응답 발행 대기열. 처리 함수는 응답을 버퍼에 넣기만 하고 발행 태스크가 모아서 보낸다
+
+    버퍼는 최대 buffer_size 개이고 가득 차면 넣는 쪽이 자리가 날 때까지 기다린다. 발행 태스크는 최대
+    max_batch_size 개 또는 첫 응답 이후 max_wait_ms 동안 들어온 응답을 publisher.publish_batch 로 한꺼번에
+    보낸다. publish_batch 는 확인 모드 채널을 쓰므로 브로커가 nack 하거나 확인 전에 채널이 닫힌 응답만
+    retry_min 부터 두 배씩(최대 retry_max) 기다렸다 다시 보내고, attempts 번 실패하면 기록만 남기고 버린다.
+
+    메시지 ack 는 응답을 버퍼에 넣은 뒤 나가므로 프로세스가 비정상 종료되면 버퍼의 응답은 사라진다.
+    stop() 은 버퍼에 남은 응답을 모두 발행(또는 포기)한 뒤 종료한다.
+    """
+
+    item_label = "replies"
+
+    def __init__(self, publisher, buffer_size=10000, max_batch_size=128, max_wait_ms=2,
+                 attempts=5, retry_min=0.1, retry_max=5):
+        super().__init__(max_batch_size, max_wait_ms, max(1, buffer_size))
+        self.publisher = publisher
+        self.attempts = max(1, attempts)
+        self.retry_min = retry_min
+        self.retry_max = retry_max
+        self.retries = 0
+        self.dropped = 0
+
+    async def put(self, routing_key, correlation_id, message):
+        """응답 하나를 버퍼에 넣음. 버퍼가 가득 차 있을 때만 기다린다"""
+        await super().put((routing_key, correlation_id, message, time.perf_counter()))
+
+    async def _flush(self, batch):
+        started = time.perf_counter()
+        pending = batch
+        delay = self.retry_min
+        for attempt in range(1, self.attempts + 1):
+            errors = await self.publisher.publish_batch([reply[:3] for reply in pending])
+            now = time.perf_counter()
+            failed = []
+            for reply, error in zip(pending, errors):
+                if error is None:
+                    reply_delay_seconds.observe(now - reply[3])
+                else:
+                    failed.append((reply, error))
+            if not failed:
+                break
+            if attempt == self.attempts:
+                self.dropped += len(failed)
+                logger.error("Dropping %d replies after %d attempts: %s", len(failed), attempt, failed[0][1])
+                break
+            self.retries += len(failed)
+            logger.warning("Failed to publish %d replies (attempt %d): %s; retrying in %.2fs",
+                           len(failed), attempt, failed[0][1], delay)
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, self.retry_max)
+            pending = [reply for reply, _ in failed]
+        flush_seconds.observe(time.perf_counter() - started)
+
+    async def process_batch(self, batch):
+        try:
+            await self._flush(batch)
+        except Exception:
+            logger.exception("Error publishing replies")
+            self.dropped += len(batch)
+        return [None] * len(batch)
+
+    def stats(self):
+        return {
+            "depth": self.depth(),
+            "capacity": self.buffer_size,
+            **super().stats(),
+            "retries": self.retries,
+            "dropped": self.dropped,
+        }
+
+
+reply_pipeline = ReplyPipeline(
+    publisher, REPLY_BUFFER_SIZE, REPLY_BATCH_SIZE, REPLY_BATCH_WAIT_MS,
+    REPLY_PUBLISH_ATTEMPTS, REPLY_RETRY_MIN, REPLY_RETRY_MAX,
+)
+registry.register(CallbackGauge(
+    "comatching_reply_buffer_depth", "Replies waiting in the in-process publish buffer", (),
+    lambda: {(): reply_pipeline.depth()},
+))
@@ -0,0 +1,79 @@
+import asyncio
+import contextvars
+from contextlib import contextmanager
+from app.config import REPLY_STORE_SIZE, REPLY_STORE_TTL
+from app.utils.cache import LRUCache
+from app.utils.metrics import registry, CallbackCounter
+
+# 처리 중인 큐 메시지의 [키, 보낸 응답]
+_current = contextvars.ContextVar("comatching_reply_record", default=None)
+
+
+class ReplyStore:
+    """최근 처리한 큐 메시지의 응답을 (큐 이름, correlation_id) 로 보관
+
+    브로커 재연결로 ack 전의 메시지가 다시 전달되면(redelivered) 매칭/분류/CRUD 를 다시 실행하지 않고
+    보관한 응답을 다시 발행한다. 원래 메시지가 아직 처리 중이면 끝날 때까지 기다렸다가 그 응답을 쓴다.
+    """
+
+    def __init__(self, capacity=10000, ttl=300):
+        self.cache = LRUCache(capacity, ttl)
+        self._pending = {}
+        self.replays = 0
+        self.misses = 0
+
+    @contextmanager
+    def recording(self, key):
+        """블록 안에서 send_to_queue 로 보낸 응답을 key 로 보관"""
+        if key is None:
+            yield
+            return
+        future = asyncio.get_running_loop().create_future()
+        self._pending[key] = future
+        record = [key, None]
+        token = _current.set(record)
+        try:
+            yield
+        finally:
+            _current.reset(token)
+            if self._pending.get(key) is future:
+                del self._pending[key]
+            if record[1] is not None:
+                self.cache.put(key, record[1])
+            future.set_result(record[1])
+
+    def record(self, message):
+        """현재 처리 중인 큐 메시지의 응답으로 기록 (보낸 뒤 서비스가 바꿔도 영향 없도록 복사)"""
+        record = _current.get()
+        if record is not None:
+            record[1] = dict(message)
+
+    async def replay(self, key):
+        """재전달된 메시지에 다시 보낼 응답. 처리 중이면 끝날 때까지 기다리고, 없으면 None"""
+        if key is None:
+            return None
+        future = self._pending.get(key)
+        reply = await asyncio.shield(future) if future is not None else self.cache.get(key)
+        if reply is None:
+            self.misses += 1
+        else:
+            self.replays += 1
+        return reply
+
+    def stats(self):
+        return dict(self.cache.stats(), replays=self.replays, replayMisses=self.misses, pending=len(self._pending))
+
+    def events(self):
+        return {
+            ("replay",): self.replays,
+            ("miss",): self.misses,
+            ("eviction",): self.cache.evictions,
+            ("expiration",): self.cache.expirations,
+        }
+
+
+reply_store = ReplyStore(REPLY_STORE_SIZE, REPLY_STORE_TTL)
+registry.register(CallbackCounter(
+    "comatching_reply_store_events_total", "Redelivered messages answered from stored replies, and store evictions",
+    ("event",), reply_store.events,
+))
@@ -0,0 +1,58 @@
+import time
+import asyncio
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class StartupTracker:
+    """시작 단계별 상태와 소요 시간, 준비 여부
+
+    preload() 의 단계들은 동시에 실행하고 각각 걸린 시간을 기록한다. required 단계가 모두 끝나고
+    mark_ready() 를 부르면 준비 상태가 된다. 실패한 단계는 오류만 기록하고 서비스는 계속 띄운다
+    (사용자 저장소 같은 모듈은 첫 요청에서 다시 적재를 시도한다).
+    """
+
+    def __init__(self):
+        self.steps = {}
+        self.ready = False
+        self.consumers = []
+
+    async def step(self, name, awaitable, required=True):
+        self.steps[name] = {"state": "running", "required": required}
+        started = time.perf_counter()
+        try:
+            result = await awaitable
+        except Exception as e:
+            elapsed = time.perf_counter() - started
+            self.steps[name] = {"state": "failed", "required": required, "seconds": round(elapsed, 4), "error": str(e)}
+            logger.warning("Startup step '%s' failed after %.3fs: %s", name, elapsed, e)
+            return None
+        elapsed = time.perf_counter() - started
+        self.steps[name] = {"state": "done", "required": required, "seconds": round(elapsed, 4)}
+        logger.info("Startup step '%s' done in %.3fs", name, elapsed)
+        return result
+
+    async def preload(self, steps, optional=()):
+        """{단계 이름: awaitable} 을 동시에 실행. optional 에 있는 단계는 실패해도 준비 상태에 영향 없음"""
+        started = time.perf_counter()
+        await asyncio.gather(*(self.step(name, awaitable, name not in optional) for name, awaitable in steps.items()))
+        logger.info("Preload finished in %.3fs", time.perf_counter() - started)
+
+    def mark_ready(self, consumers=()):
+        """준비 상태 판단에 쓸 소비자를 등록하고, 필수 단계가 모두 끝났으면 준비 상태로"""
+        self.consumers = list(consumers)
+        self.ready = all(step["state"] == "done" for step in self.steps.values() if step["required"])
+        if not self.ready:
+            logger.warning("Service started without required preload steps; not ready")
+
+    def status(self):
+        consumers = {consumer.queue_name: consumer.stats() for consumer in self.consumers}
+        return {
+            "ready": self.ready and all(consumer["connected"] for consumer in consumers.values()),
+            "steps": self.steps,
+            "consumers": consumers,
+        }
+
+
+startup = StartupTracker()
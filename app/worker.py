@@ -0,0 +1,69 @@
+"""매칭/분류 전용 읽기 워커 프로세스 (SERVING_ROLE=reader)
+
+사용자 CSV 와 변경 로그는 열지 않고, 쓰기 프로세스가 발행한 특성 스냅샷만 memmap 으로 읽는다.
+보통 app.serve 가 여러 개 띄우며, 직접 실행할 수도 있다:
+
+    SERVING_ROLE=reader python -m app.worker
+"""
+import signal
+import asyncio
+import logging
+from app.config import LOG_LEVEL
+from app.consumers import match_consumer, classifier_consumer
+from app.engine.batcher import match_batcher
+from app.engine.classifier import hobby_classifier
+from app.engine.hobby_vectors import hobby_vectors
+from app.engine.shards import shard_pool
+from app.engine.shared_snapshot import snapshot_subscriber
+from app.utils.publisher import publisher
+from app.utils.reply_pipeline import reply_pipeline
+from app.utils.executors import io_executor, shutdown_executors
+from app.utils.startup import startup
+
+logger = logging.getLogger(__name__)
+
+
+async def serve():
+    stopping = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(signum, stopping.set)
+
+    # 첫 스냅샷, 분류기, 응답 발행 연결을 동시에 준비한 뒤 소비 시작
+    await startup.preload({
+        "snapshot": snapshot_subscriber.wait_ready(),
+        "classifier": io_executor.run(hobby_classifier.warm_up),
+        "hobbyVectors": io_executor.run(hobby_vectors.load),
+        "publisher": publisher.start(),
+    }, optional=("classifier", "hobbyVectors", "publisher"))
+    await snapshot_subscriber.start()
+
+    tasks = [
+        asyncio.create_task(match_consumer.consume_from_match_queue()),
+        asyncio.create_task(classifier_consumer.consume_from_classifier_queue()),
+    ]
+    startup.mark_ready([match_consumer.consumer, classifier_consumer.consumer])
+    logger.info("Reader worker started (snapshot %s)", snapshot_subscriber.current)
+    await stopping.wait()
+
+    # 새 메시지 수신을 멈추고 처리 중인 메시지를 마무리한 뒤 종료
+    await asyncio.gather(match_consumer.consumer.stop(), classifier_consumer.consumer.stop())
+    await asyncio.gather(*tasks, return_exceptions=True)
+    await match_batcher.stop()
+    await snapshot_subscriber.stop()
+    shard_pool.close()
+    # 버퍼에 남은 응답을 모두 발행한 뒤 연결 종료
+    await reply_pipeline.stop()
+    await publisher.close()
+    hobby_classifier.save_cache()
+    hobby_vectors.save()
+    shutdown_executors()
+
+
+def main():
+    logging.basicConfig(level=LOG_LEVEL, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    asyncio.run(serve())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,7 @@
+"""오프라인 성능 측정 도구
+
+- generator: 사용자 CSV(헤더 2행 포함) 생성
+- broker: RabbitMQ 없이 컨슈머/발행기를 구동하는 메모리 브로커
+- run: /recommend, /classify, /users CRUD 시나리오 실행 후 처리량과 p50/p95/p99 지연을 JSON 으로 출력
+- compare: 두 결과 JSON 비교
+"""
@@ -0,0 +1,168 @@
+"""aio_pika 대신 쓰는 메모리 브로커
+
+install() 후에는 컨슈머와 응답 발행기의 aio_pika.connect_robust 가 이 브로커에 연결된다.
+request() 는 요청 큐에 메시지를 넣고 같은 correlation_id 의 응답이 발행될 때까지 기다린다.
+nack_next 를 n 으로 두면 다음 n 개의 응답 발행을 브로커가 거부한 것처럼 처리한다 (확인 모드 채널이면
+DeliveryError, 아니면 오류 없이 사라짐).
+"""
+import asyncio
+import itertools
+import json
+from types import SimpleNamespace
+import aio_pika
+from aio_pika.exceptions import DeliveryError
+from pamqp.commands import Basic
+
+
+class InMemoryMessage:
+    def __init__(self, body, reply_to, correlation_id, redelivered=False):
+        self.body = body
+        self.properties = SimpleNamespace(reply_to=reply_to, correlation_id=correlation_id)
+        self.redelivered = redelivered
+        self.acked = False
+
+    async def ack(self):
+        self.acked = True
+
+
+class InMemoryQueueIterator:
+    def __init__(self, queue):
+        self._queue = queue
+        self._closed = asyncio.Event()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        if self._closed.is_set():
+            raise StopAsyncIteration
+        get = asyncio.ensure_future(self._queue.get())
+        closed = asyncio.ensure_future(self._closed.wait())
+        await asyncio.wait({get, closed}, return_when=asyncio.FIRST_COMPLETED)
+        closed.cancel()
+        if get.done():
+            return get.result()
+        get.cancel()
+        raise StopAsyncIteration
+
+    async def close(self):
+        self._closed.set()
+
+
+class InMemoryQueue:
+    def __init__(self, queue):
+        self._queue = queue
+
+    def iterator(self):
+        return InMemoryQueueIterator(self._queue)
+
+    async def declare(self, **kwargs):
+        return SimpleNamespace(message_count=self._queue.qsize())
+
+
+class InMemoryExchange:
+    def __init__(self, broker, publisher_confirms=False):
+        self._broker = broker
+        self._publisher_confirms = publisher_confirms
+
+    async def publish(self, message, routing_key):
+        if self._broker.nack_next > 0:
+            self._broker.nack_next -= 1
+            self._broker.nacked += 1
+            if self._publisher_confirms:
+                raise DeliveryError(None, Basic.Nack(delivery_tag=self._broker.nacked))
+            return None
+        self._broker.deliver_reply(routing_key, message.correlation_id, message.body)
+
+
+class InMemoryChannel:
+    def __init__(self, broker, publisher_confirms=False):
+        self._broker = broker
+        self.publisher_confirms = publisher_confirms
+        self.default_exchange = InMemoryExchange(broker, publisher_confirms)
+        self.is_closed = False
+
+    async def set_qos(self, prefetch_count=None, **kwargs):
+        pass
+
+    async def declare_queue(self, name, durable=False, **kwargs):
+        return InMemoryQueue(self._broker.queue(name))
+
+    async def close(self):
+        self.is_closed = True
+
+
+class InMemoryConnection:
+    def __init__(self, broker):
+        self._broker = broker
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    async def channel(self, publisher_confirms=False, **kwargs):
+        return InMemoryChannel(self._broker, publisher_confirms)
+
+    async def close(self):
+        pass
+
+
+class InMemoryBroker:
+    """요청 큐와 응답 대기를 메모리에 두는 브로커"""
+
+    def __init__(self, reply_to="bench-reply"):
+        self.reply_to = reply_to
+        self._queues = {}
+        self._waiters = {}
+        self._ids = itertools.count()
+        self.published = 0
+        self.unmatched = 0
+        self.nack_next = 0
+        self.nacked = 0
+
+    def queue(self, name):
+        if name not in self._queues:
+            self._queues[name] = asyncio.Queue()
+        return self._queues[name]
+
+    async def connect_robust(self, url=None, **kwargs):
+        return InMemoryConnection(self)
+
+    def deliver_reply(self, routing_key, correlation_id, body):
+        self.published += 1
+        waiter = self._waiters.pop(correlation_id, None)
+        if waiter is None or waiter.done():
+            self.unmatched += 1
+            return
+        waiter.set_result(json.loads(body))
+
+    async def request(self, queue_name, payload, timeout=30, correlation_id=None, redelivered=False):
+        """payload 를 queue_name 에 넣고 응답 본문(dict)을 기다림. correlation_id 를 주면 재전달처럼 보낼 수 있음"""
+        correlation_id = correlation_id or f"bench-{next(self._ids)}"
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters[correlation_id] = waiter
+        body = json.dumps(payload, ensure_ascii=False).encode()
+        self.queue(queue_name).put_nowait(InMemoryMessage(body, self.reply_to, correlation_id, redelivered))
+        try:
+            return await asyncio.wait_for(waiter, timeout)
+        finally:
+            self._waiters.pop(correlation_id, None)
+
+
+def install(broker):
+    """aio_pika.connect_robust 를 브로커로 교체. 되돌리는 함수를 반환"""
+    original = aio_pika.connect_robust
+    aio_pika.connect_robust = broker.connect_robust
+
+    def uninstall():
+        aio_pika.connect_robust = original
+
+    return uninstall
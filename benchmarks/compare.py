@@ -0,0 +1,46 @@
+"""두 벤치마크 결과 비교
+
+    python -m benchmarks.compare before.json after.json
+"""
+import json
+import sys
+
+METRICS = [("throughputRps", None), ("p50", "latencyMs"), ("p95", "latencyMs"), ("p99", "latencyMs")]
+
+
+def _value(scenario, metric, group):
+    return scenario[group][metric] if group else scenario[metric]
+
+
+def compare(before, after):
+    """시나리오별 (지표, 이전, 이후, 변화율%) 목록"""
+    previous = {scenario["scenario"]: scenario for scenario in before["scenarios"]}
+    rows = []
+    for scenario in after["scenarios"]:
+        old = previous.get(scenario["scenario"])
+        if old is None:
+            continue
+        for metric, group in METRICS:
+            a, b = _value(old, metric, group), _value(scenario, metric, group)
+            change = (b - a) / a * 100 if a else 0.0
+            rows.append((scenario["scenario"], metric, a, b, change))
+    return rows
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if len(argv) != 2:
+        print("usage: python -m benchmarks.compare <before.json> <after.json>")
+        return 2
+    with open(argv[0], encoding="utf-8") as file:
+        before = json.load(file)
+    with open(argv[1], encoding="utf-8") as file:
+        after = json.load(file)
+    print(f"{'scenario':<10} {'metric':<14} {before.get('commit') or 'before':>12} {after.get('commit') or 'after':>12} {'change':>9}")
+    for scenario, metric, a, b, change in compare(before, after):
+        print(f"{scenario:<10} {metric:<14} {a:>12.2f} {b:>12.2f} {change:>8.1f}%")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
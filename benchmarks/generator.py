@@ -0,0 +1,64 @@
+"""합성 사용자 테이블 생성
+
+    python -m benchmarks.generator users.csv 100000 --seed 1
+"""
+import argparse
+import random
+from app.storage.snapshot import write_csv_table
+
+# 스냅샷 CSV 의 헤더 2행 (매칭 요청 옵션 이름과 값 자리)
+MATCH_HEADER = [
+    "matcherUuid", "contactFrequencyOption", "genderOption", "hobbyOption", "sameMajorOption", "ageOption",
+    "mbtiOption", "duplicationList", "myMajor", "myAge", "mbtiWeight", "ageWeight", "hobbyWeight",
+    "contactFrequencyWeight",
+]
+USER_COLUMNS = ["uuid", "age", "contactFrequency", "gender", "hobby", "major", "mbti", "duplication", ""]
+
+HOBBIES = [
+    "축구", "농구", "야구", "테니스", "수영", "등산", "요가", "헬스", "독서", "글쓰기", "영화", "드라마",
+    "음악감상", "노래", "기타", "피아노", "게임", "보드게임", "요리", "베이킹", "카페", "여행", "사진", "그림",
+]
+MAJORS = ["컴퓨터공학", "전자공학", "기계공학", "경영학", "경제학", "심리학", "국어국문학", "영어영문학", "수학", "물리학", "화학", "디자인"]
+CONTACT_FREQUENCIES = ["FREQUENT", "NORMAL", "RARE"]
+GENDERS = ["MALE", "FEMALE"]
+
+
+def user_uuid(i):
+    return f"bench-{i:07d}"
+
+
+def generate_user(rng, i):
+    return [
+        user_uuid(i),
+        str(rng.randint(19, 29)),
+        rng.choice(CONTACT_FREQUENCIES),
+        rng.choice(GENDERS),
+        ",".join(rng.sample(HOBBIES, rng.randint(1, 4))),
+        rng.choice(MAJORS),
+        "".join(rng.choice(pair) for pair in ("EI", "SN", "TF", "JP")),
+        "FALSE",
+        "",
+    ]
+
+
+def generate_users(csv_path, count, seed=0):
+    """count 명의 사용자 CSV 생성 (같은 seed 면 같은 내용)"""
+    rng = random.Random(seed)
+    header_rows = [MATCH_HEADER, [""] * len(MATCH_HEADER)]
+    rows = (generate_user(rng, i) for i in range(count))
+    write_csv_table(csv_path, header_rows, USER_COLUMNS, rows)
+    return csv_path
+
+
+def main():
+    parser = argparse.ArgumentParser(description="합성 사용자 CSV 생성")
+    parser.add_argument("path")
+    parser.add_argument("count", type=int)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    generate_users(args.path, args.count, args.seed)
+    print(f"{args.count} users written to {args.path}")
+
+
+if __name__ == "__main__":
+    main()
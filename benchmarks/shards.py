@@ -0,0 +1,127 @@
+"""샤드 분산 점수 계산 벤치마크
+
+    python -m benchmarks.shards --users 500000 --shards 1 2 4 8 --batches 40
+
+합성 사용자로 특성 스냅샷을 한 번 발행한 뒤, 같은 매칭 배치들을 샤드 수별로 점수 계산해 배치 처리량과
+지연 분위수, 샤드 1개(한 프로세스) 대비 속도 향상을 JSON 으로 출력한다. 결과 순위가 한 프로세스
+계산과 다른 요청 수(mismatches)도 함께 기록한다.
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+import numpy as np
+from benchmarks.generator import generate_users
+from benchmarks.run import _configure_environment, recommend_payload, _git_commit
+
+
+def _time_batches(engine, batches, depth):
+    latencies, results = [], []
+    for queries in batches:
+        started = time.perf_counter()
+        results.append(engine.rank_batch(queries, depth))
+        latencies.append(time.perf_counter() - started)
+    return latencies, results
+
+
+def _ranking(results):
+    return [[(item.uuid, round(item.score, 5)) for item in ranked] for batch in results for ranked in batch]
+
+
+def run(args, workdir):
+    csv_path = os.path.join(workdir, "users.csv")
+    generate_users(csv_path, args.users, args.seed)
+    _configure_environment(workdir, csv_path)
+    os.environ["SHARED_SNAPSHOT_DIR"] = os.path.join(workdir, "shared")
+
+    # 환경 변수를 맞춘 뒤에 불러와야 벤치마크 경로를 사용
+    from app.engine.feature_store import feature_store
+    from app.engine.query import MatchQuery
+    from app.engine.recommender import RecommendationEngine, engine
+    from app.engine.shards import ShardPool
+    from app.engine.shared_snapshot import snapshot_publisher, open_feature_snapshot, read_pointer
+
+    engine.load()
+    snapshot_publisher.publish()
+    path = os.path.join(snapshot_publisher.directory, read_pointer(snapshot_publisher.directory)["file"])
+    store, index = open_feature_snapshot(path)
+
+    rng = random.Random(args.seed)
+    batches = [
+        [MatchQuery.from_request(recommend_payload(rng, args.users)) for _ in range(args.batch_size)]
+        for _ in range(args.batches)
+    ]
+
+    report = {
+        "meta": {
+            "users": args.users,
+            "batches": args.batches,
+            "batchSize": args.batch_size,
+            "depth": args.depth,
+            "cpus": os.cpu_count(),
+            "commit": _git_commit(),
+        },
+        "shards": {},
+    }
+    baseline, expected = None, None
+    for shards in args.shards:
+        pool = ShardPool(shards)
+        sharded = RecommendationEngine(None, store, index, pool, engine.hobby_vectors)
+        try:
+            # 샤드 프로세스 기동과 샤드 행 적재는 측정에서 제외
+            _time_batches(sharded, batches[:1], args.depth)
+            started = time.perf_counter()
+            latencies, results = _time_batches(sharded, batches, args.depth)
+            elapsed = time.perf_counter() - started
+        finally:
+            pool.close()
+
+        ranking = _ranking(results)
+        if expected is None:
+            expected = ranking
+        throughput = len(batches) * args.batch_size / elapsed
+        baseline = baseline or throughput
+        latencies_ms = np.array(latencies) * 1000
+        report["shards"][str(shards)] = {
+            "requestsPerSec": throughput,
+            "batchP50Ms": float(np.percentile(latencies_ms, 50)),
+            "batchP95Ms": float(np.percentile(latencies_ms, 95)),
+            "speedup": throughput / baseline,
+            "mismatches": sum(a != b for a, b in zip(ranking, expected)),
+        }
+    return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="샤드 분산 점수 계산 벤치마크")
+    parser.add_argument("--users", type=int, default=200000, help="합성 사용자 수")
+    parser.add_argument("--shards", type=int, nargs="+", default=[1, 2, 4], help="비교할 샤드 수 (1 은 한 프로세스)")
+    parser.add_argument("--batches", type=int, default=30, help="측정할 배치 수")
+    parser.add_argument("--batch-size", type=int, default=32, help="배치당 매칭 요청 수")
+    parser.add_argument("--depth", type=int, default=20, help="요청마다 계산할 순위 수")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workdir", help="CSV/스냅샷을 둘 디렉터리 (기본: 임시 디렉터리)")
+    parser.add_argument("--output", help="결과 JSON 경로 (기본: 표준 출력)")
+    args = parser.parse_args(argv)
+
+    if args.workdir:
+        os.makedirs(args.workdir, exist_ok=True)
+        report = run(args, args.workdir)
+    else:
+        with tempfile.TemporaryDirectory() as workdir:
+            report = run(args, workdir)
+
+    output = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.output:
+        with open(args.output, mode="w", encoding="utf-8") as file:
+            file.write(output + "\n")
+    else:
+        print(output)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,12 @@
+"""벤치마크용 결정적 분류 모듈 (CLASSIFIER_MODE=module 로 적재)"""
+import time
+
+BIG_CATEGORIES = ["스포츠", "문화", "예술", "음악", "생활", "여행"]
+
+# 실제 모델 호출 비용 대신 쓰는 지연(초)
+LATENCY = 0.002
+
+
+def classify(small_categories):
+    time.sleep(LATENCY)
+    return [BIG_CATEGORIES[sum(map(ord, str(category))) % len(BIG_CATEGORIES)] for category in small_categories]
@@ -0,0 +1,74 @@
+import asyncio
+import time
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from app.consumers import match_consumer
+from app.consumers.admission import AdmissionController
+from app.consumers.base import QueueConsumer
+from app.utils.deadline import message_deadline, deadline_scope, expired, remaining
+from tests.test_consumer import _Message, _deliver
+
+
+def _consumer(calls, max_backlog=0):
+    async def handler(data):
+        calls.append((data["props"]["correlation_id"], remaining()))
+
+    admission = AdmissionController(
+        "match", match_consumer.admission.timeout_reply, match_consumer.admission.overload_reply, max_backlog,
+    )
+    return QueueConsumer("admission-test", handler, concurrency=4, admission=admission)
+
+
+def test_expired_deadline_replies_mtch_007_without_processing(replies):
+    acks, calls = [], []
+    consumer = _consumer(calls)
+    now_ms = time.time() * 1000
+    messages = [
+        _Message(acks, {"deadline": now_ms - 1000}, "late"),
+        _Message(acks, {"deadline": now_ms + 60000}, "on-time"),
+    ]
+    asyncio.run(_deliver(consumer, messages))
+
+    assert replies.sent == [("late", {"stateCode": "MTCH-007", "message": "Request timed out"})]
+    assert [correlation_id for correlation_id, _ in calls] == ["on-time"]
+    # 처리 함수 안에서는 메시지의 마감까지 남은 시간이 보임
+    assert 0 < calls[0][1] <= 60
+    assert acks == ["late", "on-time"]
+    assert consumer.admission.stats()["rejected"]["expired"] == 1
+
+
+def test_backlog_over_threshold_is_rejected(replies):
+    acks, calls = [], []
+    consumer = _consumer(calls, max_backlog=5)
+    consumer.queued = 5
+    asyncio.run(_deliver(consumer, [_Message(acks, {}, "busy")]))
+    # 대기 5 + 처리 중 1 이 임계값을 넘음
+    assert replies.sent == [("busy", {"stateCode": "MTCH-008", "message": "Server overloaded"})]
+    assert calls == []
+
+    consumer.queued = 4
+    asyncio.run(_deliver(consumer, [_Message(acks, {}, "fits")]))
+    assert [correlation_id for correlation_id, _ in calls] == ["fits"]
+    assert consumer.admission.stats()["rejected"]["backlog"] == 1
+    assert consumer.admission.stats()["admitted"] == 1
+
+
+def test_message_deadline_uses_earliest_source():
+    published = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    start = published.timestamp()
+    message = SimpleNamespace(timestamp=published, expiration=5, headers={"x-deadline": (start + 3) * 1000})
+    assert message_deadline(message, {"deadline": (start + 4) * 1000}, start + 1) == start + 3
+    assert message_deadline(message, {"deadline": (start + 2) * 1000}, start + 1) == start + 2
+
+    bare = SimpleNamespace()
+    assert message_deadline(bare, {}, start, default_timeout=10) == start + 10
+    assert message_deadline(bare, {}, start) is None
+
+
+def test_deadline_scope():
+    assert remaining() is None and not expired()
+    with deadline_scope(time.time() - 1):
+        assert expired()
+    with deadline_scope(time.time() + 30):
+        assert not expired()
+    assert remaining() is None
@@ -0,0 +1,73 @@
+import random
+import numpy as np
+from app.engine.query import MatchQuery
+from tests.conftest import USER_COLUMNS, build_engine, match_request
+from tests.test_recommender import _reference_candidate
+
+GENDERS = ["male", "female", "FEMALE", ""]
+MAJORS = ["컴퓨터", "경영", "수학", " 컴퓨터 "]
+AGES = ["19", "22.5", "23", "24", "30", "", "모름"]
+
+
+def _random_user(rng, uuid):
+    return {
+        "uuid": uuid, "age": rng.choice(AGES), "contactFrequency": "보통", "gender": rng.choice(GENDERS),
+        "hobby": "축구", "major": rng.choice(MAJORS), "mbti": "INTP", "duplication": "FALSE",
+    }
+
+
+def _row(user):
+    return [user.get(column, "") for column in USER_COLUMNS]
+
+
+QUERIES = [
+    match_request(),
+    match_request(genderOption="female", sameMajorOption=False),
+    match_request(genderOption="MALE", ageOption="OLDER", myAge=22),
+    match_request(ageOption="YOUNGER", myAge=24, myMajor="경영", sameMajorOption=False),
+    match_request(ageOption="EQUAL", myAge=23, duplicationList=["u1", "u7", "missing"]),
+]
+
+
+def _assert_matches_brute_force(repository, engine):
+    features = engine.features
+    uuids = engine.index.slot_uuids()
+    for request in QUERIES:
+        query = MatchQuery.from_request(request)
+        mask = engine.candidate_mask(query, features)
+        expected = np.array([
+            uuid is not None and _reference_candidate(query, [
+                str(value).strip() for value in _row(repository.get(uuid))
+            ])
+            for uuid in uuids
+        ], dtype=bool)
+        np.testing.assert_array_equal(mask, expected, err_msg=str(request))
+        assert sorted(features.uuids[mask]) == sorted(
+            row[0] for row in repository.rows() if _reference_candidate(query, [value.strip() for value in row])
+        )
+
+
+def test_incremental_index_matches_brute_force_filter(tmp_path):
+    rng = random.Random(7)
+    initial = [_row(_random_user(rng, f"u{i}")) for i in range(20)]
+    repository, engine = build_engine(str(tmp_path / "users.csv"), initial)
+    _assert_matches_brute_force(repository, engine)
+
+    next_id = len(initial)
+    for step in range(200):
+        uuids = [row[0] for row in repository.rows()]
+        action = rng.random()
+        if action < 0.4 or not uuids:
+            repository.create(_random_user(rng, f"u{next_id}"))
+            next_id += 1
+        elif action < 0.75:
+            repository.update(_random_user(rng, rng.choice(uuids)))
+        else:
+            repository.delete(rng.choice(uuids))
+        if step % 20 == 0:
+            _assert_matches_brute_force(repository, engine)
+    _assert_matches_brute_force(repository, engine)
+
+    # 압축으로 슬롯이 바뀐 뒤에도 같은 후보
+    engine.store.compact()
+    _assert_matches_brute_force(repository, engine)
@@ -0,0 +1,54 @@
+import json
+import os
+import threading
+from app.engine import classifier as module
+from app.engine.classifier import HobbyClassifier
+
+
+class _EchoBackend:
+    def classify(self, uuid, small_categories, timeout=None):
+        return [f"big-{small}" for small in small_categories]
+
+
+def test_cache_saves_in_background_once_per_interval(tmp_path, monkeypatch):
+    path = str(tmp_path / "classifier.json")
+    submitted = []
+    monkeypatch.setattr(module, "CACHE_SAVE_INTERVAL", 2)
+    monkeypatch.setattr(module.io_executor, "submit", lambda fn, *args: submitted.append(fn))
+    classifier = HobbyClassifier(None, cache_path=path)
+    classifier._backend = _EchoBackend()
+
+    assert classifier.classify("u1", ["축구", "독서"]) == ["big-축구", "big-독서"]
+    classifier.classify("u2", ["요리", "등산"])
+    # 요청 스레드에서는 저장하지 않고 한 번만 예약
+    assert not os.path.exists(path)
+    assert len(submitted) == 1
+
+    submitted[0]()
+    with open(path, encoding="utf-8") as file:
+        assert len(json.load(file)) == 4
+    assert classifier._unsaved == 0
+
+
+def test_concurrent_classify_keeps_every_entry(tmp_path, monkeypatch):
+    path = str(tmp_path / "classifier.json")
+    monkeypatch.setattr(module, "CACHE_SAVE_INTERVAL", 3)
+    classifier = HobbyClassifier(None, cache_path=path)
+    classifier._backend = _EchoBackend()
+
+    def worker(n):
+        for i in range(50):
+            classifier.classify(f"u{n}", [f"hobby-{n}-{i}"])
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    classifier.save_cache()
+
+    with open(path, encoding="utf-8") as file:
+        saved = json.load(file)
+    assert len(saved) == 400
+    assert classifier._unsaved == 0
+    assert not [name for name in os.listdir(tmp_path) if name.endswith(".tmp")]
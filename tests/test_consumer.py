@@ -0,0 +1,106 @@
+import asyncio
+import json
+import time
+from benchmarks.broker import InMemoryMessage
+from app.consumers.base import QueueConsumer
+from app.utils import helpers
+
+
+class _Message(InMemoryMessage):
+    def __init__(self, acks, payload, correlation_id, redelivered=False):
+        super().__init__(json.dumps(payload).encode(), "reply", correlation_id, redelivered)
+        self._acks = acks
+
+    async def ack(self):
+        self._acks.append(self.properties.correlation_id)
+        await super().ack()
+
+
+async def _deliver(consumer, messages):
+    """run() 처럼 동시 처리 수만큼 태스크를 띄워 메시지를 처리"""
+    semaphore = asyncio.Semaphore(consumer.concurrency)
+    previous = None
+    tasks = []
+    for message in messages:
+        await semaphore.acquire()
+        previous = asyncio.create_task(consumer._process(message, time.perf_counter(), previous, semaphore))
+        consumer._in_flight.add(previous)
+        previous.add_done_callback(consumer._in_flight.discard)
+        tasks.append(previous)
+    await asyncio.gather(*tasks)
+
+
+def test_acks_follow_delivery_order_when_handlers_finish_out_of_order(replies):
+    acks, finished = [], []
+
+    async def handler(data):
+        # 뒤에 온 메시지일수록 먼저 끝남
+        await asyncio.sleep(0.01 * (5 - data["n"]))
+        finished.append(data["props"]["correlation_id"])
+        await helpers.send_to_queue(None, data["props"], {"stateCode": "OK", "n": data["n"]})
+
+    consumer = QueueConsumer("order-test", handler, concurrency=5)
+    messages = [_Message(acks, {"n": n}, f"c{n}") for n in range(5)]
+    asyncio.run(_deliver(consumer, messages))
+
+    assert finished == ["c4", "c3", "c2", "c1", "c0"]
+    assert acks == ["c0", "c1", "c2", "c3", "c4"]
+    assert all(message.acked for message in messages)
+    # 응답은 ack 를 기다리지 않고 처리가 끝나는 대로 나감
+    assert [correlation_id for correlation_id, _ in replies.sent] == finished
+
+
+def test_failed_handler_still_acks_in_order(replies):
+    acks = []
+
+    async def handler(data):
+        await asyncio.sleep(0.01 * (3 - data["n"]))
+        if data["n"] == 1:
+            raise RuntimeError("boom")
+
+    consumer = QueueConsumer("order-test", handler, concurrency=3)
+    asyncio.run(_deliver(consumer, [_Message(acks, {"n": n}, f"e{n}") for n in range(3)]))
+    assert acks == ["e0", "e1", "e2"]
+
+
+def test_redelivered_message_replays_stored_reply(replies):
+    acks, calls = [], []
+    started, release = None, None
+
+    async def handler(data):
+        calls.append(data["props"]["correlation_id"])
+        if data.get("slow"):
+            started.set()
+            await release.wait()
+        await helpers.send_to_queue(None, data["props"], {"stateCode": "MTCH-000", "n": len(calls)})
+
+    consumer = QueueConsumer("replay-test", handler)
+
+    async def scenario():
+        nonlocal started, release
+        await _deliver(consumer, [_Message(acks, {}, "r1")])
+        await _deliver(consumer, [_Message(acks, {}, "r1", redelivered=True)])
+
+        # 원래 메시지가 아직 처리 중이면 끝난 뒤 그 응답을 다시 보냄
+        started, release = asyncio.Event(), asyncio.Event()
+        original = asyncio.create_task(_deliver(consumer, [_Message(acks, {"slow": True}, "r2")]))
+        await started.wait()
+        redelivered = asyncio.create_task(_deliver(consumer, [_Message(acks, {}, "r2", redelivered=True)]))
+        await asyncio.sleep(0.01)
+        assert len(replies.sent) == 2
+        release.set()
+        await asyncio.gather(original, redelivered)
+
+        # 보관한 응답이 없으면 재전달이어도 처리
+        await _deliver(consumer, [_Message(acks, {}, "r3", redelivered=True)])
+
+    asyncio.run(scenario())
+    assert calls == ["r1", "r2", "r3"]
+    assert replies.sent == [
+        ("r1", {"stateCode": "MTCH-000", "n": 1}),
+        ("r1", {"stateCode": "MTCH-000", "n": 1}),
+        ("r2", {"stateCode": "MTCH-000", "n": 2}),
+        ("r2", {"stateCode": "MTCH-000", "n": 2}),
+        ("r3", {"stateCode": "MTCH-000", "n": 3}),
+    ]
+    assert acks == ["r1", "r1", "r2", "r2", "r3"]
@@ -0,0 +1,68 @@
+import numpy as np
+import pytest
+from app.engine.candidate_index import CandidateIndex
+from app.engine.feature_store import FeatureStore
+from app.storage.snapshot import RowTable
+
+COLUMNS = ["uuid", "age", "contactFrequency", "gender", "hobby", "major", "mbti"]
+
+
+def _user(uuid, age="23", hobby="축구", mbti="INTP"):
+    return {"uuid": uuid, "age": age, "contactFrequency": "보통", "gender": "female", "hobby": hobby,
+            "major": "컴퓨터", "mbti": mbti}
+
+
+def _table(users):
+    return RowTable(COLUMNS, [[user[column] for column in COLUMNS] for user in users])
+
+
+def _copy(features):
+    return {
+        "uuids": features.uuids.copy(), "age": features.age.copy(), "contact": features.contact.copy(),
+        "mbti": features.mbti.copy(), "hobby": features.hobby.copy(),
+    }
+
+
+def _assert_same(features, saved):
+    for name, array in saved.items():
+        np.testing.assert_array_equal(getattr(features, name), array)
+
+
+def test_snapshot_is_not_changed_by_later_writes():
+    store = FeatureStore(CandidateIndex())
+    store.on_change("LOAD", None, _table([_user("u1"), _user("u2", age="30", hobby="독서")]))
+    before = store.snapshot()
+    saved = _copy(before)
+
+    store.on_change("UPDATE", "u1", _user("u1", age="40", hobby="등산", mbti="ESFJ"))
+    store.on_change("DELETE", "u2", None)
+    store.on_change("CREATE", "u3", _user("u3", age="25", hobby="요리"))
+
+    _assert_same(before, saved)
+    after = store.snapshot()
+    assert after is not before
+    assert list(after.uuids) == ["u1", "u2", "u3"]
+    assert after.age[0] == 40 and after.age[2] == 25
+    assert after.hobby[0, after.hobby_vocab["등산"]] == 1.0
+    assert before.hobby.shape[1] <= after.hobby.shape[1]
+    assert len(store) == 2
+
+
+def test_writes_between_snapshots_copy_once():
+    store = FeatureStore(CandidateIndex())
+    store.on_change("LOAD", None, _table([_user("u1"), _user("u2")]))
+    before = store.snapshot()
+    store.on_change("UPDATE", "u1", _user("u1", age="31"))
+    detached = store.age
+    store.on_change("UPDATE", "u2", _user("u2", age="32"))
+    # 스냅샷을 다시 내보내기 전까지는 복사한 배열에 바로 쓴다
+    assert store.age is detached
+    assert list(before.age) == [23, 23]
+    assert list(store.snapshot().age) == [31, 32]
+
+
+def test_snapshot_arrays_are_read_only():
+    store = FeatureStore(CandidateIndex())
+    store.on_change("LOAD", None, _table([_user("u1")]))
+    with pytest.raises(ValueError):
+        store.snapshot().age[0] = 1.0
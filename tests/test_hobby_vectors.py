@@ -0,0 +1,78 @@
+import os
+import numpy as np
+from app.engine import hobby_vectors as module
+from app.engine.hobby_vectors import HashingEncoder, HobbyVectorIndex
+
+
+class _CountingEncoder(HashingEncoder):
+    def __init__(self, dim=32):
+        super().__init__(dim)
+        self.encoded = []
+
+    def encode(self, texts):
+        self.encoded.append(list(texts))
+        return super().encode(texts)
+
+
+def _hobby_matrix(users, vocab, width):
+    matrix = np.zeros((len(users), width), dtype=np.float32)
+    for row, hobbies in enumerate(users):
+        matrix[row, [vocab[hobby] for hobby in hobbies]] = 1.0
+    return matrix
+
+
+def test_set_similarity_encodes_only_new_vocabulary_terms():
+    encoder = _CountingEncoder()
+    index = HobbyVectorIndex(encoder)
+    users = [["축구", "농구"], ["독서"], []]
+    vocab = {"축구": 0, "농구": 1, "독서": 2}
+    queries = [["축구"], ["독서", "요리"]]
+
+    scores = index.set_similarity(queries, _hobby_matrix(users, vocab, 4), vocab)
+    expected = np.clip(index.set_vectors(queries) @ index.set_vectors(users).T, 0.0, 1.0)
+    np.testing.assert_allclose(scores, expected, atol=1e-5)
+
+    encoder.encoded.clear()
+    index.set_similarity(queries, _hobby_matrix(users, vocab, 4), dict(vocab))
+    assert encoder.encoded == []
+
+    # 특성 저장소처럼 새 취미가 열 끝에 붙으면 그 취미만 계산
+    vocab["등산"] = 3
+    users.append(["등산"])
+    index.vectors(["축구"])
+    cached = index._vocab_cache["vectors"]
+    scores = index.set_similarity(queries, _hobby_matrix(users, vocab, 4), vocab)
+    assert encoder.encoded == [["등산"]]
+    np.testing.assert_array_equal(index._vocab_cache["vectors"][:3], cached)
+    expected = np.clip(index.set_vectors(queries) @ index.set_vectors(users).T, 0.0, 1.0)
+    np.testing.assert_allclose(scores, expected, atol=1e-5)
+
+
+def test_rebuilt_vocabulary_is_not_treated_as_an_extension():
+    index = HobbyVectorIndex(_CountingEncoder())
+    first = {"축구": 0, "독서": 1}
+    index.set_similarity([["축구"]], _hobby_matrix([["축구"]], first, 2), first)
+    rebuilt = {"독서": 0, "축구": 1}
+    scores = index.set_similarity([["축구"]], _hobby_matrix([["축구"], ["독서"]], rebuilt, 2), rebuilt)
+    assert scores[0, 0] == 1.0
+    assert scores[0, 1] < 1.0
+
+
+def test_vectors_save_in_background(tmp_path, monkeypatch):
+    path = str(tmp_path / "hobby.vec")
+    submitted = []
+    monkeypatch.setattr(module, "SAVE_INTERVAL", 2)
+    monkeypatch.setattr(module.io_executor, "submit", lambda fn, *args: submitted.append(fn))
+    index = HobbyVectorIndex(HashingEncoder(16), path)
+
+    index.vectors(["축구", "독서", "요리"])
+    index.vectors(["등산", "수영"])
+    # 점수 계산 스레드에서는 저장하지 않고 한 번만 예약
+    assert not os.path.exists(path)
+    assert len(submitted) == 1
+
+    submitted[0]()
+    assert index.stats()["unsaved"] == 0
+    reloaded = HobbyVectorIndex(HashingEncoder(16), path)
+    assert reloaded.load() == 5
+    np.testing.assert_array_equal(reloaded.vectors(["요리"]), index.vectors(["요리"]))
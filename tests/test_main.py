@@ -0,0 +1,16 @@
+from fastapi.testclient import TestClient
+from benchmarks.broker import InMemoryBroker, install
+from app import main
+
+
+def test_consumer_tasks_are_kept_and_awaited_on_shutdown():
+    uninstall = install(InMemoryBroker())
+    try:
+        with TestClient(main.app):
+            tasks = list(main.consumer_tasks)
+            assert len(tasks) == 3
+            assert not any(task.done() for task in tasks)
+        assert main.consumer_tasks == []
+        assert all(task.done() for task in tasks)
+    finally:
+        uninstall()
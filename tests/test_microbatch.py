@@ -0,0 +1,105 @@
+import asyncio
+import threading
+from app.engine.batcher import MatchBatcher
+from app.utils.microbatch import MicroBatcher, BatchCancelled
+
+
+class _DoubleBatcher(MicroBatcher):
+    def __init__(self, delay=0.0, **kwargs):
+        super().__init__(**kwargs)
+        self.delay = delay
+        self.seen = []
+
+    async def process_batch(self, items):
+        await asyncio.sleep(self.delay)
+        self.seen.append(list(items))
+        return [item * 2 for item in items]
+
+
+class _SlowEngine:
+    def __init__(self):
+        self.release = threading.Event()
+
+    def rank_batch(self, queries, depth):
+        self.release.wait(5)
+        return [[query, depth] for query in queries]
+
+
+def test_stop_resolves_item_still_being_collected():
+    async def scenario():
+        batcher = _DoubleBatcher(max_batch_size=8, max_wait_ms=200)
+        pending = asyncio.ensure_future(batcher.submit(21))
+        await asyncio.sleep(0.02)
+        # 배치가 max_wait 동안 모이는 중에 stop
+        await batcher.stop()
+        return await asyncio.wait_for(pending, 1), batcher
+
+    result, batcher = asyncio.run(scenario())
+    assert result == 42
+    assert batcher.stats() == {"batches": 1, "items": 1, "avgBatchSize": 1.0}
+
+
+def test_stop_drains_queue_behind_running_batch():
+    async def scenario():
+        batcher = _DoubleBatcher(delay=0.05, max_batch_size=2, max_wait_ms=0)
+        pending = [asyncio.ensure_future(batcher.submit(i)) for i in range(5)]
+        await asyncio.sleep(0)
+        await batcher.stop()
+        return await asyncio.wait_for(asyncio.gather(*pending), 1)
+
+    assert asyncio.run(scenario()) == [0, 2, 4, 6, 8]
+
+
+def test_stop_fails_pending_futures_after_drain_timeout():
+    async def scenario():
+        batcher = _DoubleBatcher(delay=1, max_batch_size=1, max_wait_ms=0, drain_timeout=0.05)
+        pending = [asyncio.ensure_future(batcher.submit(i)) for i in range(3)]
+        await asyncio.sleep(0)
+        await batcher.stop()
+        return await asyncio.wait_for(asyncio.gather(*pending, return_exceptions=True), 1), batcher
+
+    results, batcher = asyncio.run(scenario())
+    assert all(isinstance(result, BatchCancelled) for result in results)
+    assert batcher.cancelled == 3
+
+
+def test_match_batcher_stop_answers_queued_requests():
+    engine = _SlowEngine()
+
+    async def scenario():
+        batcher = MatchBatcher(engine, max_batch_size=2, max_wait_ms=1, depth=3)
+        pending = [asyncio.ensure_future(batcher.submit(f"q{i}")) for i in range(5)]
+        await asyncio.sleep(0.01)
+        stopping = asyncio.ensure_future(batcher.stop())
+        await asyncio.sleep(0.01)
+        engine.release.set()
+        await stopping
+        return await asyncio.wait_for(asyncio.gather(*pending), 1), batcher
+
+    results, batcher = asyncio.run(scenario())
+    assert results == [[f"q{i}", 3] for i in range(5)]
+    assert batcher.stats()["requests"] == 5
+
+
+def test_write_coalescer_stop_applies_create_being_collected(tmp_path):
+    from app.storage.user_repository import UserRepository, UserAlreadyExists
+    from app.storage.write_coalescer import UserWriteCoalescer
+    from tests.conftest import write_users_csv
+
+    repository = UserRepository(write_users_csv(str(tmp_path / "users.csv")))
+    repository.load()
+
+    async def scenario():
+        writer = UserWriteCoalescer(repository, max_batch_size=16, max_wait_ms=200)
+        created = asyncio.ensure_future(writer.create({"uuid": "u1", "age": "23"}))
+        duplicate = asyncio.ensure_future(writer.create({"uuid": "u1", "age": "24"}))
+        await asyncio.sleep(0.02)
+        # 200ms 동안 배치를 모으는 중에 stop
+        await writer.stop()
+        return await asyncio.wait_for(asyncio.gather(created, duplicate, return_exceptions=True), 1), writer
+
+    (created, duplicate), writer = asyncio.run(scenario())
+    assert created is None
+    assert isinstance(duplicate, UserAlreadyExists)
+    assert repository.get("u1")["age"] == "23"
+    assert writer.stats() == {"batches": 1, "operations": 2, "avgBatchSize": 2.0}
@@ -0,0 +1,29 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from app.routes import profiling
+
+
+@pytest.fixture
+def client():
+    app = FastAPI()
+    app.include_router(profiling.router)
+    return TestClient(app)
+
+
+def test_admin_api_is_closed_without_configured_token(client, monkeypatch):
+    monkeypatch.setattr(profiling, "ADMIN_TOKEN", None)
+    assert client.get("/admin/profiling").status_code == 403
+    assert client.get("/admin/profiling", headers={"X-Admin-Token": ""}).status_code == 403
+    monkeypatch.setattr(profiling, "ADMIN_TOKEN", "")
+    assert client.get("/admin/profiling", headers={"X-Admin-Token": ""}).status_code == 403
+
+
+def test_admin_api_requires_matching_token(client, monkeypatch):
+    monkeypatch.setattr(profiling, "ADMIN_TOKEN", "s3cret")
+    assert client.get("/admin/profiling").status_code == 403
+    assert client.get("/admin/profiling", headers={"X-Admin-Token": "s3cre"}).status_code == 403
+    assert client.delete("/admin/profiling", headers={"X-Admin-Token": "wrong"}).status_code == 403
+    response = client.get("/admin/profiling", headers={"X-Admin-Token": "s3cret"})
+    assert response.status_code == 200
+    assert "profiles" in response.json()
@@ -0,0 +1,130 @@
+import math
+import numpy as np
+from app.engine.query import MatchQuery
+from tests.conftest import build_engine, match_request
+
+# uuid, age, contactFrequency, gender, hobby, major, mbti, duplication
+USERS = [
+    ["u1", "23", "보통", "female", "축구,독서", "컴퓨터", "INTP", "FALSE", ""],
+    ["u2", "25", "자주", "male", "독서", "경영", "ENFJ", "FALSE", ""],
+    ["u3", "31", "가끔", "FEMALE", "요리|등산", "경영", "IS", "FALSE", ""],
+    ["u4", "", "모름", "male", "['축구', '요리']", "컴퓨터", "", "FALSE", ""],
+    ["u5", "19.5", "RARE", "female", "", "수학", "estp", "FALSE", ""],
+    ["u6", "23", "NORMAL", "male", "축구", "수학", "INTJ", "FALSE", ""],
+]
+
+MBTI_LETTERS = {letter: axis for axis in ("EI", "SN", "TF", "JP") for letter in axis}
+CONTACT_LEVELS = {"자주": 2, "FREQUENT": 2, "보통": 1, "NORMAL": 1, "가끔": 0, "RARE": 0}
+
+
+def _mbti(value):
+    return {MBTI_LETTERS[letter]: letter for letter in value.upper() if letter in MBTI_LETTERS}
+
+
+def _number(value):
+    try:
+        return float(value)
+    except ValueError:
+        return None
+
+
+def _reference_score(query, user):
+    """사용자 한 명씩 계산하는 기준 점수 (MBTI 일치 비율, 나이/연락 빈도 근접도, 취미 일치 비율의 가중합)"""
+    _, age, contact, _, hobby, _, mbti = user[:7]
+    wanted, have = _mbti(query.mbti_option), _mbti(mbti)
+    mbti_score = sum(have.get(axis) == letter for axis, letter in wanted.items()) / max(len(wanted), 1)
+
+    age = _number(age)
+    age_score = 0.0 if age is None else 1.0 - min(abs(age - query.my_age), 10.0) / 10.0
+
+    hobbies = {item.strip(" '\"") for item in hobby.strip("[]").replace("|", ",").split(",")}
+    hobby_score = sum(item in hobbies for item in query.hobby_option) / max(len(query.hobby_option), 1)
+
+    mine, theirs = CONTACT_LEVELS.get(query.contact_frequency_option), CONTACT_LEVELS.get(contact.upper(), CONTACT_LEVELS.get(contact))
+    contact_score = 0.0 if mine is None or theirs is None else 1.0 - abs(mine - theirs) / 2.0
+
+    weights = query.weights
+    return (weights.mbti * mbti_score + weights.age * age_score
+            + weights.hobby * hobby_score + weights.contact_frequency * contact_score)
+
+
+def _reference_candidate(query, user):
+    uuid, age, _, gender, _, major = user[:6]
+    if uuid in query.excluded:
+        return False
+    if query.gender_option and gender.upper() != query.gender_option:
+        return False
+    age = _number(age)
+    bucket = math.floor(age) if age is not None else None
+    if query.age_option in ("OLDER", "YOUNGER", "EQUAL"):
+        if bucket is None:
+            return False
+        if query.age_option == "OLDER" and not bucket > query.my_age:
+            return False
+        if query.age_option == "YOUNGER" and not bucket < query.my_age:
+            return False
+        if query.age_option == "EQUAL" and not bucket == query.my_age:
+            return False
+    return query.same_major_option or major != query.my_major
+
+
+def test_vectorized_scores_match_per_user_reference(tmp_path):
+    _, engine = build_engine(str(tmp_path / "users.csv"), USERS)
+    requests = [
+        match_request(),
+        match_request(mbtiOption="ES", hobbyOption="요리", contactFrequencyOption="자주", myAge=30,
+                      mbtiWeight=0.5, ageWeight=2.0, hobbyWeight=1.5, contactFrequencyWeight=0.25),
+        match_request(genderOption="female", ageOption="younger", myAge=32, sameMajorOption=False,
+                      duplicationList=["u5"], hobbyOption="", mbtiOption=""),
+        match_request(ageOption="OLDER", myAge=22, contactFrequencyOption="모름"),
+    ]
+    queries = [MatchQuery.from_request(request) for request in requests]
+
+    scores = engine.score_batch(queries)
+    for query, row in zip(queries, scores):
+        for user, score in zip(USERS, row):
+            if _reference_candidate(query, user):
+                assert math.isclose(score, _reference_score(query, user), rel_tol=1e-5, abs_tol=1e-6), (query, user)
+            else:
+                assert score == -np.inf, (query, user)
+        # 한 건씩 계산해도 배치와 같은 점수
+        np.testing.assert_array_equal(engine.score(query), row)
+
+
+def _expected_top(engine, query, count):
+    scores = engine.score(query)
+    slots = [slot for slot in np.flatnonzero(np.isfinite(scores))]
+    slots.sort(key=lambda slot: (-scores[slot], slot))
+    uuids = engine.features.uuids
+    return [(uuids[slot], float(scores[slot])) for slot in slots[:count]]
+
+
+def test_top_k_matches_full_sort_with_ties(tmp_path):
+    # 같은 속성의 사용자를 섞어 두어 점수 동점이 k 경계에 걸리게 함
+    tied = ["23", "보통", "female", "축구,독서", "경영", "INTP", "FALSE", ""]
+    rows = [USERS[1], ["t1"] + tied, USERS[4], ["t2"] + tied, USERS[2], ["t3"] + tied, USERS[5], ["t4"] + tied]
+    _, engine = build_engine(str(tmp_path / "users.csv"), rows)
+    candidates = len(rows)
+
+    for k in (1, 2, 3, 5, candidates, 50):
+        query = MatchQuery.from_request(match_request(k=k))
+        ranked = engine.rank_batch([query])[0]
+        expected = _expected_top(engine, query, k)
+        assert [(r.uuid, r.score) for r in ranked] == expected, k
+        assert len(ranked) == min(k, candidates)
+
+    # 동점 묶음은 앞 슬롯부터
+    ranked = engine.rank_batch([MatchQuery.from_request(match_request(k=3))])[0]
+    assert [r.uuid for r in ranked] == ["t1", "t2", "t3"]
+
+    # depth 가 k 보다 크면 depth 명, 후보보다 크면 후보 전체
+    query = MatchQuery.from_request(match_request(k=2, duplicationList=["t1"]))
+    assert [(r.uuid, r.score) for r in engine.rank_batch([query], depth=5)[0]] == _expected_top(engine, query, 5)
+    assert len(engine.rank_batch([query], depth=100)[0]) == candidates - 1
+
+
+def test_top_k_without_candidates_is_empty(tmp_path):
+    _, engine = build_engine(str(tmp_path / "users.csv"), USERS[:2])
+    query = MatchQuery.from_request(match_request(genderOption="other", k=5))
+    assert engine.rank_batch([query])[0] == []
+    assert engine.recommend(query) is None
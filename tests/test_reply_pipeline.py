@@ -0,0 +1,60 @@
+import asyncio
+from benchmarks.broker import InMemoryBroker, install
+from app.utils.publisher import QueuePublisher
+from app.utils.reply_pipeline import ReplyPipeline
+
+
+def _deliveries(broker):
+    delivered = []
+    broker.deliver_reply = lambda routing_key, correlation_id, body: delivered.append(correlation_id)
+    return delivered
+
+
+def _run(broker, scenario):
+    uninstall = install(broker)
+    try:
+        return asyncio.run(scenario())
+    finally:
+        uninstall()
+
+
+def test_nacked_replies_are_retried_even_when_confirms_flag_is_off():
+    broker = InMemoryBroker()
+    delivered = _deliveries(broker)
+    broker.nack_next = 2
+
+    async def scenario():
+        publisher = QueuePublisher("amqp://test/", pool_size=2, publisher_confirms=False)
+        pipeline = ReplyPipeline(publisher, max_batch_size=8, max_wait_ms=1, attempts=3, retry_min=0.01, retry_max=0.02)
+        for i in range(4):
+            await pipeline.put("reply", f"c{i}", {"i": i})
+        await pipeline.stop()
+        await publisher.close()
+        return pipeline, publisher
+
+    pipeline, publisher = _run(broker, scenario)
+    assert broker.nacked == 2
+    assert sorted(delivered) == ["c0", "c1", "c2", "c3"]
+    assert pipeline.stats()["retries"] == 2
+    assert pipeline.stats()["dropped"] == 0
+    assert publisher.stats()["failed"] == 2
+
+
+def test_replies_are_dropped_after_last_attempt():
+    broker = InMemoryBroker()
+    delivered = _deliveries(broker)
+    broker.nack_next = 5
+
+    async def scenario():
+        publisher = QueuePublisher("amqp://test/", pool_size=1)
+        pipeline = ReplyPipeline(publisher, max_batch_size=8, max_wait_ms=1, attempts=3, retry_min=0.01, retry_max=0.02)
+        await pipeline.put("reply", "c0", {})
+        await pipeline.put("reply", "c1", {})
+        await pipeline.stop()
+        return pipeline
+
+    pipeline = _run(broker, scenario)
+    # 두 응답 모두 두 번 거부된 뒤 세 번째 시도에서 c0 만 다시 거부돼 버려짐
+    assert delivered == ["c1"]
+    assert pipeline.stats()["dropped"] == 1
+    assert pipeline.stats()["replies"] == 2
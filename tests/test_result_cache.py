@@ -0,0 +1,69 @@
+from app.engine.query import MatchQuery
+from app.engine.result_cache import MatchCandidateCache, MatchResultCache
+from tests.conftest import build_engine, match_request
+from tests.test_recommender import USERS
+
+
+def _pairs(ranked):
+    return [(r.uuid, r.score) for r in ranked]
+
+
+def _rescore(engine, query):
+    return _pairs(engine.rank_batch([query])[0])
+
+
+def test_candidate_cache_reply_equals_rescore(tmp_path):
+    repository, engine = build_engine(str(tmp_path / "users.csv"), USERS)
+    cache = MatchCandidateCache(engine, depth=3)
+
+    first = MatchQuery.from_request(match_request(k=1))
+    cache.put(engine.version, first, engine.rank_batch([first], cache.depth)[0])
+
+    # 방금 받은 사람을 제외 목록에 넣은 다음 요청은 보관한 목록에서 꺼냄
+    served = []
+    for k in (1, 2):
+        query = MatchQuery.from_request(match_request(k=k, duplicationList=["u1"]))
+        ranked = cache.get(query)
+        assert ranked is not None
+        assert _pairs(ranked) == _rescore(engine, query)
+        served.append(ranked)
+    # 남은 후보가 k 명보다 적으면 다시 계산해야 함
+    assert cache.get(MatchQuery.from_request(match_request(k=3, duplicationList=["u1"]))) is None
+
+    # CRUD 로 version 이 오르면 이전 목록은 쓰지 않는다
+    user = repository.get("u2")
+    repository.update(dict(user, mbti="INTP", hobby="축구,독서", contactFrequency="보통"))
+    query = MatchQuery.from_request(match_request(k=1, duplicationList=["u1"]))
+    assert cache.get(query) is None
+    rescored = _rescore(engine, query)
+    assert rescored != _pairs(served[0])
+
+    cache.put(engine.version, first, engine.rank_batch([first], cache.depth)[0])
+    assert _pairs(cache.get(query)) == rescored
+    assert cache.stats()["served"] == 3
+
+
+def test_result_cache_is_invalidated_by_version_bump(tmp_path):
+    repository, engine = build_engine(str(tmp_path / "users.csv"), USERS)
+    cache = MatchResultCache(engine)
+    query = MatchQuery.from_request(match_request(k=2))
+
+    assert cache.get(query) == (False, None)
+    version = cache.version
+    ranked = engine.rank_batch([query])[0]
+    cache.put(version, query, ranked)
+    assert cache.get(query) == (True, ranked)
+    # 같은 조건의 새 MatchQuery 도 같은 키
+    assert cache.get(MatchQuery.from_request(match_request(k=2))) == (True, ranked)
+
+    repository.create({"uuid": "u7", "age": "23", "contactFrequency": "보통", "gender": "female",
+                       "hobby": "축구,독서", "major": "경영", "mbti": "INTP"})
+    assert cache.version > version
+    assert cache.get(query) == (False, None)
+    assert [r.uuid for r in engine.rank_batch([query])[0]] == ["u1", "u7"] != [r.uuid for r in ranked]
+
+    # 계산 전에 읽은 version 으로 넣은 결과는 그 사이 변경이 있으면 조회되지 않음
+    stale = cache.version
+    repository.delete("u7")
+    cache.put(stale, query, ranked)
+    assert cache.get(query) == (False, None)
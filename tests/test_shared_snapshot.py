@@ -0,0 +1,82 @@
+import os
+import numpy as np
+from app.engine.query import MatchQuery
+from app.engine.recommender import RecommendationEngine
+from app.engine.shared_snapshot import SnapshotPublisher, open_feature_snapshot, read_pointer
+from app.storage.snapshot import SectionFile
+from tests.conftest import build_engine, match_request
+from tests.test_recommender import USERS
+
+QUERIES = [
+    match_request(),
+    match_request(genderOption="female", hobbyOption="요리,등산", mbtiOption="ES"),
+    match_request(ageOption="OLDER", myAge=22, sameMajorOption=False, duplicationList=["u2"]),
+]
+
+
+def _user(uuid, **fields):
+    user = {"uuid": uuid, "age": "24", "contactFrequency": "자주", "gender": "female", "hobby": "새취미,축구",
+            "major": "경영", "mbti": "ESTJ"}
+    user.update(fields)
+    return user
+
+
+def _scores(engine):
+    """요청마다 {uuid: 점수} (후보만)"""
+    results = []
+    for request in QUERIES:
+        query = MatchQuery.from_request(request)
+        scores = engine.score(query)
+        uuids = engine.features.uuids
+        results.append({uuids[slot]: float(scores[slot]) for slot in np.flatnonzero(np.isfinite(scores))})
+    return results
+
+
+def _open_current(directory):
+    pointer = read_pointer(directory)
+    path = os.path.join(directory, pointer["file"])
+    return path, pointer, SectionFile(path).meta
+
+
+def test_publishes_only_changed_rows_until_ratio(tmp_path):
+    repository, engine = build_engine(str(tmp_path / "users.csv"), USERS)
+    directory = str(tmp_path / "shared")
+    publisher = SnapshotPublisher(engine.store, directory, keep=2, delta_ratio=0.5)
+
+    assert publisher.publish() is not None
+    # 바뀐 것이 없으면 다시 쓰지 않음
+    assert publisher.publish() is None
+    base, _, meta = _open_current(directory)
+    assert "base" not in meta
+
+    repository.create(_user("u7"))
+    repository.update(_user("u2", hobby="독서,요리"))
+    repository.delete("u3")
+    assert publisher.publish() is not None
+    path, pointer, meta = _open_current(directory)
+    assert meta["base"] == os.path.basename(base)
+    assert meta["count"] == 2
+    assert pointer["users"] == len(repository)
+
+    store, index = open_feature_snapshot(path)
+    reader = RecommendationEngine(None, store, index)
+    assert len(store) == len(repository)
+    assert _scores(reader) == _scores(engine)
+
+    # 샤드로 나눠 열어도 살아 있는 행만 한 번씩
+    shards = [open_feature_snapshot(path, shard, 2) for shard in range(2)]
+    assert sorted(uuid for store, _ in shards for uuid in store.features.uuids) == sorted(
+        row[0] for row in repository.rows()
+    )
+
+    # base 사용자 수의 delta_ratio 를 넘으면 전체 스냅샷
+    repository.create(_user("u8"))
+    repository.update(_user("u1", age="40"))
+    publisher.publish()
+    path, _, meta = _open_current(directory)
+    assert "base" not in meta
+    assert publisher.stats()["deltas"] == 1
+    store, index = open_feature_snapshot(path)
+    assert _scores(RecommendationEngine(None, store, index)) == _scores(engine)
+    # 정리해도 현재 파일과 base 는 남음
+    assert os.path.basename(path) in os.listdir(directory)
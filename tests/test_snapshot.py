@@ -0,0 +1,111 @@
+import numpy as np
+from app.engine.candidate_index import CandidateIndex
+from app.engine.feature_store import FeatureStore
+from app.storage.snapshot import UserSnapshot, RowTable, read_csv_table, export_snapshot, import_snapshot
+from app.storage.user_repository import UserRepository
+from tests.conftest import USER_COLUMNS, write_users_csv
+
+ROWS = [
+    ["u1", "23", "FREQUENT", "FEMALE", "축구,독서", "컴퓨터공학", "INTP", "FALSE", ""],
+    ["u2", "", "보통", "MALE", "['등산', '요리']", "경영학", "ESFJ", "FALSE", ""],
+    ["u3", "29", "RARE", "female", "독서", "컴퓨터공학", "", "TRUE", ""],
+    ["u4", "-1", "", "MALE", "", "수학", "EN", "FALSE", ""],
+]
+
+
+def _features(store):
+    snapshot = store.snapshot()
+    return {
+        "uuids": list(snapshot.uuids), "age": snapshot.age, "contact": snapshot.contact, "mbti": snapshot.mbti,
+        "hobby": snapshot.hobby[:, :len(snapshot.hobby_vocab)], "vocab": list(snapshot.hobby_vocab),
+        "attributes": store.index.attributes(),
+    }
+
+
+def _assert_same_features(left, right):
+    assert left.keys() == right.keys()
+    for key in left:
+        if isinstance(left[key], np.ndarray):
+            np.testing.assert_array_equal(left[key], right[key])
+        else:
+            assert left[key] == right[key], key
+
+
+def _load(csv_path, snapshot_path=None):
+    repository = UserRepository(csv_path, snapshot_path=snapshot_path)
+    store = FeatureStore(CandidateIndex())
+    repository.add_listener(store.on_change)
+    repository.load()
+    return repository, store
+
+
+def test_integer_columns_are_stored_as_numbers(tmp_path):
+    csv_path = write_users_csv(str(tmp_path / "users.csv"), ROWS)
+    snapshot_path = str(tmp_path / "users.snap")
+    export_snapshot(csv_path, snapshot_path)
+
+    snapshot = UserSnapshot(snapshot_path)
+    assert snapshot.is_numeric("age")
+    assert not snapshot.is_numeric("uuid") and not snapshot.is_numeric("mbti")
+    assert snapshot._file.section(f"{USER_COLUMNS.index('age')}.values").dtype == np.dtype("<i4")
+    np.testing.assert_array_equal(snapshot.numbers("age"), np.array([23, np.nan, 29, -1], dtype=np.float32))
+    assert snapshot.rows() == ROWS
+    assert [snapshot.row(slot) for slot in range(len(ROWS))] == ROWS
+
+    import_snapshot(snapshot_path, str(tmp_path / "back.csv"))
+    assert read_csv_table(str(tmp_path / "back.csv")) == read_csv_table(csv_path)
+
+
+def test_non_canonical_numbers_stay_strings(tmp_path):
+    rows = [list(ROWS[0]), list(ROWS[2])]
+    rows[1][1] = "029"
+    csv_path = write_users_csv(str(tmp_path / "users.csv"), rows)
+    snapshot_path = str(tmp_path / "users.snap")
+    export_snapshot(csv_path, snapshot_path)
+    snapshot = UserSnapshot(snapshot_path)
+    assert not snapshot.is_numeric("age")
+    assert snapshot.rows() == rows
+
+
+def test_snapshot_load_matches_csv_load(tmp_path):
+    csv_path = write_users_csv(str(tmp_path / "users.csv"), ROWS)
+    snapshot_path = str(tmp_path / "users.snap")
+    export_snapshot(csv_path, snapshot_path)
+
+    from_csv, csv_store = _load(csv_path)
+    from_snapshot, snapshot_store = _load(csv_path, snapshot_path)
+    assert from_snapshot._base is not None
+    assert from_snapshot.rows() == from_csv.rows() == ROWS
+    assert from_snapshot.get("u2") == from_csv.get("u2")
+    _assert_same_features(_features(snapshot_store), _features(csv_store))
+
+
+def test_snapshot_load_replays_log_over_snapshot_rows(tmp_path):
+    csv_path = write_users_csv(str(tmp_path / "users.csv"), ROWS)
+    snapshot_path = str(tmp_path / "users.snap")
+    export_snapshot(csv_path, snapshot_path)
+
+    writer = UserRepository(csv_path, snapshot_path=snapshot_path)
+    writer.update(dict(zip(USER_COLUMNS, ["u2", "31", "자주", "MALE", "요가", "경영학", "ESFJ", "FALSE", ""])))
+    writer.delete("u3")
+    writer.create(dict(zip(USER_COLUMNS, ["u5", "24", "NORMAL", "FEMALE", "축구,요가", "물리학", "ISTJ", "FALSE", ""])))
+
+    from_csv, csv_store = _load(csv_path)
+    from_snapshot, snapshot_store = _load(csv_path, snapshot_path)
+    assert [row[0] for row in from_snapshot.rows()] == ["u1", "u2", "u4", "u5"]
+    assert from_snapshot.rows() == from_csv.rows()
+    assert from_snapshot.get("u2")["age"] == "31"
+    assert from_snapshot.get("u1") == dict(zip(USER_COLUMNS, ROWS[0]))
+    _assert_same_features(_features(snapshot_store), _features(csv_store))
+
+
+def test_row_table_over_base_keeps_order_and_dictionary(tmp_path):
+    csv_path = write_users_csv(str(tmp_path / "users.csv"), ROWS)
+    snapshot_path = str(tmp_path / "users.snap")
+    export_snapshot(csv_path, snapshot_path)
+    base = UserSnapshot(snapshot_path)
+    added = [["u9", "40", "RARE", "MALE", "축구", "새학과", "INFP", "FALSE", ""]]
+    table = RowTable(USER_COLUMNS, added, base, np.array([2, -1, 0]))
+    assert table.rows() == [ROWS[2], added[0], ROWS[0]]
+    np.testing.assert_array_equal(table.numbers("age"), np.array([29, 40, 23], dtype=np.float32))
+    assert table.values("major") == ["컴퓨터공학", "새학과", "컴퓨터공학"]
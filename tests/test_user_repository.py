@@ -0,0 +1,66 @@
+import time
+from app.storage.user_repository import UserRepository
+from tests.conftest import write_users_csv
+
+
+def _user(uuid, age="23"):
+    return {"uuid": uuid, "age": age, "contactFrequency": "보통", "gender": "female", "hobby": "축구",
+            "major": "컴퓨터", "mbti": "INTP", "duplication": "FALSE"}
+
+
+def _wait_compacted(repository, timeout=5):
+    deadline = time.monotonic() + timeout
+    while repository._compacting or repository._pending >= repository.compact_threshold:
+        assert time.monotonic() < deadline, "compaction did not finish"
+        time.sleep(0.01)
+
+
+def test_listener_survives_compaction(tmp_path):
+    csv_path = write_users_csv(str(tmp_path / "users.csv"), [["u0", "20", "", "male", "", "", "", "", ""]])
+    repository = UserRepository(csv_path, compact_threshold=2)
+    events = []
+    repository.add_listener(lambda op, uuid, user: events.append((op, uuid)))
+    repository.load()
+
+    repository.create(_user("u1"))
+    repository.create(_user("u2"))
+    # 두 번째 변경에서 임계값을 넘어 백그라운드 압축이 돈다
+    _wait_compacted(repository)
+    repository.compact()
+
+    repository.create(_user("u3"))
+    repository.update(_user("u3", age="30"))
+    repository.delete("u0")
+
+    assert events == [
+        ("LOAD", None), ("CREATE", "u1"), ("CREATE", "u2"),
+        ("CREATE", "u3"), ("UPDATE", "u3"), ("DELETE", "u0"),
+    ]
+    repository.close()
+
+    reloaded = UserRepository(csv_path)
+    assert sorted(row[0] for row in reloaded.rows()) == ["u1", "u2", "u3"]
+    assert reloaded.get("u3")["age"] == "30"
+
+
+def test_concurrent_compactions_are_serialized(tmp_path):
+    import threading
+
+    csv_path = write_users_csv(str(tmp_path / "users.csv"))
+    repository = UserRepository(csv_path, compact_threshold=1000)
+    repository.load()
+    for i in range(50):
+        repository.create(_user(f"u{i}"))
+
+    threads = [threading.Thread(target=repository.compact) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    repository.create(_user("late"))
+    repository.close()
+    for thread in threads:
+        thread.join()
+
+    assert repository._pending == 0
+    reloaded = UserRepository(csv_path)
+    assert sorted(row[0] for row in reloaded.rows()) == sorted([f"u{i}" for i in range(50)] + ["late"])
+    assert reloaded._pending == 0